@@ -0,0 +1,174 @@
+# Hoyn QR Asenkron API Modülü
+# Bu modül, tarama, doğrulama, profil arama ve tarama loglama için asyncio karşılıklarını sağlar.
+# CPU yoğun kripto işleri ve engelleyen SQLite işleri ayrı, sınırlı iş parçacığı havuzlarında çalışır.
+# Her havuz olay döngüsü başına sınırlı sayıda bekleyen iş kabul eder; sınır dolunca çağıranlar
+# await'te bekler (geri basınç), böylece tek bir olay döngüsü binlerce eşzamanlı isteği taşıyabilir.
+# Yabancı QR içerikleri ön filtre ile olay döngüsünde, havuza hiç gitmeden reddedilir.
+# Gerekli kütüphaneler: asyncio, concurrent.futures, functools, threading, weakref.
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from guvenlik import payload_bicimi_tani, qr_payload_dogrula, DogrulamaKodu, DOGRULAMA_MESAJLARI
+from qr_tarayici import tarama_payload_kodu, tarama_sonucu_olustur, tarama_sonucunu_tamamla
+
+# Havuz boyutları: kripto işleri kısa ve CPU yoğun, SQLite yazmaları zaten tek yazıcıda sıralanır
+KRIPTO_ISCI_SAYISI = 4
+KRIPTO_BEKLEYEN_SINIRI = 256
+VERITABANI_ISCI_SAYISI = 2
+VERITABANI_BEKLEYEN_SINIRI = 64
+
+class SinirliYurutucu:
+    """
+    Sınırlı iş parçacığı havuzu ve olay döngüsü başına bekleyen iş sınırı.
+    Havuz ilk kullanımda oluşturulur (içe aktarma yan etkisiz kalır).
+    """
+    
+    def __init__(self, ad: str, isci_sayisi: int, bekleyen_siniri: int):
+        """
+        Girdiler: ad (str) - iş parçacığı adı öneki, isci_sayisi (int),
+                  bekleyen_siniri (int) - havuza aynı anda verilebilecek en fazla iş (çalışan + kuyrukta)
+        """
+        self.ad = ad
+        self.isci_sayisi = isci_sayisi
+        self.bekleyen_siniri = bekleyen_siniri
+        self.bekleyen = 0
+        self.en_yuksek_bekleyen = 0
+        self._havuz: Optional[ThreadPoolExecutor] = None
+        self._kilit = threading.Lock()
+        # asyncio.Semaphore ilk beklediği döngüye bağlanır; her döngüye ayrı semafor
+        self._semaforlar = weakref.WeakKeyDictionary()
+    
+    def _havuz_al(self) -> ThreadPoolExecutor:
+        with self._kilit:
+            if self._havuz is None:
+                self._havuz = ThreadPoolExecutor(max_workers=self.isci_sayisi, thread_name_prefix=f"hoyn-{self.ad}")
+            return self._havuz
+    
+    def _semafor_al(self, dongu: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semafor = self._semaforlar.get(dongu)
+        if semafor is None:
+            semafor = self._semaforlar[dongu] = asyncio.Semaphore(self.bekleyen_siniri)
+        return semafor
+    
+    async def calistir(self, fonksiyon: Callable, *args, **kwargs):
+        """
+        Fonksiyonu havuzda çalıştırır; bekleyen iş sınırı doluysa önce yer açılmasını bekler.
+        Girdiler: fonksiyon (Callable), *args, **kwargs
+        Çıktı: Fonksiyonun dönüş değeri
+        """
+        dongu = asyncio.get_running_loop()
+        async with self._semafor_al(dongu):
+            self.bekleyen += 1
+            self.en_yuksek_bekleyen = max(self.en_yuksek_bekleyen, self.bekleyen)
+            try:
+                return await dongu.run_in_executor(self._havuz_al(), functools.partial(fonksiyon, *args, **kwargs))
+            finally:
+                self.bekleyen -= 1
+    
+    def istatistikler(self) -> Dict[str, int]:
+        """
+        Çıktı: isci_sayisi, bekleyen_siniri, bekleyen, en_yuksek_bekleyen
+        """
+        return {
+            "isci_sayisi": self.isci_sayisi,
+            "bekleyen_siniri": self.bekleyen_siniri,
+            "bekleyen": self.bekleyen,
+            "en_yuksek_bekleyen": self.en_yuksek_bekleyen
+        }
+    
+    def kapat(self) -> None:
+        """
+        Havuzu kapatır (sonraki çağrıda yeniden oluşturulur).
+        """
+        with self._kilit:
+            havuz, self._havuz = self._havuz, None
+        if havuz is not None:
+            havuz.shutdown(wait=True)
+
+# Global yürütücüler
+kripto_yurutucu = SinirliYurutucu("kripto", KRIPTO_ISCI_SAYISI, KRIPTO_BEKLEYEN_SINIRI)
+veritabani_yurutucu = SinirliYurutucu("veritabani", VERITABANI_ISCI_SAYISI, VERITABANI_BEKLEYEN_SINIRI)
+
+async def qr_payload_dogrula_async(sifrelenmis_base64: str) -> Tuple[bool, str, Optional[dict]]:
+    """
+    qr_payload_dogrula'nın asenkron karşılığı (çözme ve imza doğrulama kripto havuzunda).
+    Girdiler: sifrelenmis_base64 (str)
+    Çıktı: (bool, str, payload dict veya None)
+    """
+    if payload_bicimi_tani(sifrelenmis_base64) is None:
+        return False, DOGRULAMA_MESAJLARI[DogrulamaKodu.HOYN_DEGIL], None
+    return await kripto_yurutucu.calistir(qr_payload_dogrula, sifrelenmis_base64)
+
+async def qr_tara_ve_dogrula_async(qr_veri: str, user_agent: str = None,
+                                   tarayici_tipi: str = "hoyn_scanner") -> dict:
+    """
+    qr_tara_ve_dogrula'nın asenkron karşılığı; sonuç sözlüğü senkron sürümle aynıdır.
+    Payload doğrulama kripto havuzunda, profil araması veritabanı havuzunda çalışır: yavaş SQLite G/Ç'si
+    kripto havuzunu ve onun bekleyen iş sınırını tüketmez.
+    Girdiler: qr_veri (str), user_agent (str), tarayici_tipi (str)
+    Çıktı: dict (sonuc, kod, mesaj, profil_bilgisi)
+    """
+    if payload_bicimi_tani(qr_veri) is None:
+        return tarama_sonucu_olustur(DogrulamaKodu.HOYN_DEGIL)
+    kod, payload = await kripto_yurutucu.calistir(tarama_payload_kodu, qr_veri, tarayici_tipi)
+    if kod is not DogrulamaKodu.BASARILI:
+        return tarama_sonucu_olustur(kod)
+    return tarama_sonucunu_tamamla(payload, await profil_bilgisi_al_async(payload["profil_id"]))
+
+async def profil_bilgisi_al_async(profil_id: str) -> Optional[Dict]:
+    """
+    Profil bilgilerini veritabanı havuzunda alır.
+    Girdiler: profil_id (str)
+    Çıktı: Profil bilgileri dict veya None
+    """
+    import veritabani
+    return await veritabani_yurutucu.calistir(veritabani.depolama_arka_ucu().profil_bilgisi_al, profil_id)
+
+async def profil_var_mi_async(profil_id: str) -> bool:
+    """
+    Profil var mı kontrolünü veritabanı havuzunda yapar.
+    Girdiler: profil_id (str)
+    Çıktı: bool
+    """
+    return await profil_bilgisi_al_async(profil_id) is not None
+
+async def qr_tarama_logla_async(profil_id: str, tarayici_tipi: str, user_agent: str = None,
+                                ip_adresi: str = None, cografl_konum: str = None, basarili_mi: bool = False) -> bool:
+    """
+    QR tarama işlemini veritabanı havuzunda loglar.
+    Girdiler: profil_id (str), tarayici_tipi (str), user_agent (str), ip_adresi (str),
+              cografl_konum (str), basarili_mi (bool)
+    Çıktı: bool (log başarılı mı?)
+    """
+    import veritabani
+    return await veritabani_yurutucu.calistir(
+        veritabani.depolama_arka_ucu().qr_tarama_logla, profil_id, tarayici_tipi, user_agent,
+        ip_adresi, cografl_konum, basarili_mi)
+
+def yurutuculeri_kapat() -> None:
+    """
+    Kripto ve veritabanı havuzlarını kapatır (uygulama kapanışında).
+    """
+    kripto_yurutucu.kapat()
+    veritabani_yurutucu.kapat()
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    from qr_uretici import sifrelenmis_veri_olustur
+    from veritabani import profil_olustur
+    test_profil_id = profil_olustur("test-user", "Asenkron Deneme")
+    
+    async def deneme():
+        kodlar = [sifrelenmis_veri_olustur(test_profil_id) for _ in range(1000)]
+        kodlar += ["https://example.com"] * 1000
+        sonuclar = await asyncio.gather(*(qr_tara_ve_dogrula_async(kod) for kod in kodlar))
+        print("Başarılı:", sum(sonuc["sonuc"] == "basarili" for sonuc in sonuclar), "/", len(sonuclar))
+        print("Kripto havuzu:", kripto_yurutucu.istatistikler())
+    
+    asyncio.run(deneme())
+    yurutuculeri_kapat()
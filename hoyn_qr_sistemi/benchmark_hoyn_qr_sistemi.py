@@ -0,0 +1,657 @@
+# Hoyn QR Sistemi Performans Ölçümleri
+# Bu dosya, kritik yollar için basit zamanlama karşılaştırmaları içerir.
+# Çalıştırma: python benchmark_hoyn_qr_sistemi.py <olcum> [--adet N]
+# Ölçümler: toplu (tekil döngü vs toplu payload üretimi), kompakt (HOYN_QR_V1 vs HOYN_QR_V2),
+#           anahtar (emekli anahtar sayısına göre doğrulama maliyeti, MultiFernet karşılaştırması),
+#           imza (HMAC-SHA256 / BLAKE2b / Ed25519 imzalama ve doğrulama hızı),
+#           onfiltre (yabancı QR içeriklerinin ön filtre ile reddi vs şifre çözme denemesi),
+#           veritabani (tarama başına profil kontrolü + log: bağlantı başına işlem, kalıcı WAL bağlantısı,
+#           arka plan parti log yazıcısı),
+#           profil (profil araması: önbelleksiz vs profil önbelleği),
+#           topluprofil (profil_olustur döngüsü vs CSV'den toplu içe aktarma),
+#           kolon (saat x tarayıcı dağılımı: satır satır SQLite + dict vs GROUP BY vs kolonsal arşiv),
+#           parca (eşzamanlı log yazma: bellek, tek SQLite dosyası, 2/4/8 parçalı SQLite),
+#           cizim (QR sürümüne göre PNG çizimi: qrcode make_image + PIL kaydetme vs qr_cizici),
+#           topluqr (qr_olustur döngüsü + dosya yazma vs süreç havuzunda ZIP'e toplu QR üretimi),
+#           cikti (qr_olustur çıktı biçimleri: base64/ham PNG, zlib düzeyi, dosya hedefi, SVG; süre ve boyut),
+#           cizimprofili (eski sabit düzen vs ekran/etiket/poster/kucuk_resim profilleri; süre, boyut, düzey),
+#           logo (logosuz PNG vs logo bindirme: soğuk ve sıcak logo varlık önbelleği, PNG ve SVG),
+#           icaktarma (her modülün taze yorumlayıcıda `python -X importtime` süresi ve bütçesi).
+# icaktarma, bir modül bütçesini aşarsa veya ağır bir bağımlılığı erken yüklerse çıkış kodu 1 döner.
+# Gerekli kütüphaneler: time, argparse, uuid, subprocess.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import Callable, Dict
+
+# Modül başına içe aktarma bütçesi (ms, kümülatif, taze yorumlayıcı, önbellekli bayt kodu, en iyi ölçüm).
+# asenkron'un büyük kısmı asyncio'nun kendisidir.
+ICE_AKTARMA_BUTCELERI = {
+    "tembel": 25,
+    "ui_mesajlari": 25,
+    "veritabani": 40,
+    "guvenlik": 60,
+    "qr_uretici": 60,
+    "qr_tarayici": 70,
+    "main": 90,
+    "asenkron": 130,
+}
+# İçe aktarmada yüklenmemesi gereken ağır bağımlılıklar (ilk kullanımda yüklenir)
+AGIR_MODULLER = ("cryptography", "PIL", "qrcode", "multiprocessing", "numpy")
+
+def sure_olc(islem: Callable[[], object]) -> float:
+    """
+    Bir işlemin duvar saati süresini ölçer.
+    Girdiler: islem (Callable)
+    Çıktı: Saniye cinsinden süre (float)
+    """
+    baslangic = time.perf_counter()
+    islem()
+    return time.perf_counter() - baslangic
+
+def sonuc_yazdir(baslik: str, adet: int, sureler: Dict[str, float]) -> None:
+    """
+    Ölçüm sonuçlarını tablo halinde yazdırır (ilk satır referans alınır).
+    """
+    print(f"\n📊 {baslik} ({adet} adet)")
+    referans = next(iter(sureler.values()))
+    for ad, sure in sureler.items():
+        print(f"   {ad:<28} {sure:8.3f} sn  {adet / sure:12.0f} adet/sn  x{referans / sure:5.2f}")
+
+def toplu_uretim_benchmark(adet: int = 10000, isci_sayisi: int = 4) -> Dict[str, float]:
+    """
+    Tekil payload döngüsü ile toplu payload API'sini karşılaştırır.
+    Girdiler: adet (int), isci_sayisi (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    from guvenlik import guvenlik_yoneticisi, sifrelenmis_qr_payload_olustur
+
+    profil_idleri = [str(uuid.uuid4()) for _ in range(adet)]
+    sureler = {
+        "tekil döngü": sure_olc(lambda: [sifrelenmis_qr_payload_olustur(p) for p in profil_idleri]),
+        "toplu (tek süreç)": sure_olc(lambda: list(guvenlik_yoneticisi.toplu_payload_olustur(profil_idleri))),
+        f"toplu ({isci_sayisi} işçi)": sure_olc(
+            lambda: list(guvenlik_yoneticisi.toplu_payload_olustur(profil_idleri, isci_sayisi=isci_sayisi))),
+    }
+    sonuc_yazdir("Toplu payload üretimi", adet, sureler)
+    return sureler
+
+def kompakt_format_benchmark(adet: int = 10000) -> Dict[str, Dict[str, float]]:
+    """
+    HOYN_QR_V1 ve HOYN_QR_V2 formatlarını boyut, QR sürümü ve üretim/doğrulama süresi açısından karşılaştırır.
+    Girdiler: adet (int)
+    Çıktı: Sürüm -> ölçüm sözlüğü
+    """
+    import qrcode
+    from guvenlik import sifrelenmis_qr_payload_olustur, qr_payload_dogrula, SISTEM_KIMLIGI_V1, SISTEM_KIMLIGI_V2
+
+    profil_idleri = [str(uuid.uuid4()) for _ in range(adet)]
+    sonuclar = {}
+    print(f"\n📊 Payload formatları ({adet} adet)")
+    for sistem_kimligi in (SISTEM_KIMLIGI_V1, SISTEM_KIMLIGI_V2):
+        payloadlar = []
+        uretim = sure_olc(lambda: payloadlar.extend(
+            sifrelenmis_qr_payload_olustur(p, sistem_kimligi) for p in profil_idleri))
+        dogrulama = sure_olc(lambda: [qr_payload_dogrula(p) for p in payloadlar])
+        qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        qr.add_data(payloadlar[0])
+        qr.make(fit=True)
+        sonuclar[sistem_kimligi] = {
+            "boyut": len(payloadlar[0]),
+            "qr_surumu": qr.version,
+            "uretim_us": uretim / adet * 1e6,
+            "dogrulama_us": dogrulama / adet * 1e6,
+        }
+        print(f"   {sistem_kimligi}: {len(payloadlar[0])} karakter, QR sürümü {qr.version}, "
+              f"üretim {uretim / adet * 1e6:.1f} µs, doğrulama {dogrulama / adet * 1e6:.1f} µs")
+    return sonuclar
+
+def anahtar_halkasi_benchmark(adet: int = 10000) -> Dict[int, Dict[str, float]]:
+    """
+    1, 10 ve 100 emekli anahtarla en eski anahtarın kodunu doğrulama maliyetini ölçer.
+    Anahtar halkası anahtar kimliğiyle doğrudan seçer; MultiFernet tüm anahtarları sırayla dener.
+    Girdiler: adet (int)
+    Çıktı: Emekli anahtar sayısı -> yöntem başına µs/doğrulama
+    """
+    from cryptography.fernet import Fernet, MultiFernet
+    from guvenlik import guvenlik_yoneticisi, AnahtarGirdisi, AnahtarHalkasi
+
+    orijinal_halka = guvenlik_yoneticisi.anahtar_halkasi
+    profil_id = str(uuid.uuid4())
+    sonuclar = {}
+    print(f"\n📊 Emekli anahtar sayısına göre doğrulama ({adet} adet, en eski anahtarın kodu)")
+    try:
+        for emekli_sayisi in (1, 10, 100):
+            girdiler = [AnahtarGirdisi(i, Fernet.generate_key(), b"hmac-%d" % i) for i in range(1, emekli_sayisi + 2)]
+            # Kodu en eski anahtarla üret, sonra en yeni anahtarı aktif yap
+            guvenlik_yoneticisi.anahtar_halkasini_ayarla(AnahtarHalkasi(girdiler, 1))
+            eski_kod = guvenlik_yoneticisi.veri_sifrele(guvenlik_yoneticisi.zaman_damgasi_ekle_ve_hashle(
+                {"profil_id": profil_id, "sistem_kimligi": "HOYN_QR_V1"}))
+            guvenlik_yoneticisi.anahtar_halkasini_ayarla(AnahtarHalkasi(girdiler, emekli_sayisi + 1))
+
+            def halka_dogrula():
+                for _ in range(adet):
+                    guvenlik_yoneticisi.tam_dogrulama_yap(guvenlik_yoneticisi.payload_coz(eski_kod))
+
+            # MultiFernet: en yeni anahtar önde, eski kod en son denenir
+            coklu = MultiFernet([girdi.cipher_suite for girdi in reversed(girdiler)])
+            eski_token = guvenlik_yoneticisi.anahtar_halkasi.girdi(1).cipher_suite.encrypt(b"{}")
+
+            def coklu_fernet_coz():
+                for _ in range(adet):
+                    coklu.decrypt(eski_token)
+
+            sonuclar[emekli_sayisi] = {
+                "anahtar_halkasi_us": sure_olc(halka_dogrula) / adet * 1e6,
+                "multifernet_us": sure_olc(coklu_fernet_coz) / adet * 1e6,
+            }
+            print(f"   {emekli_sayisi:>3} emekli anahtar: halka {sonuclar[emekli_sayisi]['anahtar_halkasi_us']:7.1f} µs, "
+                  f"MultiFernet (yalnız çözme) {sonuclar[emekli_sayisi]['multifernet_us']:7.1f} µs")
+    finally:
+        guvenlik_yoneticisi.anahtar_halkasini_ayarla(orijinal_halka)
+    return sonuclar
+
+def imza_arka_ucu_benchmark(adet: int = 10000) -> Dict[str, Dict[str, float]]:
+    """
+    İmza arka uçlarının HOYN_QR_V2 gövdesi üzerinde imzalama/doğrulama hızını karşılaştırır.
+    Girdiler: adet (int)
+    Çıktı: Arka uç adı -> saniyede imzalama/doğrulama sayısı
+    """
+    import os
+    from guvenlik import (HmacSha256ImzaArkaUcu, Blake2bImzaArkaUcu, Ed25519ImzaArkaUcu,
+                          KOMPAKT_GOVDE, KOMPAKT_SURUM_BAYTI)
+
+    govde = KOMPAKT_GOVDE.pack(KOMPAKT_SURUM_BAYTI, 1, uuid.uuid4().bytes, int(time.time()))
+    arka_uclar = [HmacSha256ImzaArkaUcu(os.urandom(32)), Blake2bImzaArkaUcu(os.urandom(32)),
+                  Ed25519ImzaArkaUcu(os.urandom(32))]
+    sonuclar = {}
+    print(f"\n📊 İmza arka uçları ({adet} adet, V2 gövdesi)")
+    for imzalayici in arka_uclar:
+        imza = imzalayici.imzala(govde)[:imzalayici.kompakt_imza_uzunlugu]
+        imzalama = sure_olc(lambda: [imzalayici.imzala(govde) for _ in range(adet)])
+        dogrulama = sure_olc(lambda: [imzalayici.dogrula(govde, imza) for _ in range(adet)])
+        sonuclar[imzalayici.ad] = {"imzalama_sn": adet / imzalama, "dogrulama_sn": adet / dogrulama}
+        print(f"   {imzalayici.ad:<12} imzalama {adet / imzalama:10.0f}/sn  doğrulama {adet / dogrulama:10.0f}/sn  "
+              f"V2 imza {imzalayici.kompakt_imza_uzunlugu} bayt")
+    return sonuclar
+
+def on_filtre_benchmark(adet: int = 10000) -> Dict[str, float]:
+    """
+    Yabancı QR içeriklerinden (URL, vCard, Wi-Fi, barkod, rastgele base64) oluşan bir karışımın
+    ön filtre ile reddini eski yolla (base64 + Fernet çözme denemesi + hata çıktısı) karşılaştırır.
+    Girdiler: adet (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import base64
+    import contextlib
+    import io
+    import os
+    from guvenlik import guvenlik_yoneticisi, payload_bicimi_tani
+    from qr_tarayici import qr_tara_ve_dogrula
+
+    ornekler = [
+        "https://example.com/menu?masa=12",
+        "http://bit.ly/3xYz9Qa",
+        "BEGIN:VCARD\nVERSION:3.0\nFN:Ayşe Yılmaz\nTEL:+905551112233\nEMAIL:ayse@example.com\nEND:VCARD",
+        "WIFI:T:WPA;S:Kafe_Misafir;P:sifre12345;;",
+        "mailto:destek@example.com?subject=Merhaba",
+        "8690000000001",
+        "geo:41.0082,28.9784",
+        base64.b64encode(os.urandom(330)).decode(),
+    ]
+    yabancilar = [ornekler[i % len(ornekler)] for i in range(adet)]
+
+    def eski_yol():
+        # Ön filtre öncesindeki davranış: çift base64 çözme, Fernet denemesi ve hata çıktısı
+        for icerik in yabancilar:
+            try:
+                base64.b64decode(icerik)
+            except Exception:
+                pass
+            guvenlik_yoneticisi.veri_coz(icerik)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sureler = {
+            "şifre çözme denemesi": sure_olc(eski_yol),
+            "ön filtre": sure_olc(lambda: [payload_bicimi_tani(icerik) for icerik in yabancilar]),
+            "qr_tara_ve_dogrula": sure_olc(lambda: [qr_tara_ve_dogrula(icerik) for icerik in yabancilar]),
+        }
+    sonuc_yazdir("Yabancı QR içeriklerinin reddi", adet, sureler)
+    return sureler
+
+def veritabani_benchmark(adet: int = 2000) -> Dict[str, float]:
+    """
+    Tarama başına veritabanı işini (profil kontrolü + tarama logu) saniyedeki tarama olarak ölçer.
+    "bağlantı başına işlem" her çağrıda yeni bağlantı açan eski davranışı (rollback günlüğü) taklit eder;
+    profil önbelleği kapalı ölçülür (bkz. profil_benchmark); parti yazıcısı ölçümü son boşaltmayı da içerir.
+    Girdiler: adet (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import contextlib
+    import io
+    import sqlite3
+    import tempfile
+    from veritabani import HoynVeritabaniYoneticisi
+
+    class BaglantiBasinaIslem(HoynVeritabaniYoneticisi):
+        def baglanti_olustur(self):
+            conn = sqlite3.connect(self.db_dosyasi)
+            conn.execute("PRAGMA foreign_keys = ON")
+            return conn
+
+        def profil_var_mi(self, profil_id):
+            return self.profil_bilgisi_al(profil_id) is not None
+
+    def taramalar(yonetici, profil_id):
+        for _ in range(adet):
+            yonetici.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=yonetici.profil_var_mi(profil_id))
+
+    sureler = {}
+    with tempfile.TemporaryDirectory() as dizin, contextlib.redirect_stdout(io.StringIO()):
+        for ad, sinif in (("bağlantı başına işlem", BaglantiBasinaIslem), ("kalıcı WAL bağlantısı", HoynVeritabaniYoneticisi)):
+            yonetici = sinif(os.path.join(dizin, f"{sinif.__name__}.db"))
+            yonetici.profil_onbellegini_kapat()
+            profil_id = yonetici.profil_olustur("benchmark", "Benchmark Profil")
+            sureler[ad] = sure_olc(lambda: taramalar(yonetici, profil_id))
+        yonetici.log_yaziciyi_etkinlestir()
+        sureler["arka plan parti yazıcısı"] = sure_olc(
+            lambda: (taramalar(yonetici, profil_id), yonetici.log_yaziciyi_kapat()))
+    sonuc_yazdir("Tarama başına veritabanı işi (profil kontrolü + log)", adet, sureler)
+    return sureler
+
+def profil_benchmark(adet: int = 50000) -> Dict[str, float]:
+    """
+    Profil aramasını (yarısı mevcut, yarısı bilinmeyen kimlik) önbelleksiz ve önbellekli ölçer.
+    Girdiler: adet (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import contextlib
+    import io
+    import tempfile
+    from veritabani import HoynVeritabaniYoneticisi
+
+    sureler = {}
+    with tempfile.TemporaryDirectory() as dizin, contextlib.redirect_stdout(io.StringIO()):
+        yonetici = HoynVeritabaniYoneticisi(os.path.join(dizin, "profil.db"))
+        kimlikler = [yonetici.profil_olustur("benchmark", "Benchmark Profil"), "olmayan-profil"] * (adet // 2)
+        yonetici.profil_onbellegini_kapat()
+        sureler["önbelleksiz (SQLite)"] = sure_olc(lambda: [yonetici.profil_bilgisi_al(k) for k in kimlikler])
+        onbellek = yonetici.profil_onbellegini_etkinlestir()
+        sureler["profil önbelleği"] = sure_olc(lambda: [yonetici.profil_bilgisi_al(k) for k in kimlikler])
+    sonuc_yazdir("Profil araması (%50 bilinmeyen kimlik)", len(kimlikler), sureler)
+    print(f"   İsabet oranı: {onbellek.istatistikler()['isabet_orani']:.4f}")
+    return sureler
+
+def toplu_profil_benchmark(adet: int = 50000) -> Dict[str, float]:
+    """
+    Profil eklemeyi tek tek (profil_olustur: profil başına commit ve çıktı) ve CSV'den toplu içe aktarma ile ölçer.
+    Girdiler: adet (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import contextlib
+    import io
+    import tempfile
+    from toplu_aktarim import profilleri_ice_aktar
+    from veritabani import HoynVeritabaniYoneticisi
+
+    sureler = {}
+    with tempfile.TemporaryDirectory() as dizin:
+        csv_dosyasi = os.path.join(dizin, "profiller.csv")
+        with open(csv_dosyasi, "w", encoding="utf-8") as dosya:
+            dosya.write("kullanici_id,isim,aciklama\n")
+            dosya.writelines(f"firma,Personel {i},Benchmark\n" for i in range(adet))
+        with contextlib.redirect_stdout(io.StringIO()):
+            tekil = HoynVeritabaniYoneticisi(os.path.join(dizin, "tekil.db"))
+            toplu = HoynVeritabaniYoneticisi(os.path.join(dizin, "toplu.db"))
+            sureler["profil_olustur döngüsü"] = sure_olc(
+                lambda: [tekil.profil_olustur("firma", f"Personel {i}", "Benchmark") for i in range(adet)])
+        sureler["toplu içe aktarma (CSV)"] = sure_olc(lambda: profilleri_ice_aktar(csv_dosyasi, yonetici=toplu))
+    sonuc_yazdir("Profil ekleme", adet, sureler)
+    return sureler
+
+def kolon_arsivi_benchmark(adet: int = 200000) -> Dict[str, float]:
+    """
+    Bir yıllık tarama logunda saat x tarayıcı tipi dağılımını ölçer: satır satır SQLite + dict
+    (tarama_loglarini_al + Counter), SQLite GROUP BY ve memmap'li kolonsal arşiv (np.bincount).
+    Arşivin bir kerelik yazma süresi ayrıca yazdırılır.
+    Girdiler: adet (int) - log sayısı
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import contextlib
+    import io
+    import random
+    import tempfile
+    from collections import Counter
+    from kolon_arsivi import KolonArsivi, tarama_loglarini_arsivle
+    from veritabani import HoynVeritabaniYoneticisi
+
+    sureler = {}
+    with tempfile.TemporaryDirectory() as dizin:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yonetici = HoynVeritabaniYoneticisi(os.path.join(dizin, "kolon.db"))
+            profiller = [yonetici.profil_olustur("benchmark", f"Profil {i}") for i in range(100)]
+        simdi = time.time()
+        rastgele = random.Random(42)
+        conn = yonetici.baglanti_olustur()
+        yonetici.tarama_loglarini_ekle(conn, [
+            (rastgele.choice(profiller), rastgele.choice(("hoyn_scanner", "third_party", "web")), None, None, None,
+             rastgele.random() < 0.9,
+             time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(simdi - rastgele.random() * 360 * 86400)))
+            for _ in range(adet)])
+        conn.commit()
+
+        def satir_satir():
+            loglar = yonetici.tarama_loglarini_al(None, 365)
+            return Counter((int(log["tarama_zamani"][11:13]), log["tarayici_tipi"]) for log in loglar)
+
+        sureler["tarama_loglarini_al + Counter"] = sure_olc(satir_satir)
+        sureler["SQLite GROUP BY"] = sure_olc(lambda: conn.execute("""
+            SELECT strftime('%H', tarama_zamani), tarayici_tipi, COUNT(*) FROM qr_tarama_loglari
+            WHERE tarama_zamani >= datetime('now', '-365 days') GROUP BY 1, 2""").fetchall())
+        arsiv_dizini = os.path.join(dizin, "arsiv")
+        yazma_suresi = sure_olc(lambda: tarama_loglarini_arsivle(arsiv_dizini, 365, yonetici))
+        sureler["kolonsal arşiv (memmap)"] = sure_olc(lambda: KolonArsivi(arsiv_dizini).saat_tarayici_tablosu())
+        boyut = sum(os.path.getsize(os.path.join(arsiv_dizini, ad)) for ad in os.listdir(arsiv_dizini))
+    sonuc_yazdir("Saat x tarayıcı tipi dağılımı (365 gün)", adet, sureler)
+    print(f"   Arşiv yazma: {yazma_suresi:.3f} sn, boyut: {boyut / 1024 / 1024:.1f} MB")
+    return sureler
+
+def parca_benchmark(adet: int = 20000, is_parcacigi_sayisi: int = 8) -> Dict[str, float]:
+    """
+    Eşzamanlı tarama logu yazma hızını depolama arka ucuna ve parça sayısına göre ölçer
+    (her iş parçacığı kendi bağlantısıyla tarama başına bir işlem yazar).
+    Girdiler: adet (int) - toplam log, is_parcacigi_sayisi (int)
+    Çıktı: Arka uç -> süre (sn) sözlüğü
+    """
+    import contextlib
+    import io
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from veritabani import BellekDepolamaArkaUcu, HoynVeritabaniYoneticisi, ParcaliSqliteDepolamaArkaUcu
+
+    def yazma_suresi(arka_uc) -> float:
+        profiller = [arka_uc.profil_olustur("benchmark", f"Profil {i}") for i in range(64)]
+        pay = adet // is_parcacigi_sayisi
+
+        def yaz(no: int) -> None:
+            for i in range(pay):
+                arka_uc.qr_tarama_logla(profiller[(no * pay + i) % len(profiller)], "hoyn_scanner", basarili_mi=True)
+
+        with ThreadPoolExecutor(is_parcacigi_sayisi) as havuz:
+            return sure_olc(lambda: list(havuz.map(yaz, range(is_parcacigi_sayisi))))
+
+    sureler = {}
+    with tempfile.TemporaryDirectory() as dizin, contextlib.redirect_stdout(io.StringIO()):
+        sureler["sqlite (tek dosya)"] = yazma_suresi(HoynVeritabaniYoneticisi(os.path.join(dizin, "tek.db")))
+        for parca_sayisi in (2, 4, 8):
+            sureler[f"parçalı sqlite ({parca_sayisi})"] = yazma_suresi(
+                ParcaliSqliteDepolamaArkaUcu(os.path.join(dizin, f"p{parca_sayisi}.db"), parca_sayisi))
+        sureler["bellek"] = yazma_suresi(BellekDepolamaArkaUcu())
+    sonuc_yazdir(f"Eşzamanlı log yazma ({is_parcacigi_sayisi} iş parçacığı)", adet, sureler)
+    print(f"   CPU çekirdeği: {os.cpu_count()} (parçalar ancak birden çok çekirdek/diskte paralel yazar)")
+    return sureler
+
+def cizim_benchmark(adet: int = 200) -> Dict[int, Dict[str, float]]:
+    """
+    QR sürümüne (matris boyutuna) göre PNG çizim süresini ölçer: qrcode'un PIL resim fabrikası
+    (make_image + PNG kaydetme) vs qr_cizici'nin NumPy ile doğrudan yazdığı 1 bitlik PNG.
+    Girdiler: adet (int) - sürüm başına çizim sayısı
+    Çıktı: QR sürümü -> {yöntem: süre (sn)} sözlüğü
+    """
+    import io
+    import qrcode
+    from qr_cizici import qr_png_olustur
+
+    sonuclar = {}
+    for surum in (1, 5, 10, 20, 40):
+        qr = qrcode.QRCode(version=surum, box_size=10, border=5)
+        qr.add_data("H")
+        qr.make(fit=False)
+
+        def pil_fabrikasi():
+            buffer = io.BytesIO()
+            qr.make_image(fill_color="#000000", back_color="#FFFFFF").save(buffer, format="PNG")
+            return buffer.getvalue()
+
+        sureler = {
+            "make_image + PIL PNG": sure_olc(lambda: [pil_fabrikasi() for _ in range(adet)]),
+            "qr_cizici (NumPy)": sure_olc(lambda: [qr_png_olustur(qr, "#000000", "#FFFFFF") for _ in range(adet)])
+        }
+        boyut = (qr.modules_count + 2 * qr.border) * qr.box_size
+        sonuc_yazdir(f"QR çizimi, sürüm {surum} ({boyut}x{boyut} px)", adet, sureler)
+        print(f"   PNG boyutu: {len(pil_fabrikasi())} B -> {len(qr_png_olustur(qr, '#000000', '#FFFFFF'))} B")
+        sonuclar[surum] = sureler
+    return sonuclar
+
+def toplu_qr_benchmark(adet: int = 200, isci_sayisi: int = 4) -> Dict[str, float]:
+    """
+    Yaka kartı senaryosu: qr_olustur döngüsüyle dizine yazma vs toplu_qr_uret ile ZIP'e akış
+    (aynı süreçte ve isci_sayisi süreçte).
+    Girdiler: adet (int) - QR sayısı, isci_sayisi (int)
+    Çıktı: Yöntem adı -> süre (sn) sözlüğü
+    """
+    import base64
+    import tempfile
+    from qr_uretici import qr_olustur
+    from toplu_qr import toplu_qr_uret
+
+    profil_idleri = [str(uuid.uuid4()) for _ in range(adet)]
+    with tempfile.TemporaryDirectory() as dizin:
+        def tekil_dongu():
+            for profil_id in profil_idleri:
+                with open(os.path.join(dizin, f"{profil_id}.png"), "wb") as dosya:
+                    dosya.write(base64.b64decode(qr_olustur(profil_id)))
+
+        sureler = {
+            "qr_olustur döngüsü": sure_olc(tekil_dongu),
+            "toplu_qr_uret (tek süreç)": sure_olc(
+                lambda: toplu_qr_uret(profil_idleri, os.path.join(dizin, "tek.zip"), isci_sayisi=0)),
+            f"toplu_qr_uret ({isci_sayisi} işçi)": sure_olc(
+                lambda: toplu_qr_uret(profil_idleri, os.path.join(dizin, "havuz.zip"), isci_sayisi=isci_sayisi)),
+        }
+    sonuc_yazdir("Toplu QR üretimi", adet, sureler)
+    print(f"   CPU çekirdeği: {os.cpu_count()} (süreç havuzu ancak birden çok çekirdekte hızlandırır)")
+    return sureler
+
+def cikti_benchmark(adet: int = 200) -> Dict[str, float]:
+    """
+    Aynı QR matrisi için çıktı biçimlerinin kodlama süresini ve boyutunu ölçer. Referans eski yoldur:
+    make_image + PNG + base64, ardından qr_goster'deki base64 çözme + PIL ile açma + yeniden kaydetme.
+    Girdiler: adet (int) - biçim başına kodlama sayısı
+    Çıktı: Biçim adı -> süre (sn) sözlüğü
+    """
+    import base64
+    import io
+    import qrcode
+    from PIL import Image
+    from qr_uretici import qr_resmini_kodla, sifrelenmis_veri_olustur
+
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(sifrelenmis_veri_olustur(str(uuid.uuid4())))
+    qr.make(fit=True)
+
+    def eski_yol() -> bytes:
+        buffer = io.BytesIO()
+        qr.make_image(fill_color="#000000", back_color="#FFFFFF").save(buffer, format="PNG")
+        metin = base64.b64encode(buffer.getvalue()).decode()
+        dosya = io.BytesIO()
+        Image.open(io.BytesIO(base64.b64decode(metin))).save(dosya, format="PNG")
+        return dosya.getvalue()
+
+    def dosya_hedefi() -> bytes:
+        hedef = io.BytesIO()
+        hedef.write(qr_resmini_kodla(qr))
+        return hedef.getvalue()
+
+    bicimler = {
+        "eski: base64 -> PIL -> dosya": eski_yol,
+        "base64 PNG (zlib 6)": lambda: base64.b64encode(qr_resmini_kodla(qr)),
+        "ham PNG (zlib 6)": lambda: qr_resmini_kodla(qr),
+        "ham PNG (zlib 1)": lambda: qr_resmini_kodla(qr, sikistirma=1),
+        "ham PNG (zlib 9)": lambda: qr_resmini_kodla(qr, sikistirma=9),
+        "dosya hedefi (zlib 6)": dosya_hedefi,
+        "SVG": lambda: qr_resmini_kodla(qr, bicim="svg"),
+    }
+    sureler = {ad: sure_olc(lambda: [islem() for _ in range(adet)]) for ad, islem in bicimler.items()}
+    boyut = (qr.modules_count + 2 * qr.border) * qr.box_size
+    sonuc_yazdir(f"QR çıktı biçimleri, sürüm {qr.version} ({boyut}x{boyut} px)", adet, sureler)
+    for ad, islem in bicimler.items():
+        print(f"   {ad:<28} {len(islem()):8d} B")
+    return sureler
+
+def cizim_profili_benchmark(adet: int = 50) -> Dict[str, Dict[str, float]]:
+    """
+    HOYN_QR_V1 ve HOYN_QR_V2 payload'ları için eski sabit düzeni (kutu 10, kenar 5, M) çizim profilleriyle
+    karşılaştırır: QR başına üretim süresi, resim kenarı, PNG boyutu, seçilen sürüm ve hata düzeltme düzeyi.
+    Girdiler: adet (int) - düzen başına QR sayısı
+    Çıktı: Payload biçimi -> {düzen: süre (sn)} sözlüğü
+    """
+    import io
+    from PIL import Image
+    from guvenlik import SISTEM_KIMLIGI_V2
+    from qr_uretici import CIZIM_PROFILLERI, qr_nesnesi_olustur, qr_olustur, sifrelenmis_veri_olustur
+
+    duzeyler = {0: "M", 1: "L", 2: "H", 3: "Q"}  # qrcode.constants değerleri
+    sonuclar = {}
+    for sistem_kimligi in ("HOYN_QR_V1", SISTEM_KIMLIGI_V2):
+        profil_idleri = [str(uuid.uuid4()) for _ in range(adet)]
+        sureler = {}
+        ozetler = []
+        for profil in (None,) + tuple(CIZIM_PROFILLERI):
+            ad = profil or "eski (sabit düzen)"
+            sureler[ad] = sure_olc(lambda: [qr_olustur(p, sistem_kimligi=sistem_kimligi, cikti="png", profil=profil)
+                                            for p in profil_idleri])
+            qr = qr_nesnesi_olustur(sifrelenmis_veri_olustur(profil_idleri[0], sistem_kimligi), profil)
+            png = qr_olustur(profil_idleri[0], sistem_kimligi=sistem_kimligi, cikti="png", profil=profil)
+            ozetler.append(f"   {ad:<28} {Image.open(io.BytesIO(png)).size[0]:5d} px {len(png):7d} B  sürüm "
+                           f"{qr.version:2d}  {duzeyler[qr.error_correction]}  kutu {qr.box_size}  kenar {qr.border}")
+        sonuc_yazdir(f"Çizim profilleri ({sistem_kimligi})", adet, sureler)
+        print("\n".join(ozetler))
+        sonuclar[sistem_kimligi] = sureler
+    return sonuclar
+
+def logo_benchmark(adet: int = 100) -> Dict[str, Dict[str, float]]:
+    """
+    H düzeyinde hazır QR matrisi için logo bindirme maliyetini ölçer: logosuz çizim, her çağrıda boşaltılan
+    (soğuk) önbellekle logo ve ısınmış önbellekle logo. Logo, 1024x1024 RGBA PNG dosyasıdır.
+    Girdiler: adet (int) - durum başına QR sayısı
+    Çıktı: Profil -> {durum: süre (sn)} sözlüğü
+    """
+    import tempfile
+    from PIL import Image, ImageDraw
+    import qr_logo
+    from qr_uretici import qr_nesnesi_olustur, qr_resmini_kodla, sifrelenmis_veri_olustur
+
+    with tempfile.TemporaryDirectory() as gecici_dizin:
+        logo_yolu = os.path.join(gecici_dizin, "logo.png")
+        logo = Image.new("RGBA", (1024, 1024), (0, 0, 0, 0))
+        ImageDraw.Draw(logo).ellipse((0, 0, 1023, 1023), fill="#E040FB")
+        logo.save(logo_yolu)
+
+        veri = sifrelenmis_veri_olustur(str(uuid.uuid4()))
+        onbellek = qr_logo.LogoOnbellegi()
+        sonuclar = {}
+        for profil in ("ekran", "poster"):
+            qr = qr_nesnesi_olustur(veri, profil, hata_duzeltme="H")
+
+            def soguk() -> bytes:
+                onbellek.temizle()
+                return qr_logo.logo_png_olustur(qr, logo=logo_yolu, onbellek=onbellek)
+
+            durumlar = {
+                "logosuz": lambda: qr_resmini_kodla(qr),
+                "logo, soğuk önbellek": soguk,
+                "logo, sıcak önbellek": lambda: qr_logo.logo_png_olustur(qr, logo=logo_yolu, onbellek=onbellek),
+                "logo SVG, sıcak önbellek": lambda: qr_logo.logo_svg_olustur(qr, logo=logo_yolu,
+                                                                               onbellek=onbellek),
+            }
+            sureler = {}
+            for ad, islem in durumlar.items():
+                islem()  # Isınma (sıcak durumlarda önbelleği doldurur)
+                sureler[ad] = sure_olc(lambda: [islem() for _ in range(adet)])
+            boyut = (qr.modules_count + 2 * qr.border) * qr.box_size
+            sonuc_yazdir(f"Logo bindirme, {profil} ({boyut}x{boyut} px, sürüm {qr.version}, H)", adet, sureler)
+            sonuclar[profil] = sureler
+    print(f"   önbellek: {onbellek.istatistikler()}")
+    return sonuclar
+
+def ice_aktarma_suresi_olc(modul: str) -> Dict[str, object]:
+    """
+    Modülü taze bir yorumlayıcıda `-X importtime` ile içe aktarır.
+    PYTHONDONTWRITEBYTECODE kaldırılır: bayt kodu yazılamazsa her ölçüm kaynağı yeniden derler
+    (veritabani'de ~20 ms) ve dağıtımdaki başlangıç maliyeti yerine derleme süresi ölçülür.
+    Girdiler: modul (str)
+    Çıktı: {"ms": kümülatif süre, "agir": yüklenen ağır modüller, "cikti": içe aktarmada yazılan metin}
+    """
+    kod = (f"import sys, {modul}; "
+           f"print('@agir=' + ','.join(m for m in {AGIR_MODULLER!r} if m in sys.modules))")
+    ortam = {ad: deger for ad, deger in os.environ.items() if ad != "PYTHONDONTWRITEBYTECODE"}
+    sonuc = subprocess.run([sys.executable, "-X", "importtime", "-c", kod], capture_output=True, text=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)), env=ortam, check=True)
+    satirlar = sonuc.stdout.splitlines()
+    kumulatif = next(int(satir.split("|")[1]) for satir in reversed(sonuc.stderr.splitlines())
+                     if satir.split("|")[-1].strip() == modul)
+    return {
+        "ms": kumulatif / 1000,
+        "agir": [m for m in satirlar[-1].split("=", 1)[1].split(",") if m],
+        "cikti": "\n".join(satirlar[:-1])
+    }
+
+def ice_aktarma_benchmark(adet: int = 5) -> Dict[str, Dict[str, object]]:
+    """
+    Her modülün başlangıç maliyetini bütçesiyle karşılaştırır (adet kez ölçülür, en iyisi alınır).
+    Girdiler: adet (int) - modül başına taze yorumlayıcı sayısı
+    Çıktı: Modül -> {"ms", "butce_ms", "agir", "cikti"} sözlüğü
+    """
+    sonuclar = {}
+    print(f"\n📊 İçe aktarma süreleri (en iyi {adet} ölçüm)")
+    for modul, butce in ICE_AKTARMA_BUTCELERI.items():
+        ice_aktarma_suresi_olc(modul)  # Isınma: bayt kodu ve disk önbelleği
+        olcumler = [ice_aktarma_suresi_olc(modul) for _ in range(adet)]
+        en_iyi = min(olcumler, key=lambda olcum: olcum["ms"])
+        sonuclar[modul] = dict(en_iyi, butce_ms=butce)
+        durum = "✅" if en_iyi["ms"] <= butce and not en_iyi["agir"] else "❌"
+        ek = f"  ağır: {', '.join(en_iyi['agir'])}" if en_iyi["agir"] else ""
+        print(f"   {durum} {modul:<14} {en_iyi['ms']:7.1f} ms  (bütçe {butce} ms){ek}")
+    return sonuclar
+
+def butce_asildi_mi(sonuclar: Dict[str, Dict[str, object]]) -> bool:
+    """
+    Çıktı: bool (herhangi bir modül bütçesini aştı veya ağır bağımlılık yükledi mi?)
+    """
+    return any(sonuc["ms"] > sonuc["butce_ms"] or sonuc["agir"] for sonuc in sonuclar.values())
+
+OLCUMLER = {
+    "toplu": toplu_uretim_benchmark,
+    "kompakt": kompakt_format_benchmark,
+    "anahtar": anahtar_halkasi_benchmark,
+    "imza": imza_arka_ucu_benchmark,
+    "onfiltre": on_filtre_benchmark,
+    "veritabani": veritabani_benchmark,
+    "profil": profil_benchmark,
+    "topluprofil": toplu_profil_benchmark,
+    "kolon": kolon_arsivi_benchmark,
+    "parca": parca_benchmark,
+    "cizim": cizim_benchmark,
+    "topluqr": toplu_qr_benchmark,
+    "cikti": cikti_benchmark,
+    "cizimprofili": cizim_profili_benchmark,
+    "logo": logo_benchmark,
+    "icaktarma": ice_aktarma_benchmark,
+}
+
+if __name__ == "__main__":
+    ayristirici = argparse.ArgumentParser(description="Hoyn QR performans ölçümleri")
+    ayristirici.add_argument("olcum", choices=sorted(OLCUMLER) + ["hepsi"])
+    ayristirici.add_argument("--adet", type=int, default=None, help="Ölçüm başına adet (varsayılan: ölçüme göre)")
+    argumanlar = ayristirici.parse_args()
+
+    secilenler = OLCUMLER if argumanlar.olcum == "hepsi" else {argumanlar.olcum: OLCUMLER[argumanlar.olcum]}
+    for ad, olcum in secilenler.items():
+        sonuc = olcum() if argumanlar.adet is None else olcum(argumanlar.adet)
+        if ad == "icaktarma" and butce_asildi_mi(sonuc):
+            sys.exit(1)
@@ -1,20 +1,329 @@
 # Hoyn QR Güvenlik Modülü
 # Bu modül, AES-256 şifreleme, HMAC-SHA256 hash doğrulama ve zaman damgası kontrollerini sağlar.
 # Tüm güvenlik işlemleri burada merkezileştirilmiştir.
+# İmza arka uçları takılabilir: HMAC-SHA256 (varsayılan), anahtarlı BLAKE2b ve Ed25519.
+# Anahtarlar, anahtar kimliği (anahtar_id) taşıyan bir anahtar halkasında tutulur ve kesintisiz döndürülebilir.
+# İçe aktarma yan etkisizdir: global yönetici ilk kullanımda kurulur, cryptography (Fernet, Ed25519)
+# ve süreç havuzu ihtiyaç duyulduğunda yüklenir.
 # Gerekli kütüphaneler: cryptography, hashlib, hmac, time, os.
 # Kurulum: pip install cryptography
 
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hmac as crypto_hmac
 import hashlib
 import hmac
 import base64
 import json
 import time
 import os
-from typing import Tuple, Optional
+import itertools
+import math
+import re
+import struct
+import uuid
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Tuple, Optional, Iterable, Iterator, List
+
+from tembel import TembelTekil
+
+# Payload sürümleri
+SISTEM_KIMLIGI_V1 = "HOYN_QR_V1"  # JSON + Fernet + base64
+SISTEM_KIMLIGI_V2 = "HOYN_QR_V2"  # Kompakt ikili düzen, tek URL-safe base64
+
+# HOYN_QR_V2 ikili düzeni: [sürüm baytı][anahtar kimliği][16 bayt UUID][4 bayt zaman damgası][imza]
+# İmza, MAC arka uçlarında 11 bayt, Ed25519'da 64 bayttır.
+KOMPAKT_SURUM_BAYTI = 0xA2
+KOMPAKT_GOVDE = struct.Struct(">BB16sI")
+KOMPAKT_MAC_UZUNLUGU = 11
+KOMPAKT_UZUNLUK = 44  # 33 bayt -> dolgusuz 44 karakter base64
+KOMPAKT_MAKS_UZUNLUK = 116  # Ed25519: 86 bayt -> 116 karakter base64
+
+# Ön filtre desenleri: şifre çözmeden önce yapısal tanıma
+# V2: sürüm baytı 0xA2 base64'te her zaman "o" ile başlar; yalnız bilinen imza uzunlukları
+KOMPAKT_DESENI = re.compile(r"o[A-Za-z0-9_-]{43}|o[A-Za-z0-9_-]{114}=")
+# V1: standart base64; çözülmüş içerik "[anahtar_id.]gAAAAA" (Fernet sürüm baytı + zaman) ile başlar
+V1_DESENI = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+V1_ONEK_DESENI = re.compile(rb"(?:(\d{1,3})\.)?gAAAAA")
+V1_MIN_UZUNLUK = 256
+
+# Anahtar halkası kaynakları (ortam değişkenleri)
+# HOYN_ANAHTAR_HALKASI: JSON metni, HOYN_ANAHTAR_HALKASI_DOSYASI: JSON dosya yolu
+# Biçim: {"aktif": 2, "anahtarlar": {"1": {"fernet": "...", "hmac": "..."}, "2": {...}}}
+ANAHTAR_HALKASI_ORTAM_DEGISKENI = "HOYN_ANAHTAR_HALKASI"
+ANAHTAR_HALKASI_DOSYA_DEGISKENI = "HOYN_ANAHTAR_HALKASI_DOSYASI"
+HMAC_ANAHTARI_ORTAM_DEGISKENI = "HOYN_HMAC_ANAHTARI"
+VARSAYILAN_HMAC_ANAHTARI = b'hoyn_secret_key'
+VARSAYILAN_ANAHTAR_ID = 0  # Anahtar dosyasındaki eski tekil anahtar; V1 payload'larında önek yazılmaz
+# Üretici ile tarayıcı saatleri arasında kabul edilen en büyük fark (sn); daha ileri tarihli damgalar reddedilir
+SAAT_KAYMASI_TOLERANSI = 30
+
+class DogrulamaKodu(str, Enum):
+    """
+    Tarama/doğrulama hattının sonuç kodları (ui_mesajlari bu kodları kullanıcı mesajlarına eşler).
+    Sıra, hattaki aşama sırasıdır: ucuz yapısal retler önce, kriptografik kontroller sonra.
+    """
+    BASARILI = "BASARILI"
+    HOYN_DEGIL = "HOYN_DEGIL"
+    SIFRE_COZME_HATASI = "SIFRE_COZME_HATASI"
+    SISTEM_KIMLIGI_UYUMSUZ = "SISTEM_KIMLIGI_UYUMSUZ"
+    ANAHTAR_BILINMIYOR = "ANAHTAR_BILINMIYOR"
+    HASH_GECERSIZ = "HASH_GECERSIZ"
+    SURE_DOLMUS = "SURE_DOLMUS"
+    TEKRAR_OYNATMA = "TEKRAR_OYNATMA"
+    PROFIL_BULUNAMADI = "PROFIL_BULUNAMADI"
+    UCUNCU_PARTI = "UCUNCU_PARTI"
+
+# tam_dogrulama_yap / qr_payload_dogrula'nın (bool, mesaj) arayüzü için teknik mesajlar
+DOGRULAMA_MESAJLARI = {
+    DogrulamaKodu.BASARILI: "Doğrulama başarılı.",
+    DogrulamaKodu.HOYN_DEGIL: "Şifre çözme başarısız.",
+    DogrulamaKodu.SIFRE_COZME_HATASI: "Şifre çözme başarısız.",
+    DogrulamaKodu.SISTEM_KIMLIGI_UYUMSUZ: "Sistem kimliği uyumsuz: HOYN_QR_V1 veya HOYN_QR_V2 bekleniyor.",
+    DogrulamaKodu.ANAHTAR_BILINMIYOR: "Bilinmeyen anahtar kimliği: QR kodu geçersiz.",
+    DogrulamaKodu.HASH_GECERSIZ: "Hash doğrulama başarısız: Veri manipüle edilmiş olabilir.",
+    DogrulamaKodu.SURE_DOLMUS: "Zaman damgası süresi dolmuş: QR kodu geçersiz.",
+    DogrulamaKodu.TEKRAR_OYNATMA: "Tekrar oynatma tespit edildi: QR kodu daha önce kullanılmış.",
+}
+
+def kanonik_kodla(profil_id: str, sistem_kimligi: str, zaman_damgasi: int) -> bytes:
+    """
+    İmzalanacak alanların JSON'suz, uzunluk önekli kanonik bayt gösterimi.
+    Girdiler: profil_id (str), sistem_kimligi (str), zaman_damgasi (int)
+    Çıktı: bytes
+    """
+    kimlik = sistem_kimligi.encode('utf-8')
+    profil = profil_id.encode('utf-8')
+    return struct.pack(">H", len(kimlik)) + kimlik + struct.pack(">H", len(profil)) + profil + \
+        struct.pack(">Q", zaman_damgasi)
+
+def payload_bicimi_tani(metin: str) -> Optional[str]:
+    """
+    Girdinin Hoyn payload'ı olup olmadığını yalnızca yapısına bakarak (önek, uzunluk, alfabe,
+    sürüm işareti) mikrosaniyeler içinde belirler. Şifre çözme yapmaz, çıktı yazmaz.
+    Girdiler: metin (str) - QR içeriği (URL, vCard, Wi-Fi vb. olabilir)
+    Çıktı: SISTEM_KIMLIGI_V1, SISTEM_KIMLIGI_V2 veya None (Hoyn QR değil)
+    """
+    if not isinstance(metin, str):
+        return None
+    uzunluk = len(metin)
+    if uzunluk <= KOMPAKT_MAKS_UZUNLUK:
+        return SISTEM_KIMLIGI_V2 if KOMPAKT_DESENI.fullmatch(metin) else None
+    if uzunluk < V1_MIN_UZUNLUK or uzunluk % 4 or not metin.startswith(("Z0FBQUFB", "M", "N", "O")):
+        return None
+    if not V1_DESENI.fullmatch(metin):
+        return None
+    # İlk 16 karakter -> 12 bayt: en uzun anahtar öneki ("255.") + Fernet başlığı ("gAAAAA") 10 bayttır
+    return SISTEM_KIMLIGI_V1 if V1_ONEK_DESENI.match(base64.b64decode(metin[:16])) else None
+
+def v1_anahtar_kimligi(metin: str) -> Optional[int]:
+    """
+    HOYN_QR_V1 payload'ının anahtar kimliğini şifre çözmeden, yalnız ilk 16 karakterden okur.
+    Girdiler: metin (str) - payload_bicimi_tani'nın V1 olarak tanıdığı metin
+    Çıktı: Anahtar kimliği (önek yoksa VARSAYILAN_ANAHTAR_ID) veya None (önek okunamadı)
+    """
+    eslesme = V1_ONEK_DESENI.match(base64.b64decode(metin[:16]))
+    if eslesme is None:
+        return None
+    return int(eslesme.group(1)) if eslesme.group(1) else VARSAYILAN_ANAHTAR_ID
+
+class ImzaArkaUcu:
+    """
+    Payload imzalama/doğrulama arayüzü.
+    Alt sınıflar imzala ve dogrula'yı uygular; imza_uzunlugu HOYN_QR_V1 "hash" alanının (tam imza),
+    kompakt_imza_uzunlugu HOYN_QR_V2'de kullanılan bayt sayısıdır.
+    """
+    
+    ad = "soyut"
+    imza_uzunlugu = 32
+    kompakt_imza_uzunlugu = KOMPAKT_MAC_UZUNLUGU
+    
+    def v1_mesaji(self, profil_id: str, sistem_kimligi: str, zaman_damgasi: int) -> bytes:
+        """
+        HOYN_QR_V1 "hash" alanı için imzalanan mesaj (varsayılan: kanonik bayt gösterimi).
+        """
+        return kanonik_kodla(profil_id, sistem_kimligi, zaman_damgasi)
+    
+    def imzala(self, veri: bytes) -> bytes:
+        """
+        Girdiler: veri (bytes)
+        Çıktı: Tam uzunlukta imza (bytes)
+        """
+        raise NotImplementedError
+    
+    def dogrula(self, veri: bytes, imza: bytes) -> bool:
+        """
+        MAC arka uçları için: tam uzunlukta ya da tam olarak kompakt uzunlukta kısaltılmış imzayı sabit
+        zamanlı karşılaştırır (ara uzunluklar reddedilir). Sürüme uygun uzunluğu çağıran seçer.
+        Girdiler: veri (bytes), imza (bytes)
+        Çıktı: bool
+        """
+        if len(imza) not in (self.imza_uzunlugu, self.kompakt_imza_uzunlugu):
+            return False
+        return hmac.compare_digest(self.imzala(veri)[:len(imza)], imza)
+
+class HmacSha256ImzaArkaUcu(ImzaArkaUcu):
+    """
+    HMAC-SHA256 (varsayılan). V1 mesajı, mevcut kodlarla uyum için json.dumps(sort_keys=True) ile aynıdır.
+    """
+    
+    ad = "hmac-sha256"
+    
+    def __init__(self, anahtar: bytes):
+        self.anahtar = anahtar
+        self._sablon = hmac.new(anahtar, digestmod=hashlib.sha256)
+    
+    def __reduce__(self):
+        return (type(self), (self.anahtar,))
+    
+    def v1_mesaji(self, profil_id: str, sistem_kimligi: str, zaman_damgasi: int) -> bytes:
+        # json.dumps({...}, sort_keys=True) ile bayt düzeyinde aynı
+        return (f'{{"profil_id": {json.dumps(profil_id)}, "sistem_kimligi": {json.dumps(sistem_kimligi)}, '
+                f'"zaman_damgasi": {zaman_damgasi}}}').encode('utf-8')
+    
+    def imzala(self, veri: bytes) -> bytes:
+        hmac_nesnesi = self._sablon.copy()
+        hmac_nesnesi.update(veri)
+        return hmac_nesnesi.digest()
+
+class Blake2bImzaArkaUcu(ImzaArkaUcu):
+    """
+    Anahtarlı BLAKE2b (HMAC yapısı gerektirmez, tek geçişte MAC üretir).
+    """
+    
+    ad = "blake2b"
+    
+    def __init__(self, anahtar: bytes):
+        self.anahtar = anahtar
+        self._sablon = hashlib.blake2b(key=anahtar, digest_size=32)
+    
+    def __reduce__(self):
+        return (type(self), (self.anahtar,))
+    
+    def imzala(self, veri: bytes) -> bytes:
+        ozet = self._sablon.copy()
+        ozet.update(veri)
+        return ozet.digest()
+
+class Ed25519ImzaArkaUcu(ImzaArkaUcu):
+    """
+    Ed25519 imzası. Tarayıcı düğümleri yalnızca açık anahtarla doğrulayabilir (paylaşılan sır gerekmez).
+    """
+    
+    ad = "ed25519"
+    imza_uzunlugu = 64
+    kompakt_imza_uzunlugu = 64
+    
+    def __init__(self, ozel_anahtar: Optional[bytes] = None, acik_anahtar: Optional[bytes] = None):
+        """
+        Girdiler: ozel_anahtar (bytes) - 32 bayt ham anahtar, acik_anahtar (bytes) - yalnız doğrulama için
+        """
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+        self.ozel_anahtar = ozel_anahtar
+        self._ozel = Ed25519PrivateKey.from_private_bytes(ozel_anahtar) if ozel_anahtar else None
+        if self._ozel is not None:
+            self._acik = self._ozel.public_key()
+        elif acik_anahtar:
+            self._acik = Ed25519PublicKey.from_public_bytes(acik_anahtar)
+        else:
+            raise ValueError("Ed25519 için özel veya açık anahtar gerekli.")
+        self.acik_anahtar = self._acik.public_bytes_raw()
+    
+    def __reduce__(self):
+        return (type(self), (self.ozel_anahtar, self.acik_anahtar))
+    
+    def imzala(self, veri: bytes) -> bytes:
+        if self._ozel is None:
+            raise ValueError("Bu Ed25519 arka ucu yalnızca doğrulama yapabilir (özel anahtar yok).")
+        return self._ozel.sign(veri)
+    
+    def dogrula(self, veri: bytes, imza: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        try:
+            self._acik.verify(imza, veri)
+            return True
+        except InvalidSignature:
+            return False
+
+# Anahtar halkası tanımındaki "imza" alanı -> arka uç sınıfı
+IMZA_ARKA_UCLARI = {
+    HmacSha256ImzaArkaUcu.ad: HmacSha256ImzaArkaUcu,
+    Blake2bImzaArkaUcu.ad: Blake2bImzaArkaUcu,
+    Ed25519ImzaArkaUcu.ad: Ed25519ImzaArkaUcu,
+}
+
+class AnahtarGirdisi:
+    """
+    Anahtar halkasındaki tek bir girdi: Fernet anahtarı + imza arka ucu.
+    Fernet nesnesi ve anahtarlı imza şablonu bir kez kurulur, her işlemde yeniden kullanılır.
+    """
+    
+    def __init__(self, anahtar_id: int, fernet_anahtari: Optional[bytes], hmac_anahtari: Optional[bytes] = None,
+                 imzalayici: Optional[ImzaArkaUcu] = None):
+        """
+        Girdiler: anahtar_id (int) - 0-255, fernet_anahtari (bytes) - yalnız V2 doğrulayan düğümlerde None olabilir,
+                  hmac_anahtari (bytes) - imzalayici verilmezse HMAC-SHA256 için, imzalayici (ImzaArkaUcu)
+        """
+        if not 0 <= anahtar_id <= 255:
+            raise ValueError(f"Anahtar kimliği 0-255 aralığında olmalı: {anahtar_id}")
+        self.anahtar_id = anahtar_id
+        self.fernet_anahtari = fernet_anahtari
+        self.cipher_suite = None
+        if fernet_anahtari:
+            from cryptography.fernet import Fernet
+            self.cipher_suite = Fernet(fernet_anahtari)
+        self.imzalayici = imzalayici or HmacSha256ImzaArkaUcu(hmac_anahtari)
+        self.hmac_anahtari = self.imzalayici.anahtar if isinstance(self.imzalayici, HmacSha256ImzaArkaUcu) else None
+    
+    def __reduce__(self):
+        # Süreç havuzuna aktarılabilmesi için nesneleri ham anahtarlardan yeniden kur
+        return (type(self), (self.anahtar_id, self.fernet_anahtari, None, self.imzalayici))
+
+class AnahtarHalkasi:
+    """
+    Anahtar kimliğiyle adreslenen anahtar halkası.
+    Yeni payload'lar aktif anahtarla üretilir; doğrulama, payload'daki anahtar
+    kimliğiyle doğrudan doğru anahtara gider (emekli anahtar sayısından bağımsız O(1)).
+    """
+    
+    def __init__(self, girdiler: Iterable[AnahtarGirdisi], aktif_id: int):
+        """
+        Girdiler: girdiler (Iterable[AnahtarGirdisi]), aktif_id (int)
+        """
+        self.girdiler = {girdi.anahtar_id: girdi for girdi in girdiler}
+        if aktif_id not in self.girdiler:
+            raise ValueError(f"Aktif anahtar halkada yok: {aktif_id}")
+        self.aktif = self.girdiler[aktif_id]
+    
+    def girdi(self, anahtar_id: int) -> Optional[AnahtarGirdisi]:
+        """
+        Anahtar kimliğine karşılık gelen girdiyi döndürür (yoksa None).
+        """
+        return self.girdiler.get(anahtar_id)
+    
+    @classmethod
+    def json_yukle(cls, metin: str) -> "AnahtarHalkasi":
+        """
+        JSON biçimindeki anahtar halkası tanımını yükler.
+        Girdiler: metin (str) - {"aktif": id, "anahtarlar": {id: {"fernet": ..., "imza": ..., ...}}}
+                  "imza" yoksa hmac-sha256 ("hmac" alanı); blake2b için "anahtar";
+                  ed25519 için hex "ozel_anahtar" ya da yalnız doğrulama için hex "acik_anahtar"
+        Çıktı: AnahtarHalkasi
+        """
+        tanim = json.loads(metin)
+        girdiler = []
+        for anahtar_id, bilgi in tanim["anahtarlar"].items():
+            tur = bilgi.get("imza", HmacSha256ImzaArkaUcu.ad)
+            if tur not in IMZA_ARKA_UCLARI:
+                raise ValueError(f"Bilinmeyen imza arka ucu: {tur}")
+            if tur == Ed25519ImzaArkaUcu.ad:
+                imzalayici = Ed25519ImzaArkaUcu(
+                    bytes.fromhex(bilgi["ozel_anahtar"]) if bilgi.get("ozel_anahtar") else None,
+                    bytes.fromhex(bilgi["acik_anahtar"]) if bilgi.get("acik_anahtar") else None)
+            else:
+                imzalayici = IMZA_ARKA_UCLARI[tur]((bilgi.get("anahtar") or bilgi["hmac"]).encode('utf-8'))
+            fernet_anahtari = bilgi["fernet"].encode('ascii') if bilgi.get("fernet") else None
+            girdiler.append(AnahtarGirdisi(int(anahtar_id), fernet_anahtari, imzalayici=imzalayici))
+        return cls(girdiler, int(tanim["aktif"]))
 
 class HoynGuvenlikYoneticisi:
     """
@@ -29,6 +338,10 @@ class HoynGuvenlikYoneticisi:
         """
         self.anahtar_dosyasi = anahtar_dosyasi
         self.cipher_suite = None
+        self.anahtar_halkasi = None
+        self.calisma_zamani_girdileri: Dict[int, AnahtarGirdisi] = {}  # imza_arka_ucunu_ayarla ile eklenenler
+        self.dogrulama_onbellegi = None  # Opsiyonel: dogrulama_onbellegini_etkinlestir
+        self.tekrar_koruyucu = None  # Opsiyonel: tekrar_koruyucuyu_etkinlestir
         self.anahtar_olustur_ve_yukle()
     
     def anahtar_olustur_ve_yukle(self) -> None:
@@ -36,31 +349,119 @@ class HoynGuvenlikYoneticisi:
         Güvenli anahtar oluşturur veya mevcut dosyadan yükler.
         Üretimde anahtarları ortam değişkenlerinden almalı.
         """
+        from cryptography.fernet import Fernet
         if os.path.exists(self.anahtar_dosyasi):
             # Mevcut anahtarı yükle
             with open(self.anahtar_dosyasi, "rb") as f:
                 anahtar = f.read()
                 self.cipher_suite = Fernet(anahtar)
+                self.fernet_anahtari = anahtar
         else:
             # Yeni anahtar oluştur
             anahtar = Fernet.generate_key()
             self.cipher_suite = Fernet(anahtar)
+            self.fernet_anahtari = anahtar
             # Anahtarı dosyaya kaydet (güvenli lokasyonda)
             with open(self.anahtar_dosyasi, "wb") as f:
                 f.write(anahtar)
             # Güvenlik uyarısı: Anahtar dosyasını korumalı
             print(f"⚠️ Yeni güvenlik anahtarı oluşturuldu: {self.anahtar_dosyasi}")
             print("Üretimde bu dosyayı güvenli bir yerde saklayın!")
+        self.anahtar_halkasini_yenile()
+    
+    def anahtar_halkasini_yenile(self) -> AnahtarHalkasi:
+        """
+        Anahtar halkasını ortam değişkeninden veya halka dosyasından yeniden yükler (süreç yeniden başlatılmadan).
+        Halka tanımı yoksa anahtar dosyasındaki tekil anahtar kullanılır. Dosyadaki anahtar,
+        halkada aynı kimlik tanımlı değilse eski kodlar için VARSAYILAN_ANAHTAR_ID ile eklenir.
+        imza_arka_ucunu_ayarla ile çalışma zamanında eklenen girdiler yeni halkaya taşınır, böylece
+        onlarla üretilmiş kodlar doğrulanmaya devam eder; aynı kimlik tanımda da varsa tanım kazanır.
+        Aktif anahtarı her zaman yüklenen tanım belirler.
+        Çıktı: Yeni AnahtarHalkasi
+        """
+        hmac_anahtari = os.environ.get(HMAC_ANAHTARI_ORTAM_DEGISKENI, "").encode('utf-8') or VARSAYILAN_HMAC_ANAHTARI
+        eski_girdi = AnahtarGirdisi(VARSAYILAN_ANAHTAR_ID, self.fernet_anahtari, hmac_anahtari)
+        
+        tanim = os.environ.get(ANAHTAR_HALKASI_ORTAM_DEGISKENI)
+        halka_dosyasi = os.environ.get(ANAHTAR_HALKASI_DOSYA_DEGISKENI)
+        if not tanim and halka_dosyasi and os.path.exists(halka_dosyasi):
+            with open(halka_dosyasi, "r", encoding="utf-8") as f:
+                tanim = f.read()
+        
+        if tanim:
+            halka = AnahtarHalkasi.json_yukle(tanim)
+            if halka.girdi(VARSAYILAN_ANAHTAR_ID) is None:
+                halka.girdiler[VARSAYILAN_ANAHTAR_ID] = eski_girdi
+        else:
+            halka = AnahtarHalkasi([eski_girdi], VARSAYILAN_ANAHTAR_ID)
+        
+        for anahtar_id in list(self.calisma_zamani_girdileri):
+            if anahtar_id in halka.girdiler:
+                del self.calisma_zamani_girdileri[anahtar_id]
+            else:
+                halka.girdiler[anahtar_id] = self.calisma_zamani_girdileri[anahtar_id]
+        
+        self.anahtar_halkasini_ayarla(halka)
+        return halka
+    
+    def anahtar_halkasini_ayarla(self, halka: AnahtarHalkasi) -> None:
+        """
+        Anahtar halkasını tek atamada değiştirir ve doğrulama önbelleğini temizler.
+        Girdiler: halka (AnahtarHalkasi)
+        """
+        self.anahtar_halkasi = halka
+        self.cipher_suite = halka.aktif.cipher_suite
+        if self.dogrulama_onbellegi is not None:
+            self.dogrulama_onbellegi.temizle()
+    
+    @property
+    def imza_arka_ucu(self) -> ImzaArkaUcu:
+        """
+        Yeni payload'ları imzalayan aktif imza arka ucu.
+        """
+        return self.anahtar_halkasi.aktif.imzalayici
+    
+    def imza_arka_ucunu_ayarla(self, imzalayici: ImzaArkaUcu) -> int:
+        """
+        Yeni bir imza arka ucuna geçer. Aktif Fernet anahtarıyla yeni anahtar kimliği altında
+        halkaya eklenir, böylece eski arka uçla üretilmiş kodlar doğrulanmaya devam eder.
+        Yeni kimlik, 0-255 aralığındaki en küçük boş kimliktir. Girdi anahtar_halkasini_yenile'den sonra da
+        halkada kalır.
+        Girdiler: imzalayici (ImzaArkaUcu)
+        Çıktı: Yeni anahtar kimliği (int)
+        """
+        halka = self.anahtar_halkasi
+        yeni_id = next((anahtar_id for anahtar_id in range(256) if anahtar_id not in halka.girdiler), None)
+        if yeni_id is None:
+            raise ValueError("Anahtar halkası dolu: 0-255 kimliklerinin tümü kullanımda, "
+                             "önce emekli anahtarları çıkarın")
+        yeni = AnahtarGirdisi(yeni_id, halka.aktif.fernet_anahtari, imzalayici=imzalayici)
+        self.calisma_zamani_girdileri[yeni_id] = yeni
+        self.anahtar_halkasini_ayarla(AnahtarHalkasi(list(halka.girdiler.values()) + [yeni], yeni_id))
+        return yeni_id
+    
+    def _hmac_anahtari(self, gizli_anahtar: Optional[bytes], anahtar_id: Optional[int] = None) -> Optional[bytes]:
+        """
+        Açık verilen anahtarı ya da halkadaki (varsayılan: aktif) HMAC anahtarını döndürür.
+        """
+        if gizli_anahtar is not None:
+            return gizli_anahtar
+        girdi = self.anahtar_halkasi.aktif if anahtar_id is None else self.anahtar_halkasi.girdi(anahtar_id)
+        return girdi.hmac_anahtari if girdi else None
     
     def veri_sifrele(self, veri: dict) -> str:
         """
-        JSON veriyi AES-256 ile şifreler ve base64 encode eder.
+        JSON veriyi AES-256 ile aktif anahtarla şifreler ve base64 encode eder.
+        Aktif anahtar varsayılan değilse token'ın önüne "<anahtar_id>." eklenir.
         Girdiler: veri (dict) - Şifrelenecek payload
         Çıktı: Şifrelenmiş base64 string
         """
         try:
+            aktif = self.anahtar_halkasi.aktif
             json_veri = json.dumps(veri).encode('utf-8')
-            sifrelenmis = self.cipher_suite.encrypt(json_veri)
+            sifrelenmis = aktif.cipher_suite.encrypt(json_veri)
+            if aktif.anahtar_id != VARSAYILAN_ANAHTAR_ID:
+                sifrelenmis = b"%d." % aktif.anahtar_id + sifrelenmis
             return base64.b64encode(sifrelenmis).decode('utf-8')
         except Exception as e:
             raise Exception(f"Şifreleme hatası: {e}")
@@ -68,96 +469,571 @@ class HoynGuvenlikYoneticisi:
     def veri_coz(self, sifrelenmis_base64: str) -> Optional[dict]:
         """
         Şifrelenmiş base64 veriyi çözer ve JSON'a dönüştürür.
+        Anahtar, token önekindeki anahtar kimliğinden doğrudan seçilir.
         Girdiler: sifrelenmis_base64 (str)
-        Çıktı: Çözülmüş dict veya None (hata durumunda)
+        Çıktı: Çözülmüş dict ("anahtar_id" eklenmiş) veya None (hata durumunda)
         """
         try:
-            sifrelenmis = base64.b64decode(sifrelenmis_base64)
-            cozulmus = self.cipher_suite.decrypt(sifrelenmis).decode('utf-8')
-            return json.loads(cozulmus)
+            return self._v1_coz(sifrelenmis_base64)
         except Exception as e:
             print(f"Şifre çözme hatası: {e}")
             return None
     
-    def hmac_hash_olustur(self, veri: dict, gizli_anahtar: bytes = b'hoyn_secret_key') -> str:
+    def _v1_coz(self, sifrelenmis_base64: str) -> dict:
+        """
+        HOYN_QR_V1 çözme adımı; hataları yükseltir (sessiz tarama hattı ve veri_coz ortak kullanır).
+        """
+        sifrelenmis = base64.b64decode(sifrelenmis_base64)
+        onek, ayirici, token = sifrelenmis.partition(b".")
+        anahtar_id = int(onek) if ayirici else VARSAYILAN_ANAHTAR_ID
+        girdi = self.anahtar_halkasi.girdi(anahtar_id)
+        if girdi is None:
+            raise ValueError(f"Bilinmeyen anahtar kimliği: {anahtar_id}")
+        cozulmus = girdi.cipher_suite.decrypt(token if ayirici else sifrelenmis).decode('utf-8')
+        payload = json.loads(cozulmus)
+        payload["anahtar_id"] = anahtar_id
+        return payload
+    
+    def hmac_hash_olustur(self, veri: dict, gizli_anahtar: Optional[bytes] = None) -> str:
         """
         HMAC-SHA256 ile veri hash'i oluşturur.
-        Girdiler: veri (dict), gizli_anahtar (bytes)
+        Girdiler: veri (dict), gizli_anahtar (bytes) - None ise aktif halka anahtarı
         Çıktı: HMAC hash string
         """
         json_veri = json.dumps(veri, sort_keys=True).encode('utf-8')
-        hmac_nesnesi = hmac.new(gizli_anahtar, json_veri, hashlib.sha256)
+        hmac_nesnesi = hmac.new(self._hmac_anahtari(gizli_anahtar), json_veri, hashlib.sha256)
         return hmac_nesnesi.hexdigest()
     
-    def hmac_hash_dogrula(self, veri: dict, beklenen_hash: str, gizli_anahtar: bytes = b'hoyn_secret_key') -> bool:
+    def hmac_hash_dogrula(self, veri: dict, beklenen_hash: str, gizli_anahtar: Optional[bytes] = None) -> bool:
         """
         HMAC hash'ini doğrular.
-        Girdiler: veri (dict), beklenen_hash (str), gizli_anahtar (bytes)
+        Girdiler: veri (dict), beklenen_hash (str), gizli_anahtar (bytes) - None ise aktif halka anahtarı
         Çıktı: bool (doğru mu?)
         """
         hesaplanan_hash = self.hmac_hash_olustur(veri, gizli_anahtar)
         return hmac.compare_digest(hesaplanan_hash, beklenen_hash)
     
-    def zaman_damgasi_ekle_ve_hashle(self, payload: dict, gizli_anahtar: bytes = b'hoyn_secret_key') -> dict:
+    def zaman_damgasi_ekle_ve_hashle(self, payload: dict, gizli_anahtar: Optional[bytes] = None) -> dict:
         """
         Payload'a zaman damgası ekler ve HMAC hash hesaplar.
-        Girdiler: payload (dict), gizli_anahtar (bytes)
+        Girdiler: payload (dict), gizli_anahtar (bytes) - None ise aktif halka anahtarı
         Çıktı: Hash'li payload dict
         """
         # Zaman damgası ekle (5 dakika geçerlilik)
         payload["zaman_damgasi"] = int(time.time())
         
         # Hash hesapla (profil_id, sistem_kimligi, zaman_damgasi)
-        hash_verisi = {
-            "profil_id": payload["profil_id"],
-            "sistem_kimligi": payload["sistem_kimligi"],
-            "zaman_damgasi": payload["zaman_damgasi"]
-        }
-        payload["hash"] = self.hmac_hash_olustur(hash_verisi, gizli_anahtar)
+        if gizli_anahtar is not None:
+            hash_verisi = {
+                "profil_id": payload["profil_id"],
+                "sistem_kimligi": payload["sistem_kimligi"],
+                "zaman_damgasi": payload["zaman_damgasi"]
+            }
+            payload["hash"] = self.hmac_hash_olustur(hash_verisi, gizli_anahtar)
+        else:
+            imzalayici = self.imza_arka_ucu
+            payload["hash"] = imzalayici.imzala(imzalayici.v1_mesaji(
+                payload["profil_id"], payload["sistem_kimligi"], payload["zaman_damgasi"])).hex()
         
         return payload
     
     def zaman_damgasi_gecerli_mi(self, zaman_damgasi: int, maks_sure: int = 300) -> bool:
         """
         Zaman damgasının geçerli olup olmadığını kontrol eder.
+        SAAT_KAYMASI_TOLERANSI'ndan daha ileri tarihli damgalar da geçersizdir (ileri tarihli bir kod hem
+        pencereyi uzatır hem de tekrar koruyucunun dilimlerinin dışında kalır).
         Girdiler: zaman_damgasi (int), maks_sure (int) - saniye cinsinden
         Çıktı: bool
         """
         mevcut_zaman = int(time.time())
-        return (mevcut_zaman - zaman_damgasi) <= maks_sure
+        return -SAAT_KAYMASI_TOLERANSI <= (mevcut_zaman - zaman_damgasi) <= maks_sure
     
-    def tam_dogrulama_yap(self, payload: dict, gizli_anahtar: bytes = b'hoyn_secret_key') -> Tuple[bool, str]:
+    def tam_dogrulama_yap(self, payload: dict, gizli_anahtar: Optional[bytes] = None) -> Tuple[bool, str]:
         """
         Payload'un tam doğrulamasını yapar: hash, zaman damgası.
-        Girdiler: payload (dict), gizli_anahtar (bytes)
+        Girdiler: payload (dict), gizli_anahtar (bytes) - None ise payload'daki anahtar_id'nin anahtarı
         Çıktı: (bool, str) - (başarılı mı?, hata mesajı)
         """
+        kod = self.dogrulama_kodu(payload, gizli_anahtar)
+        return kod is DogrulamaKodu.BASARILI, DOGRULAMA_MESAJLARI[kod]
+    
+    def dogrulama_kodu(self, payload: dict, gizli_anahtar: Optional[bytes] = None,
+                       tekrar_kaydet: bool = True) -> DogrulamaKodu:
+        """
+        Çözülmüş payload'u sırayla doğrular: sistem kimliği, anahtar kimliği, imza (bir kez),
+        zaman damgası, tekrar oynatma. İlk başarısız aşamada durur.
+        Girdiler: payload (dict), gizli_anahtar (bytes) - None ise payload'daki anahtar_id'nin anahtarı,
+                  tekrar_kaydet (bool) - False ise tekrar oynatma aşaması atlanır (çağıran, kod kabul
+                  edildikten sonra tekrar_kontrolu'nu kendisi çağırır)
+        Çıktı: DogrulamaKodu
+        """
         # Sistem kimliği kontrolü
-        if payload.get("sistem_kimligi") != "HOYN_QR_V1":
-            return False, "Sistem kimliği uyumsuz: HOYN_QR_V1 bekleniyor."
+        if payload.get("sistem_kimligi") not in (SISTEM_KIMLIGI_V1, SISTEM_KIMLIGI_V2):
+            return DogrulamaKodu.SISTEM_KIMLIGI_UYUMSUZ
+        
+        # Anahtar seçimi (payload'daki kimlikle doğrudan)
+        if gizli_anahtar is None and self.anahtar_halkasi.girdi(
+                payload.get("anahtar_id", self.anahtar_halkasi.aktif.anahtar_id)) is None:
+            return DogrulamaKodu.ANAHTAR_BILINMIYOR
         
         # Hash doğrulama
-        if not self.hmac_hash_dogrula({
-            "profil_id": payload["profil_id"],
-            "sistem_kimligi": payload["sistem_kimligi"],
-            "zaman_damgasi": payload["zaman_damgasi"]
-        }, payload["hash"], gizli_anahtar):
-            return False, "Hash doğrulama başarısız: Veri manipüle edilmiş olabilir."
+        if not self.imza_dogrula(payload, gizli_anahtar):
+            return DogrulamaKodu.HASH_GECERSIZ
         
         # Zaman damgası kontrolü
         if not self.zaman_damgasi_gecerli_mi(payload["zaman_damgasi"]):
-            return False, "Zaman damgası süresi dolmuş: QR kodu geçersiz."
+            return DogrulamaKodu.SURE_DOLMUS
+        
+        # Tekrar oynatma kontrolü (yalnız geçerli payload'lar kaydedilir)
+        if tekrar_kaydet and not self.tekrar_kontrolu(payload):
+            return DogrulamaKodu.TEKRAR_OYNATMA
         
-        return True, "Doğrulama başarılı."
+        return DogrulamaKodu.BASARILI
+    
+    def imza_dogrula(self, payload: dict, gizli_anahtar: Optional[bytes] = None) -> bool:
+        """
+        Payload'un "hash" alanını sürümüne uygun imza arka ucuyla doğrular (V1 HMAC/imza, V2 kompakt MAC).
+        Girdiler: payload (dict), gizli_anahtar (bytes) - None ise payload'daki anahtar_id'nin anahtarı
+        Çıktı: bool
+        """
+        if payload.get("sistem_kimligi") == SISTEM_KIMLIGI_V2:
+            return self.kompakt_mac_dogrula(payload, gizli_anahtar)
+        try:
+            if gizli_anahtar is not None:
+                return self.hmac_hash_dogrula({
+                    "profil_id": payload["profil_id"],
+                    "sistem_kimligi": payload["sistem_kimligi"],
+                    "zaman_damgasi": payload["zaman_damgasi"]
+                }, payload["hash"], gizli_anahtar)
+            girdi = self.anahtar_halkasi.girdi(payload.get("anahtar_id", self.anahtar_halkasi.aktif.anahtar_id))
+            if girdi is None:
+                return False
+            imzalayici = girdi.imzalayici
+            imza = bytes.fromhex(payload["hash"])
+            # V1 her zaman tam imza taşır: kısaltılmış (kompakt) etiket kabul edilmez
+            if len(imza) != imzalayici.imza_uzunlugu:
+                return False
+            return imzalayici.dogrula(imzalayici.v1_mesaji(
+                payload["profil_id"], payload["sistem_kimligi"], payload["zaman_damgasi"]), imza)
+        except (KeyError, ValueError, TypeError):
+            return False
+    
+    def tekrar_kontrolu(self, payload: dict) -> bool:
+        """
+        Tekrar koruyucu etkinse payload'u kaydeder ve daha önce görülüp görülmediğini kontrol eder.
+        Girdiler: payload (dict)
+        Çıktı: bool (True: ilk kez görüldü veya koruyucu kapalı)
+        """
+        if self.tekrar_koruyucu is None:
+            return True
+        return self.tekrar_koruyucu.kontrol_et_ve_ekle(
+            f'{payload.get("anahtar_id")}:{payload["hash"]}'.encode('utf-8'), payload["zaman_damgasi"])
+    
+    def kompakt_mac_olustur(self, govde: bytes, gizli_anahtar: Optional[bytes] = None,
+                            anahtar_id: Optional[int] = None) -> bytes:
+        """
+        HOYN_QR_V2 gövdesi için kısaltılmış imza üretir.
+        Girdiler: govde (bytes) - sürüm + anahtar kimliği + UUID + zaman damgası,
+                  gizli_anahtar (bytes) - verilirse HMAC-SHA256, anahtar_id (int) - None ise aktif arka uç
+        Çıktı: Arka ucun kompakt_imza_uzunlugu kadar baytlık imza
+        """
+        if gizli_anahtar is not None:
+            return hmac.new(gizli_anahtar, govde, hashlib.sha256).digest()[:KOMPAKT_MAC_UZUNLUGU]
+        girdi = self.anahtar_halkasi.aktif if anahtar_id is None else self.anahtar_halkasi.girdi(anahtar_id)
+        return girdi.imzalayici.imzala(govde)[:girdi.imzalayici.kompakt_imza_uzunlugu]
+    
+    def kompakt_payload_olustur(self, profil_id: str) -> str:
+        """
+        HOYN_QR_V2 formatında kompakt payload üretir (aktif anahtar ve imza arka ucuyla).
+        Girdiler: profil_id (str) - UUID formatında olmalı
+        Çıktı: URL-safe base64 string (MAC arka uçlarında 44, Ed25519'da 116 karakter)
+        """
+        aktif = self.anahtar_halkasi.aktif
+        govde = KOMPAKT_GOVDE.pack(KOMPAKT_SURUM_BAYTI, aktif.anahtar_id, uuid.UUID(profil_id).bytes, int(time.time()))
+        return base64.urlsafe_b64encode(govde + self.kompakt_mac_olustur(govde)).decode('ascii')
+    
+    def kompakt_payload_coz(self, metin: str) -> Optional[dict]:
+        """
+        HOYN_QR_V2 payload'ını ayrıştırır (MAC doğrulaması tam_dogrulama_yap'tadır).
+        Girdiler: metin (str)
+        Çıktı: V1 ile aynı anahtarlara sahip payload dict veya None
+        """
+        try:
+            ham = base64.urlsafe_b64decode(metin)
+        except Exception:
+            return None
+        if len(ham) < KOMPAKT_GOVDE.size + KOMPAKT_MAC_UZUNLUGU or ham[0] != KOMPAKT_SURUM_BAYTI:
+            return None
+        _, anahtar_id, uuid_baytlari, zaman_damgasi = KOMPAKT_GOVDE.unpack_from(ham)
+        return {
+            "profil_id": str(uuid.UUID(bytes=uuid_baytlari)),
+            "sistem_kimligi": SISTEM_KIMLIGI_V2,
+            "zaman_damgasi": zaman_damgasi,
+            "hash": ham[KOMPAKT_GOVDE.size:].hex(),
+            "anahtar_id": anahtar_id
+        }
+    
+    def kompakt_mac_dogrula(self, payload: dict, gizli_anahtar: Optional[bytes] = None) -> bool:
+        """
+        HOYN_QR_V2 payload'ının MAC'ini doğrular.
+        Girdiler: payload (dict), gizli_anahtar (bytes) - None ise payload'daki anahtar_id'nin anahtarı
+        Çıktı: bool
+        """
+        try:
+            anahtar_id = payload["anahtar_id"]
+            govde = KOMPAKT_GOVDE.pack(KOMPAKT_SURUM_BAYTI, anahtar_id, uuid.UUID(payload["profil_id"]).bytes,
+                                       payload["zaman_damgasi"])
+            imza = bytes.fromhex(payload["hash"])
+            if gizli_anahtar is not None:
+                return hmac.compare_digest(self.kompakt_mac_olustur(govde, gizli_anahtar), imza)
+            girdi = self.anahtar_halkasi.girdi(anahtar_id)
+            if girdi is None or len(imza) != girdi.imzalayici.kompakt_imza_uzunlugu:
+                return False
+            return girdi.imzalayici.dogrula(govde, imza)
+        except (KeyError, ValueError, TypeError, struct.error):
+            return False
+    
+    def payload_coz(self, metin: str) -> Optional[dict]:
+        """
+        Payload sürümünü payload_bicimi_tani ile tanır ve uygun çözücüyü çağırır.
+        Hoyn yapısına uymayan girdiler şifre çözülmeden (ve çıktı yazılmadan) reddedilir.
+        Girdiler: metin (str) - HOYN_QR_V1 veya HOYN_QR_V2
+        Çıktı: Payload dict veya None
+        """
+        return self._bicime_gore_coz(metin, payload_bicimi_tani(metin))
+    
+    def _bicime_gore_coz(self, metin: str, bicim: Optional[str]) -> Optional[dict]:
+        """
+        Tanınmış biçimdeki payload'ı sessizce çözer (hata çıktısı yazmaz).
+        """
+        if bicim == SISTEM_KIMLIGI_V2:
+            return self.kompakt_payload_coz(metin)
+        if bicim == SISTEM_KIMLIGI_V1:
+            try:
+                return self._v1_coz(metin)
+            except Exception:
+                return None
+        return None
+    
+    def dogrulama_onbellegini_etkinlestir(self, maks_boyut: int = 10000, maks_ttl: int = 60,
+                                          maks_sure: int = 300) -> "DogrulamaOnbellegi":
+        """
+        qr_payload_dogrula önüne süre sınırlı doğrulama önbelleği koyar.
+        Girdiler: maks_boyut (int), maks_ttl (int) - saniye, maks_sure (int) - zaman damgası geçerlilik süresi
+        Çıktı: DogrulamaOnbellegi nesnesi
+        """
+        self.dogrulama_onbellegi = DogrulamaOnbellegi(maks_boyut, maks_ttl, maks_sure)
+        return self.dogrulama_onbellegi
+    
+    def dogrulama_onbellegini_kapat(self) -> None:
+        """
+        Doğrulama önbelleğini devre dışı bırakır.
+        """
+        self.dogrulama_onbellegi = None
+    
+    def tekrar_koruyucuyu_etkinlestir(self, pencere: int = 300, dilim_suresi: int = 60,
+                                      dilim_basina_eleman: int = 100000,
+                                      yanlis_pozitif_orani: float = 0.001) -> "TekrarKoruyucu":
+        """
+        Geçerlilik penceresi içinde aynı payload'un tekrar kullanılmasını reddeden koruyucuyu açar.
+        Bellek kullanımı trafikten bağımsız olarak sabittir.
+        Girdiler: pencere (int) - saniye, dilim_suresi (int) - saniye, dilim_basina_eleman (int),
+                  yanlis_pozitif_orani (float)
+        Çıktı: TekrarKoruyucu nesnesi
+        """
+        self.tekrar_koruyucu = TekrarKoruyucu(pencere, dilim_suresi, dilim_basina_eleman, yanlis_pozitif_orani)
+        return self.tekrar_koruyucu
+    
+    def tekrar_koruyucuyu_kapat(self) -> None:
+        """
+        Tekrar koruyucuyu devre dışı bırakır.
+        """
+        self.tekrar_koruyucu = None
+    
+    def guvenlik_istatistikleri(self) -> dict:
+        """
+        Opsiyonel bileşenlerin sayaçlarını döndürür.
+        Çıktı: dict (dogrulama_onbellegi, tekrar_koruyucu) - kapalı bileşenler None
+        """
+        return {
+            "dogrulama_onbellegi": self.dogrulama_onbellegi.istatistikler() if self.dogrulama_onbellegi else None,
+            "tekrar_koruyucu": self.tekrar_koruyucu.istatistikler() if self.tekrar_koruyucu else None
+        }
+    
+    def toplu_payload_olustur(self, profil_idleri: Iterable[str], sistem_kimligi: str = "HOYN_QR_V1",
+                              isci_sayisi: int = 0, parca_boyutu: int = 1000) -> Iterator[str]:
+        """
+        Çok sayıda profil için şifrelenmiş QR payload'larını akış halinde üretir.
+        Tüm parti tek zaman damgasını paylaşır; HMAC durumu ve Fernet nesnesi yeniden kullanılır.
+        Çıktı, sifrelenmis_qr_payload_olustur ile birebir aynı formattadır.
+        Girdiler: profil_idleri (Iterable[str]), sistem_kimligi (str),
+                  isci_sayisi (int) - 0 ise aynı süreçte çalışır, parca_boyutu (int)
+        Çıktı: Şifrelenmiş base64 string üreteci (girdi sırasıyla)
+        """
+        aktif = self.anahtar_halkasi.aktif
+        zaman_damgasi = int(time.time())
+        profil_iter = iter(profil_idleri)
+        parcalar = iter(lambda: list(itertools.islice(profil_iter, parca_boyutu)), [])
+        
+        if isci_sayisi <= 0:
+            for parca in parcalar:
+                yield from _payload_parcasi_sifrele(aktif, parca, sistem_kimligi, zaman_damgasi)
+            return
+        
+        # Süreç havuzu: sırayı korumak ve belleği sınırlamak için kayan pencere kullan
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+            bekleyenler = []
+            for parca in parcalar:
+                bekleyenler.append(havuz.submit(_payload_parcasi_sifrele, aktif, parca, sistem_kimligi,
+                                                zaman_damgasi))
+                if len(bekleyenler) >= isci_sayisi * 2:
+                    yield from bekleyenler.pop(0).result()
+            for gelecek in bekleyenler:
+                yield from gelecek.result()
 
-# Global güvenlik yöneticisi örneği
-guvenlik_yoneticisi = HoynGuvenlikYoneticisi()
+def _payload_parcasi_sifrele(girdi: AnahtarGirdisi, profil_idleri: List[str],
+                             sistem_kimligi: str, zaman_damgasi: int) -> List[str]:
+    """
+    Bir profil parçasını şifreler (toplu üretimin iç döngüsü).
+    JSON metni, json.dumps çıktısıyla bayt düzeyinde aynı olacak şekilde şablondan kurulur.
+    """
+    sonuclar = []
+    imzalayici = girdi.imzalayici
+    if sistem_kimligi == SISTEM_KIMLIGI_V2:
+        for profil_id in profil_idleri:
+            govde = KOMPAKT_GOVDE.pack(KOMPAKT_SURUM_BAYTI, girdi.anahtar_id, uuid.UUID(profil_id).bytes, zaman_damgasi)
+            sonuclar.append(base64.urlsafe_b64encode(
+                govde + imzalayici.imzala(govde)[:imzalayici.kompakt_imza_uzunlugu]).decode('ascii'))
+        return sonuclar
+    
+    kimlik_json = json.dumps(sistem_kimligi)
+    # veri_sifrele: json.dumps(payload) -> ekleme sırası
+    payload_orta = f', "sistem_kimligi": {kimlik_json}, "zaman_damgasi": {zaman_damgasi}, "hash": "'
+    onek = b"" if girdi.anahtar_id == VARSAYILAN_ANAHTAR_ID else b"%d." % girdi.anahtar_id
+    
+    for profil_id in profil_idleri:
+        profil_json = json.dumps(profil_id)
+        imza = imzalayici.imzala(imzalayici.v1_mesaji(profil_id, sistem_kimligi, zaman_damgasi)).hex()
+        json_veri = f'{{"profil_id": {profil_json}{payload_orta}{imza}"}}'.encode('utf-8')
+        sifrelenmis = girdi.cipher_suite.encrypt_at_time(json_veri, zaman_damgasi)
+        sonuclar.append(base64.b64encode(onek + sifrelenmis).decode('utf-8'))
+    return sonuclar
+
+class DogrulamaOnbellegi:
+    """
+    Başarılı doğrulamalar için LRU + TTL önbelleği.
+    Anahtar, şifreli metnin özetidir; bir kayıt hiçbir zaman payload'un kendi
+    geçerlilik penceresini (zaman_damgasi + maks_sure) aşmaz.
+    """
+    
+    def __init__(self, maks_boyut: int = 10000, maks_ttl: int = 60, maks_sure: int = 300):
+        """
+        Önbelleği başlatır.
+        Girdiler: maks_boyut (int) - kayıt sınırı, maks_ttl (int) - saniye, maks_sure (int) - saniye
+        """
+        self.maks_boyut = maks_boyut
+        self.maks_ttl = maks_ttl
+        self.maks_sure = maks_sure
+        self._kayitlar = OrderedDict()  # ozet -> (bitis_zamani, mesaj, payload)
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.suresi_dolan = 0
+    
+    @staticmethod
+    def ozet_al(sifrelenmis_base64: str) -> bytes:
+        """
+        Şifreli metnin önbellek anahtarını üretir.
+        """
+        return hashlib.blake2b(sifrelenmis_base64.encode('utf-8'), digest_size=16).digest()
+    
+    def al(self, sifrelenmis_base64: str) -> Optional[Tuple[bool, str, dict]]:
+        """
+        Geçerli bir önbellek kaydı varsa doğrulama sonucunu döndürür.
+        Girdiler: sifrelenmis_base64 (str)
+        Çıktı: (True, mesaj, payload kopyası) veya None
+        """
+        ozet = self.ozet_al(sifrelenmis_base64)
+        mevcut_zaman = int(time.time())
+        with self._kilit:
+            kayit = self._kayitlar.get(ozet)
+            if kayit is None:
+                self.iska += 1
+                return None
+            bitis_zamani, mesaj, payload = kayit
+            if mevcut_zaman > bitis_zamani:
+                del self._kayitlar[ozet]
+                self.suresi_dolan += 1
+                self.iska += 1
+                return None
+            self._kayitlar.move_to_end(ozet)
+            self.isabet += 1
+        return True, mesaj, dict(payload)
+    
+    def ekle(self, sifrelenmis_base64: str, mesaj: str, payload: dict) -> None:
+        """
+        Başarılı bir doğrulamayı önbelleğe ekler.
+        Girdiler: sifrelenmis_base64 (str), mesaj (str), payload (dict)
+        """
+        mevcut_zaman = int(time.time())
+        # zaman_damgasi_gecerli_mi: (mevcut - damga) <= maks_sure -> son geçerli saniye damga + maks_sure
+        bitis_zamani = min(mevcut_zaman + self.maks_ttl, payload["zaman_damgasi"] + self.maks_sure)
+        if bitis_zamani < mevcut_zaman:
+            return
+        ozet = self.ozet_al(sifrelenmis_base64)
+        with self._kilit:
+            self._kayitlar[ozet] = (bitis_zamani, mesaj, dict(payload))
+            self._kayitlar.move_to_end(ozet)
+            while len(self._kayitlar) > self.maks_boyut:
+                self._kayitlar.popitem(last=False)
+                self.tahliye += 1
+    
+    def temizle(self) -> None:
+        """
+        Tüm kayıtları siler (sayaçlar korunur).
+        """
+        with self._kilit:
+            self._kayitlar.clear()
+    
+    def istatistikler(self) -> dict:
+        """
+        Önbellek sayaçlarını döndürür.
+        Çıktı: dict (boyut, isabet, iska, isabet_orani, tahliye, suresi_dolan)
+        """
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                "boyut": len(self._kayitlar),
+                "isabet": self.isabet,
+                "iska": self.iska,
+                "isabet_orani": self.isabet / toplam if toplam else 0.0,
+                "tahliye": self.tahliye,
+                "suresi_dolan": self.suresi_dolan
+            }
+
+class BloomFiltresi:
+    """
+    Sabit boyutlu Bloom filtresi (çift hash ile k konum).
+    Boyut, beklenen eleman sayısı ve hedef yanlış pozitif oranından hesaplanır.
+    """
+    
+    def __init__(self, beklenen_eleman: int, yanlis_pozitif_orani: float):
+        """
+        Girdiler: beklenen_eleman (int), yanlis_pozitif_orani (float) - 0 ile 1 arası
+        """
+        if not 0 < yanlis_pozitif_orani < 1:
+            raise ValueError("Yanlış pozitif oranı 0 ile 1 arasında olmalı.")
+        self.bit_sayisi = max(8, int(-beklenen_eleman * math.log(yanlis_pozitif_orani) / (math.log(2) ** 2)))
+        self.hash_sayisi = max(1, round(self.bit_sayisi / beklenen_eleman * math.log(2)))
+        self.bitler = bytearray((self.bit_sayisi + 7) // 8)
+    
+    def _konumlar(self, anahtar: bytes) -> Iterator[int]:
+        ozet = hashlib.blake2b(anahtar, digest_size=16).digest()
+        h1 = int.from_bytes(ozet[:8], "little")
+        h2 = int.from_bytes(ozet[8:], "little") | 1
+        for i in range(self.hash_sayisi):
+            yield (h1 + i * h2) % self.bit_sayisi
+    
+    def ekle_ve_kontrol_et(self, anahtar: bytes) -> bool:
+        """
+        Anahtarı ekler.
+        Çıktı: bool (True: anahtar muhtemelen zaten vardı)
+        """
+        vardi = True
+        for konum in self._konumlar(anahtar):
+            bayt, bit = divmod(konum, 8)
+            if not self.bitler[bayt] & (1 << bit):
+                vardi = False
+                self.bitler[bayt] |= 1 << bit
+        return vardi
+    
+    def temizle(self) -> None:
+        """
+        Tüm bitleri sıfırlar (bellek yeniden kullanılır).
+        """
+        self.bitler[:] = bytes(len(self.bitler))
+
+class TekrarKoruyucu:
+    """
+    Zaman dilimli, dönen Bloom filtreleriyle tekrar oynatma tespiti.
+    Her payload, kendi zaman damgasının dilimine kaydedilir; böylece kontrol tek filtreye bakar.
+    Dilimler halka şeklinde yeniden kullanılır ve pencereden eski dilimler sıfırlanır,
+    bu yüzden bellek trafikten bağımsız sabittir. Yanlış pozitif, geçerli bir kodun
+    tekrar sanılıp reddedilmesi demektir (oran yapılandırılabilir).
+    """
+    
+    def __init__(self, pencere: int = 300, dilim_suresi: int = 60, dilim_basina_eleman: int = 100000,
+                 yanlis_pozitif_orani: float = 0.001):
+        """
+        Girdiler: pencere (int) - geçerlilik süresi (sn), dilim_suresi (int) - sn,
+                  dilim_basina_eleman (int), yanlis_pozitif_orani (float)
+        """
+        self.pencere = pencere
+        self.dilim_suresi = dilim_suresi
+        # Pencereyi örten dilimler + şimdiki dilim + saat kayması için bir ileri dilim
+        self.dilim_sayisi = math.ceil(pencere / dilim_suresi) + 2
+        self._filtreler = [BloomFiltresi(dilim_basina_eleman, yanlis_pozitif_orani) for _ in range(self.dilim_sayisi)]
+        self._dilim_indeksleri = [-1] * self.dilim_sayisi
+        self._kilit = threading.Lock()
+        self.kontrol = 0
+        self.red = 0
+        self.kapsam_disi = 0
+    
+    def kontrol_et_ve_ekle(self, anahtar: bytes, zaman_damgasi: int) -> bool:
+        """
+        Payload kimliğini kaydeder.
+        Girdiler: anahtar (bytes) - payload kimliği, zaman_damgasi (int)
+        Çıktı: bool (True: ilk kez görüldü, False: tekrar)
+        """
+        dilim_indeksi = zaman_damgasi // self.dilim_suresi
+        mevcut_indeks = int(time.time()) // self.dilim_suresi
+        with self._kilit:
+            self.kontrol += 1
+            if dilim_indeksi > mevcut_indeks + 1:
+                # İleri tarihli: süre kontrolü reddeder; yine de kaydedilmeden geçmesin, en yeni dilime yazılır
+                # (kendi dilimine yazılsaydı pencere içindeki bir yuvayı sıfırlardı)
+                self.kapsam_disi += 1
+                dilim_indeksi = mevcut_indeks + 1
+            elif dilim_indeksi < mevcut_indeks - self.dilim_sayisi + 2:
+                # Pencereden eski: süre kontrolü zaten reddeder
+                self.kapsam_disi += 1
+                return True
+            yuva = dilim_indeksi % self.dilim_sayisi
+            if self._dilim_indeksleri[yuva] != dilim_indeksi:
+                self._filtreler[yuva].temizle()
+                self._dilim_indeksleri[yuva] = dilim_indeksi
+            if self._filtreler[yuva].ekle_ve_kontrol_et(anahtar):
+                self.red += 1
+                return False
+            return True
+    
+    def istatistikler(self) -> dict:
+        """
+        Koruyucu sayaçlarını döndürür.
+        Çıktı: dict (kontrol, red, kapsam_disi, dilim_sayisi, bellek_bayt)
+        """
+        with self._kilit:
+            return {
+                "kontrol": self.kontrol,
+                "red": self.red,
+                "kapsam_disi": self.kapsam_disi,
+                "dilim_sayisi": self.dilim_sayisi,
+                "bellek_bayt": sum(len(filtre.bitler) for filtre in self._filtreler)
+            }
+
+# Global güvenlik yöneticisi örneği (ilk kullanımda kurulur)
+guvenlik_yoneticisi = TembelTekil(HoynGuvenlikYoneticisi)
 
 # Yardımcı fonksiyonlar (modüler kullanım için)
 def sifrelenmis_qr_payload_olustur(profil_id: str, sistem_kimligi: str = "HOYN_QR_V1") -> str:
     """
     Şifrelenmiş QR payload oluşturur (guvenlik modülünü kullanır).
+    sistem_kimligi HOYN_QR_V2 ise kompakt ikili format üretilir.
     """
+    if sistem_kimligi == SISTEM_KIMLIGI_V2:
+        return guvenlik_yoneticisi.kompakt_payload_olustur(profil_id)
     payload = {
         "profil_id": profil_id,
         "sistem_kimligi": sistem_kimligi
@@ -167,16 +1043,55 @@ def sifrelenmis_qr_payload_olustur(profil_id: str, sistem_kimligi: str = "HOYN_Q
     # Şifrele
     return guvenlik_yoneticisi.veri_sifrele(payload)
 
+def toplu_sifrelenmis_qr_payload_olustur(profil_idleri: Iterable[str], sistem_kimligi: str = "HOYN_QR_V1",
+                                         isci_sayisi: int = 0) -> Iterator[str]:
+    """
+    Birden çok profil için şifrelenmiş QR payload'larını akış halinde üretir.
+    """
+    return guvenlik_yoneticisi.toplu_payload_olustur(profil_idleri, sistem_kimligi, isci_sayisi=isci_sayisi)
+
 def qr_payload_dogrula(sifrelenmis_base64: str) -> Tuple[bool, str, Optional[dict]]:
     """
-    Şifrelenmiş payload'ı çözer ve doğrular.
+    Şifrelenmiş payload'ı çözer ve doğrular (HOYN_QR_V1 ve HOYN_QR_V2).
+    Doğrulama önbelleği etkinse tekrar taranan kodlar şifre çözülmeden yanıtlanır;
+    tekrar koruyucu önbellek isabetlerinde de çalışır.
+    """
+    kod, payload = qr_payload_kodu(sifrelenmis_base64)
+    return kod is DogrulamaKodu.BASARILI, DOGRULAMA_MESAJLARI[kod], payload
+
+def qr_payload_kodu(metin: str, tekrar_kaydet: bool = True) -> Tuple[DogrulamaKodu, Optional[dict]]:
+    """
+    Tek geçişli doğrulama hattı: yapısal tanıma -> (önbellek) -> tek çözme -> tek imza doğrulama
+    -> zaman damgası -> tekrar oynatma. Her aşama başarısızlıkta hemen döner; çıktı yazmaz.
+    Girdiler: metin (str) - taranan QR içeriği,
+              tekrar_kaydet (bool) - False ise kod tekrar koruyucuya kaydedilmez (tarayıcı, taramayı
+              kabul ettikten sonra kaydeder; reddedilen taramalar kodu tüketmez)
+    Çıktı: (DogrulamaKodu, payload dict veya None)
     """
-    payload = guvenlik_yoneticisi.veri_coz(sifrelenmis_base64)
+    bicim = payload_bicimi_tani(metin)
+    if bicim is None:
+        return DogrulamaKodu.HOYN_DEGIL, None
+    
+    onbellek = guvenlik_yoneticisi.dogrulama_onbellegi
+    if onbellek is not None:
+        sonuc = onbellek.al(metin)
+        if sonuc is not None:
+            if tekrar_kaydet and not guvenlik_yoneticisi.tekrar_kontrolu(sonuc[2]):
+                return DogrulamaKodu.TEKRAR_OYNATMA, sonuc[2]
+            return DogrulamaKodu.BASARILI, sonuc[2]
+    
+    # V1'de anahtar kimliği şifreli token'ın önünde açıktır: bilinmeyen kimlik, V2'deki gibi ayrı kodla döner
+    if bicim == SISTEM_KIMLIGI_V1 and guvenlik_yoneticisi.anahtar_halkasi.girdi(v1_anahtar_kimligi(metin)) is None:
+        return DogrulamaKodu.ANAHTAR_BILINMIYOR, None
+    
+    payload = guvenlik_yoneticisi._bicime_gore_coz(metin, bicim)
     if not payload:
-        return False, "Şifre çözme başarısız.", None
+        return DogrulamaKodu.SIFRE_COZME_HATASI, None
     
-    dogru_mu, mesaj = guvenlik_yoneticisi.tam_dogrulama_yap(payload)
-    return dogru_mu, mesaj, payload
+    kod = guvenlik_yoneticisi.dogrulama_kodu(payload, tekrar_kaydet=tekrar_kaydet)
+    if kod is DogrulamaKodu.BASARILI and onbellek is not None:
+        onbellek.ekle(metin, DOGRULAMA_MESAJLARI[kod], payload)
+    return kod, payload
 
 # Test fonksiyonları
 if __name__ == "__main__":
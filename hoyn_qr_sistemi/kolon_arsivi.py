@@ -0,0 +1,274 @@
+# Hoyn QR Kolonsal Tarama Arşivi Modülü
+# Bu modül, tarama loglarını analitik için sıkıştırılmış kolonsal bir dizine yazar ve NumPy ile okur.
+# Biçim (dizin başına bir arşiv; meta.json en son yazılır, yoksa arşiv yarımdır):
+#   zaman.i8                    int64 epoch saniye (UTC), eskiden yeniye
+#   tarayici_tipi.u2            uint16 sözlük kodu  + tarayici_tipi.sozluk.json (kod -> değer)
+#   profil_id.u4                uint32 sözlük kodu  + profil_id.sozluk.json
+#   basarili_mi.bit             bit eşlemi (np.packbits, bitorder="little")
+# Okuyucu (KolonArsivi) sütunları np.memmap ile eşler: toplamalar (saat / tarayıcı dağılımı) Python nesnesi
+# oluşturmadan, vektörel np.bincount ile çalışır; yalnızca dokunulan sayfalar belleğe gelir.
+# Komut satırı: python kolon_arsivi.py olustur ARSIV_DIZINI [--gun 365] [--db YOL]
+#               python kolon_arsivi.py ozet ARSIV_DIZINI [--saat-farki 3]
+# Gerekli kütüphaneler: numpy (pip install numpy), json, os.
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+import veritabani
+
+ARSIV_SURUMU = 1
+META_DOSYASI = "meta.json"
+
+# Sütun adı -> (dosya, NumPy veri tipi); sözlük kodlu sütunların değerleri <ad>.sozluk.json'dadır
+KOLONLAR = {
+    "zaman": ("zaman.i8", "<i8"),
+    "tarayici_tipi": ("tarayici_tipi.u2", "<u2"),
+    "profil_id": ("profil_id.u4", "<u4"),
+    "basarili_mi": ("basarili_mi.bit", "u1"),
+}
+SOZLUK_KOLONLARI = ("tarayici_tipi", "profil_id")
+
+ZamanDegeri = Union[int, str, datetime]
+
+def _epoch(deger: ZamanDegeri) -> int:
+    """
+    Zamanı epoch saniyeye çevirir: int olduğu gibi, "YYYY-MM-DD[ HH:MM:SS]" ve saf datetime UTC kabul edilir.
+    """
+    if isinstance(deger, str):
+        deger = datetime.fromisoformat(deger)
+    if isinstance(deger, datetime):
+        if deger.tzinfo is None:
+            deger = deger.replace(tzinfo=timezone.utc)
+        return int(deger.timestamp())
+    return int(deger)
+
+def tarama_loglarini_arsivle(dizin: str, son_gun_sayisi: int = 365,
+                             yonetici: "veritabani.HoynVeritabaniYoneticisi" = None) -> "KolonArsivi":
+    """
+    Son son_gun_sayisi günün tarama loglarını (log bölümleri dahil) kolonsal arşive akış halinde yazar.
+    Mevcut arşivin üzerine yazar; bellek kullanımı parti boyutu + sözlüklerle sınırlıdır.
+    Girdiler: dizin (str), son_gun_sayisi (int), yonetici - varsayılan global veritabanı yöneticisi
+    Çıktı: Yazılan arşivi okuyan KolonArsivi
+    """
+    yonetici = veritabani.veritabani_yoneticisi if yonetici is None else yonetici
+    os.makedirs(dizin, exist_ok=True)
+    meta_yolu = os.path.join(dizin, META_DOSYASI)
+    if os.path.exists(meta_yolu):
+        os.remove(meta_yolu)  # Yazma yarıda kalırsa eski meta yeni sütunları yanlış tarif etmesin
+
+    sozlukler: Dict[str, Dict[str, int]] = {kolon: {} for kolon in SOZLUK_KOLONLARI}
+    dosyalar = {kolon: open(os.path.join(dizin, dosya), "wb") for kolon, (dosya, _) in KOLONLAR.items()}
+    satir_sayisi = 0
+    sirali = True
+    son_zaman = None
+    bekleyen_bitler = np.empty(0, dtype=bool)  # 8'in katına tamamlanmamış basarili_mi bitleri
+    try:
+        for parti in yonetici.tarama_logu_kolonlarini_gez(son_gun_sayisi):
+            zamanlar, tarayicilar, profiller, basarililar = zip(*parti)
+            zaman = np.array(zamanlar, dtype=KOLONLAR["zaman"][1])
+            if sirali and len(zaman):
+                sirali = bool((son_zaman is None or son_zaman <= zaman[0]) and np.all(zaman[1:] >= zaman[:-1]))
+                son_zaman = zaman[-1]
+            zaman.tofile(dosyalar["zaman"])
+            for kolon, degerler in (("tarayici_tipi", tarayicilar), ("profil_id", profiller)):
+                sozluk = sozlukler[kolon]
+                kodlar = np.fromiter((sozluk.setdefault(deger, len(sozluk)) for deger in degerler),
+                                     dtype=np.int64, count=len(degerler))
+                sinir = np.iinfo(KOLONLAR[kolon][1]).max
+                if len(sozluk) > sinir:
+                    raise ValueError(f"{kolon} sözlüğü {sinir} değeri aşıyor")
+                kodlar.astype(KOLONLAR[kolon][1]).tofile(dosyalar[kolon])
+            bitler = np.concatenate([bekleyen_bitler, np.array(basarililar, dtype=bool)])
+            tam = len(bitler) - len(bitler) % 8
+            np.packbits(bitler[:tam], bitorder="little").tofile(dosyalar["basarili_mi"])
+            bekleyen_bitler = bitler[tam:]
+            satir_sayisi += len(parti)
+        np.packbits(bekleyen_bitler, bitorder="little").tofile(dosyalar["basarili_mi"])
+    finally:
+        for dosya in dosyalar.values():
+            dosya.close()
+
+    for kolon, sozluk in sozlukler.items():
+        with open(os.path.join(dizin, f"{kolon}.sozluk.json"), "w", encoding="utf-8") as dosya:
+            json.dump(list(sozluk), dosya, ensure_ascii=False)
+    meta = {
+        "surum": ARSIV_SURUMU,
+        "satir_sayisi": satir_sayisi,
+        "zamana_gore_sirali": sirali,
+        "olusturma_zamani": int(datetime.now(timezone.utc).timestamp()),
+        "son_gun_sayisi": int(son_gun_sayisi),
+        "kolonlar": {kolon: {"dosya": dosya, "tip": tip} for kolon, (dosya, tip) in KOLONLAR.items()},
+    }
+    with open(meta_yolu + ".gecici", "w", encoding="utf-8") as dosya:
+        json.dump(meta, dosya, indent=2)
+    os.replace(meta_yolu + ".gecici", meta_yolu)
+    return KolonArsivi(dizin)
+
+class KolonArsivi:
+    """
+    Kolonsal tarama arşivi okuyucusu. Sütunlar np.memmap olarak salt okunur eşlenir;
+    sözlükler ve açılmış bit eşlemi ilk kullanımda yüklenir.
+    """
+
+    def __init__(self, dizin: str):
+        """
+        Girdiler: dizin (str) - tarama_loglarini_arsivle ile yazılmış arşiv dizini
+        """
+        self.dizin = dizin
+        with open(os.path.join(dizin, META_DOSYASI), encoding="utf-8") as dosya:
+            self.meta = json.load(dosya)
+        if self.meta.get("surum") != ARSIV_SURUMU:
+            raise ValueError(f"Desteklenmeyen arşiv sürümü: {self.meta.get('surum')}")
+        self.satir_sayisi: int = self.meta["satir_sayisi"]
+        self.zamana_gore_sirali: bool = self.meta["zamana_gore_sirali"]
+        self.zaman = self._esle("zaman", self.satir_sayisi)
+        self.tarayici_kodlari = self._esle("tarayici_tipi", self.satir_sayisi)
+        self.profil_kodlari = self._esle("profil_id", self.satir_sayisi)
+
+    def _esle(self, kolon: str, uzunluk: int) -> np.ndarray:
+        tanim = self.meta["kolonlar"][kolon]
+        if uzunluk == 0:
+            return np.empty(0, dtype=tanim["tip"])  # Boş dosya eşlenemez
+        return np.memmap(os.path.join(self.dizin, tanim["dosya"]), dtype=tanim["tip"], mode="r", shape=(uzunluk,))
+
+    def __len__(self) -> int:
+        return self.satir_sayisi
+
+    @cached_property
+    def basarili(self) -> np.ndarray:
+        """
+        Çıktı: bool dizisi (basarili_mi), bit eşleminden açılmış
+        """
+        paketli = self._esle("basarili_mi", (self.satir_sayisi + 7) // 8)
+        return np.unpackbits(paketli, count=self.satir_sayisi, bitorder="little").view(bool)
+
+    def _sozluk(self, kolon: str) -> List[str]:
+        with open(os.path.join(self.dizin, f"{kolon}.sozluk.json"), encoding="utf-8") as dosya:
+            return json.load(dosya)
+
+    @cached_property
+    def tarayici_tipleri(self) -> List[str]:
+        """
+        Çıktı: Kod -> tarayici_tipi listesi
+        """
+        return self._sozluk("tarayici_tipi")
+
+    @cached_property
+    def profil_idleri(self) -> List[str]:
+        """
+        Çıktı: Kod -> profil_id listesi
+        """
+        return self._sozluk("profil_id")
+
+    def secim(self, baslangic: ZamanDegeri = None, bitis: ZamanDegeri = None, tarayici_tipi: str = None,
+              basarili_mi: bool = None) -> Tuple[slice, Optional[np.ndarray]]:
+        """
+        Filtreyi satır seçimine çevirir. Arşiv zamana göre sıralıysa zaman aralığı ikili aramayla dilime çevrilir.
+        Girdiler: baslangic, bitis (epoch int / ISO metin / datetime; [baslangic, bitis) UTC),
+                  tarayici_tipi (str), basarili_mi (bool)
+        Çıktı: (dilim, dilim içindeki bool maske veya None)
+        """
+        dilim = slice(0, self.satir_sayisi)
+        maske = None
+
+        def ekle(kosul: np.ndarray) -> None:
+            nonlocal maske
+            maske = kosul if maske is None else maske & kosul
+
+        if self.zamana_gore_sirali:
+            alt = 0 if baslangic is None else int(np.searchsorted(self.zaman, _epoch(baslangic), "left"))
+            ust = self.satir_sayisi if bitis is None else int(np.searchsorted(self.zaman, _epoch(bitis), "left"))
+            dilim = slice(alt, max(alt, ust))
+        else:
+            if baslangic is not None:
+                ekle(self.zaman >= _epoch(baslangic))
+            if bitis is not None:
+                ekle(self.zaman < _epoch(bitis))
+        if tarayici_tipi is not None:
+            kod = self.tarayici_tipleri.index(tarayici_tipi) if tarayici_tipi in self.tarayici_tipleri else -1
+            ekle(self.tarayici_kodlari[dilim] == kod)
+        if basarili_mi is not None:
+            ekle(self.basarili[dilim] == bool(basarili_mi))
+        return dilim, maske
+
+    def kolon(self, dizi: np.ndarray, dilim: slice, maske: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Çıktı: Seçime (secim) uyan satırların sütun değerleri
+        """
+        return dizi[dilim] if maske is None else dizi[dilim][maske]
+
+    def saat_dagilimi(self, saat_farki: int = 0, **filtre) -> np.ndarray:
+        """
+        Günün saatlerine göre tarama sayıları.
+        Girdiler: saat_farki (int) - UTC'ye eklenecek saat (ör. Türkiye için 3), **filtre - secim argümanları
+        Çıktı: 24 elemanlı int64 dizi
+        """
+        zaman = self.kolon(self.zaman, *self.secim(**filtre))
+        return np.bincount((zaman + saat_farki * 3600) // 3600 % 24, minlength=24)
+
+    def tarayici_dagilimi(self, **filtre) -> Dict[str, int]:
+        """
+        Çıktı: tarayici_tipi -> tarama sayısı (sayıya göre azalan)
+        """
+        kodlar = self.kolon(self.tarayici_kodlari, *self.secim(**filtre))
+        sayilar = np.bincount(kodlar, minlength=len(self.tarayici_tipleri))
+        return {self.tarayici_tipleri[kod]: int(sayilar[kod]) for kod in np.argsort(-sayilar, kind="stable")
+                if sayilar[kod]}
+
+    def saat_tarayici_tablosu(self, saat_farki: int = 0, **filtre) -> np.ndarray:
+        """
+        Saat x tarayıcı tipi çapraz tablosu; sütun sırası tarayici_tipleri ile aynıdır.
+        Çıktı: (24, tarayıcı tipi sayısı) int64 dizi
+        """
+        dilim, maske = self.secim(**filtre)
+        saat = (self.kolon(self.zaman, dilim, maske) + saat_farki * 3600) // 3600 % 24
+        tip_sayisi = len(self.tarayici_tipleri)
+        hucre = saat * tip_sayisi + self.kolon(self.tarayici_kodlari, dilim, maske)
+        return np.bincount(hucre, minlength=24 * tip_sayisi).reshape(24, tip_sayisi)
+
+    def en_cok_taranan_profiller(self, adet: int = 10, **filtre) -> List[Tuple[str, int]]:
+        """
+        Çıktı: [(profil_id, tarama sayısı), ...] en çok taranandan başlayarak
+        """
+        sayilar = np.bincount(self.kolon(self.profil_kodlari, *self.secim(**filtre)),
+                              minlength=len(self.profil_idleri))
+        enler = np.argsort(-sayilar, kind="stable")[:adet]
+        return [(self.profil_idleri[kod], int(sayilar[kod])) for kod in enler if sayilar[kod]]
+
+def komut_satiri_calistir(argumanlar: List[str]) -> int:
+    """
+    Arşiv komutları: olustur DIZIN [--gun N] [--db YOL] | ozet DIZIN [--saat-farki S].
+    Girdiler: argumanlar (list) - sys.argv[1:]
+    Çıktı: Çıkış kodu (int)
+    """
+    import argparse
+    ayristirici = argparse.ArgumentParser(prog="kolon_arsivi.py", description="Hoyn QR kolonsal tarama arşivi")
+    ayristirici.add_argument("komut", choices=["olustur", "ozet"])
+    ayristirici.add_argument("dizin", help="Arşiv dizini")
+    ayristirici.add_argument("--gun", type=int, default=365, help="Arşivlenecek gün sayısı (olustur)")
+    ayristirici.add_argument("--db", default=veritabani.VERITABANI_DOSYASI, help="Veritabanı dosyası (olustur)")
+    ayristirici.add_argument("--saat-farki", type=int, default=0, help="UTC'ye eklenecek saat (ozet)")
+    secenekler = ayristirici.parse_args(argumanlar)
+
+    if secenekler.komut == "olustur":
+        arsiv = tarama_loglarini_arsivle(secenekler.dizin, secenekler.gun,
+                                         veritabani.HoynVeritabaniYoneticisi(secenekler.db))
+        print(f"🗄️ {len(arsiv)} tarama logu arşivlendi: {secenekler.dizin}")
+        return 0
+
+    arsiv = KolonArsivi(secenekler.dizin)
+    tablo = arsiv.saat_tarayici_tablosu(secenekler.saat_farki)
+    print(f"📊 {len(arsiv)} tarama, saat x tarayıcı tipi")
+    print("saat  " + "  ".join(f"{tip:>12}" for tip in arsiv.tarayici_tipleri))
+    for saat, satir in enumerate(tablo):
+        print(f"{saat:02d}    " + "  ".join(f"{sayi:>12}" for sayi in satir))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(komut_satiri_calistir(sys.argv[1:]))
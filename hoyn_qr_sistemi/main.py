@@ -1,15 +1,17 @@
 # Hoyn QR Sistemi Ana Uygulama
 # Bu dosya, tüm modülleri entegre eder ve komut satırı arayüzü sağlar.
 # Kullanım: python main.py
-# Özellikler: Profil oluşturma, QR üretme, QR tarama simülasyonu, loglama.
-# Gerekli kütüphaneler: Tüm modüller + uuid, base64, io, PIL (qrcode için).
+# Özellikler: Profil oluşturma, QR üretme, QR tarama simülasyonu, loglama, toplu profil içe/dışa aktarma,
+#             toplu QR üretimi (ZIP/dizin).
+# Gerekli kütüphaneler: Tüm modüller + uuid, base64, PIL (qrcode için).
+# Ağır kütüphaneler (PIL, qrcode, cryptography) menü gösterildikten sonra, ilk kullanımda yüklenir.
 
+import os
 import sys
 import uuid
 from datetime import datetime
 import base64
-from io import BytesIO
-from PIL import Image
+from typing import Union
 
 # Sistem modüllerini içe aktar
 try:
@@ -24,15 +26,15 @@ except ImportError as e:
     print("Lütfen gerekli kütüphaneleri yükleyin: pip install qrcode[pil] cryptography")
     sys.exit(1)
 
-def qr_goster(qr_base64: str, dosya_adi: str = "hoyn_qr.png") -> None:
+def qr_goster(qr_resmi: Union[str, bytes], dosya_adi: str = "hoyn_qr.png") -> None:
     """
-    Base64 QR kodunu dosyaya kaydeder ve görüntüler.
-    Girdiler: qr_base64 (str), dosya_adi (str)
+    QR resmini dosyaya kaydeder (yeniden kodlama yok: baytlar olduğu gibi yazılır).
+    Girdiler: qr_resmi (str base64 PNG veya bytes PNG/SVG), dosya_adi (str)
     """
     try:
-        qr_data = base64.b64decode(qr_base64)
-        img = Image.open(BytesIO(qr_data))
-        img.save(dosya_adi)
+        qr_data = base64.b64decode(qr_resmi) if isinstance(qr_resmi, str) else qr_resmi
+        with open(dosya_adi, "wb") as dosya:
+            dosya.write(qr_data)
         print(f"🖼️ QR kodu kaydedildi: {dosya_adi}")
         print(mesaj_al("YUKARIYUKARI"))
         print(mesaj_al("PAYLASIM_BILDIRIMI"))
@@ -60,11 +62,11 @@ def profil_olusturma_islemi(kullanici_id: str) -> str:
         print(f"Profil oluşturma hatası: {e}")
         return None
 
-def qr_uretme_islemi(profil_id: str) -> str:
+def qr_uretme_islemi(profil_id: str) -> bytes:
     """
-    Belirtilen profil için QR kodu üretir.
+    Belirtilen profil için QR kodu üretir (ham PNG; base64'e kodlayıp geri çözme yok).
     Girdiler: profil_id (str)
-    Çıktı: qr_base64 (str)
+    Çıktı: qr_png (bytes)
     """
     print("\n🎨 QR özelleştirme seçenekleri:")
     print("1. Varsayılan renkler")
@@ -91,21 +93,16 @@ def qr_uretme_islemi(profil_id: str) -> str:
     
     print(mesaj_al("GUVENLIK_UYARISI"))
     
-    # Güvenlik modülünden şifrelenmiş payload al
-    sifrelenmis_payload = sifrelenmis_qr_payload_olustur(profil_id)
-    
-    # QR üretici modülünden QR oluştur (payload ile)
-    # Not: qr_uretici.py'de sifrelenmis_veri_olustur yerine güvenlik modülünü kullan
-    # Geçici çözüm: qr_olustur fonksiyonunu payload ile çağır
-    qr_base64 = qr_olustur(profil_id, arka_renk, on_plan_renk, logo_ekle, ai_tasarim_modu)
+    # QR üretici payload'ı güvenlik modülüyle şifreler; ham PNG baytları doğrudan qr_goster'e gider
+    qr_png = qr_olustur(profil_id, arka_renk, on_plan_renk, logo_ekle, ai_tasarim_modu, cikti="png")
     
     print(mesaj_al("BASARILI_QR_OLUSTURULDU"))
-    return qr_base64
+    return qr_png
 
-def qr_tarama_simulasyonu(qr_base64: str) -> None:
+def qr_tarama_simulasyonu(qr_resmi: Union[str, bytes]) -> None:
     """
     QR tarama işlemini simüle eder ve sonuçları gösterir.
-    Girdiler: qr_base64 (str)
+    Girdiler: qr_resmi (str base64 veya bytes PNG)
     """
     print("\n🔍 QR tarama simülasyonu:")
     print("1. Hoyn QR Tarayıcı ile tarama")
@@ -148,6 +145,60 @@ def qr_tarama_simulasyonu(qr_base64: str) -> None:
     mesaj = qr_tarama_sonucu(sonuc, profil_bilgisi)
     print(f"\n📱 Tarama Sonucu:\n{mesaj}")
 
+def toplu_ice_aktarma_islemi() -> None:
+    """
+    CSV/JSONL dosyasındaki profilleri partiler halinde içe aktarır; ilerlemeyi ve hatalı satırları gösterir.
+    """
+    from toplu_aktarim import profilleri_ice_aktar, hata_raporunu_yaz, ilerleme_yazdir
+    dosya = input("İçe aktarılacak dosya (.csv / .jsonl): ").strip()
+    try:
+        rapor = profilleri_ice_aktar(dosya, ilerleme=ilerleme_yazdir)
+    except (OSError, ValueError) as e:
+        print(f"❌ İçe aktarma hatası: {e}")
+        return
+    print(f"\n📥 {rapor.eklenen}/{rapor.okunan} profil içe aktarıldı ({rapor.sure:.2f} sn).")
+    if rapor.hatalar:
+        for hata in rapor.hatalar[:10]:
+            print(f"   ❌ Satır {hata.satir_no}: {hata.hata}")
+        rapor_dosyasi = os.path.splitext(dosya)[0] + "_hatalar.csv"
+        hata_raporunu_yaz(rapor, rapor_dosyasi)
+        print(f"   {rapor.hatali} hatalı satır: {rapor_dosyasi}")
+
+def toplu_disa_aktarma_islemi() -> None:
+    """
+    Aktif profilleri (isteğe bağlı tek kullanıcı) CSV/JSONL dosyasına akış halinde yazar.
+    """
+    from toplu_aktarim import profilleri_disa_aktar
+    dosya = input("Hedef dosya (.csv / .jsonl): ").strip()
+    kullanici_id = input("Kullanıcı ID (boş için tümü): ").strip()
+    try:
+        yazilan = profilleri_disa_aktar(dosya, kullanici_id=kullanici_id or None)
+    except (OSError, ValueError) as e:
+        print(f"❌ Dışa aktarma hatası: {e}")
+        return
+    print(f"📤 {yazilan} profil dışa aktarıldı: {dosya}")
+
+def toplu_qr_uretme_islemi() -> None:
+    """
+    CSV/JSONL iş dosyasındaki profiller için QR resimlerini süreç havuzunda üretip ZIP'e veya dizine yazar.
+    """
+    from toplu_qr import dosyadan_toplu_qr_uret, ilerleme_yazdir
+    from toplu_aktarim import hata_raporunu_yaz
+    dosya = input("İş dosyası (profil_id ve stil sütunları, .csv / .jsonl): ").strip()
+    hedef = input("Hedef (.zip arşivi veya dizin): ").strip() or "hoyn_qr_kodlari.zip"
+    try:
+        rapor = dosyadan_toplu_qr_uret(dosya, hedef, ilerleme=ilerleme_yazdir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Toplu QR üretim hatası: {e}")
+        return
+    print(f"\n🖨️ {rapor.uretilen}/{rapor.okunan} QR üretildi ({rapor.sure:.2f} sn): {hedef}")
+    if rapor.hatalar:
+        for hata in rapor.hatalar[:10]:
+            print(f"   ❌ Satır {hata.satir_no}: {hata.hata}")
+        rapor_dosyasi = os.path.splitext(dosya)[0] + "_qr_hatalar.csv"
+        hata_raporunu_yaz(rapor, rapor_dosyasi)
+        print(f"   {rapor.hatali} hatalı iş: {rapor_dosyasi}")
+
 def ana_menuyu_goster() -> None:
     """
     Ana menüyü gösterir ve kullanıcı seçimlerini işler.
@@ -160,6 +211,9 @@ def ana_menuyu_goster() -> None:
     print("3. QR Tarama Simülasyonu")
     print("4. Tarama Loglarını Görüntüle")
     print("5. Sistem Testi")
+    print("6. Profilleri İçe Aktar (CSV/JSONL)")
+    print("7. Profilleri Dışa Aktar (CSV/JSONL)")
+    print("8. Toplu QR Üret (ZIP/dizin)")
     print("0. Çıkış")
     print("="*50)
 
@@ -182,21 +236,20 @@ def sistem_testi() -> None:
     
     # 2. QR kodu üret
     print("\n2️⃣ QR kodu üretiliyor...")
-    test_qr_base64 = qr_uretme_islemi(test_profil_id)
+    test_qr_png = qr_uretme_islemi(test_profil_id)
     
-    if test_qr_base64:
-        qr_goster(test_qr_base64, "test_qr.png")
+    if test_qr_png:
+        qr_goster(test_qr_png, "test_qr.png")
         
         # 3. QR tarama simülasyonu
         print("\n3️⃣ QR tarama testi...")
-        qr_tarama_simulasyonu(test_qr_base64)
+        qr_tarama_simulasyonu(test_qr_png)
         
         # 4. Logları kontrol et
         print("\n4️⃣ Tarama logları:")
-        from veritabani import tarama_loglarini_al
-        loglar = tarama_loglarini_al(test_profil_id)
-        for log in loglar[-3:]:  # Son 3 log
-            print(f"   📝 {log['tarama_zamani']} - {log['tarayici_tipi']} - Başarılı: {log['basarili_mi']}")
+        from veritabani import tarama_loglarini_gez
+        for log in tarama_loglarini_gez(test_profil_id, limit=3):  # Son 3 log
+            print(f"   📝 {log.tarama_zamani} - {log.tarayici_tipi} - Başarılı: {log.basarili_mi}")
     
     print("\n✅ Sistem testi tamamlandı!")
     print("Not: Gerçek kullanımda bu test verileri temizlenmelidir.")
@@ -213,7 +266,7 @@ def main():
     while True:
         ana_menuyu_goster()
         
-        secim = input("\nSeçiminizi yapın (0-5): ").strip()
+        secim = input("\nSeçiminizi yapın (0-8): ").strip()
         
         if secim == "0":
             print("\n👋 Hoyn QR Sisteminden çıkılıyor. Görüşmek üzere!")
@@ -228,25 +281,31 @@ def main():
             else:
                 print("❌ Geçerli bir profil ID girin veya önce profil oluşturun.")
         elif secim == "3":
-            qr_base64 = input("QR base64 verisi girin (veya test için Enter): ").strip()
-            if not qr_base64:
+            qr_resmi = input("QR base64 verisi girin (veya test için Enter): ").strip()
+            if not qr_resmi:
                 # Test QR oluştur
                 test_profil_id = profil_olustur("test-user", "Test Profil", "")
                 if test_profil_id:
-                    qr_base64 = qr_uretme_islemi(test_profil_id)
-            qr_tarama_simulasyonu(qr_base64)
+                    qr_resmi = qr_uretme_islemi(test_profil_id)
+            qr_tarama_simulasyonu(qr_resmi)
         elif secim == "4":
             profil_id = input("Log için profil ID (boş için tümü): ").strip()
-            from veritabani import tarama_loglarini_al
-            loglar = tarama_loglarini_al(profil_id if profil_id else None, 7)  # Son 7 gün
+            from veritabani import tarama_loglarini_gez
+            loglar = list(tarama_loglarini_gez(profil_id if profil_id else None, 7, limit=10))  # Son 7 gün, en fazla 10
             print(f"\n📊 Son {len(loglar)} tarama logu:")
-            for log in loglar[:10]:  # Maksimum 10 göster
-                durum = "✅" if log['basarili_mi'] else "❌"
-                print(f"   {durum} {log['tarama_zamani']} - {log['tarayici_tipi']}")
+            for log in loglar:
+                durum = "✅" if log.basarili_mi else "❌"
+                print(f"   {durum} {log.tarama_zamani} - {log.tarayici_tipi}")
         elif secim == "5":
             sistem_testi()
+        elif secim == "6":
+            toplu_ice_aktarma_islemi()
+        elif secim == "7":
+            toplu_disa_aktarma_islemi()
+        elif secim == "8":
+            toplu_qr_uretme_islemi()
         else:
-            print("❌ Geçersiz seçim. Lütfen 0-5 arasında bir sayı girin.")
+            print("❌ Geçersiz seçim. Lütfen 0-8 arasında bir sayı girin.")
         
         input("\nDevam etmek için Enter'a basın...")
 
@@ -0,0 +1,156 @@
+# Hoyn QR Çizici Modülü
+# Bu modül, QR modül matrisini qrcode'un PIL resim fabrikasına uğramadan doğrudan PNG'ye çevirir.
+# Matris NumPy ile tek adımda kenar boşluğuyla genişletilip kutu boyutuna ölçeklenir, satırlar bit olarak
+# paketlenir ve 1 bitlik (palet veya gri tonlu) PNG olarak yazılır; modül başına çizim çağrısı yoktur.
+# Çözülen pikseller qr.make_image(...) çıktısıyla birebir aynıdır (aynı boyut, aynı renkler, aynı
+# saydamlık); PNG iki renkli olduğu için dosya RGB PNG'den daha küçüktür.
+# Logolu QR'lar için 8 bitlik palet PNG yazıcısı da buradadır (palet_png_olustur): kutu boyutu kadar yinelenen
+# satırlar "Up" filtresiyle sıfıra, modül genişliğindeki koşular "Sub" filtresiyle sıfıra iner; zlib çoğunlukla
+# sıfır sıkıştırır.
+# Gerekli kütüphaneler: numpy, struct, zlib, re. PIL yalnız adlı renkler (ör. "red") için yüklenir.
+# Kurulum: pip install numpy
+
+import re
+import struct
+import zlib
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+PNG_IMZASI = b"\x89PNG\r\n\x1a\n"
+# PIL'in PNG kaydetmedeki varsayılan zlib düzeyi
+VARSAYILAN_SIKISTIRMA = 6
+
+Renk = Union[str, Tuple[int, ...]]
+
+_ONALTILIK_RENK = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6}|[0-9a-f]{8})")
+
+def renk_coz(renk: Renk) -> Tuple[int, ...]:
+    """
+    Renk değerini (R, G, B) veya (R, G, B, A) demetine çevirir.
+    "#RGB", "#RRGGBB", "#RRGGBBAA" ve demetler doğrudan çözülür; diğer adlar PIL.ImageColor'a bırakılır.
+    Girdiler: renk (str veya tuple)
+    Çıktı: tuple (3 veya 4 tamsayı)
+    """
+    if isinstance(renk, (tuple, list)):
+        return tuple(int(bilesen) for bilesen in renk)
+    eslesme = _ONALTILIK_RENK.fullmatch(renk.lower())
+    if eslesme is None:
+        from PIL import ImageColor
+        return ImageColor.getrgb(renk)
+    onaltilik = eslesme.group(1)
+    if len(onaltilik) == 3:
+        onaltilik = "".join(karakter * 2 for karakter in onaltilik)
+    return tuple(int(onaltilik[i:i + 2], 16) for i in range(0, len(onaltilik), 2))
+
+def _parca(tip: bytes, veri: bytes) -> bytes:
+    return struct.pack(">I", len(veri)) + tip + veri + struct.pack(">I", zlib.crc32(tip + veri))
+
+def piksel_satirlari(matris: np.ndarray, kutu_boyutu: int, kenar: int) -> np.ndarray:
+    """
+    Modül matrisini kenar boşluğu ve kutu boyutuyla piksel satırlarına çevirir (bit paketli).
+    Girdiler: matris (2B bool dizi, kenarsız; True = koyu modül), kutu_boyutu (int), kenar (int, modül)
+    Çıktı: np.ndarray (uint8, satır başına ceil(genişlik / 8) bayt, en anlamlı bit ilk piksel)
+    """
+    modul_satirlari = np.pad(np.asarray(matris, dtype=bool), kenar)
+    # Önce sütunlar ölçeklenip paketlenir; aynı satırı kutu_boyutu kez yinelemek paketli veride daha ucuz
+    paketli = np.packbits(np.repeat(modul_satirlari, kutu_boyutu, axis=1), axis=1)
+    return np.repeat(paketli, kutu_boyutu, axis=0)
+
+def modul_indeksleri(matris: Union[np.ndarray, Sequence[Sequence[bool]]], kutu_boyutu: int = 10,
+                     kenar: int = 4) -> np.ndarray:
+    """
+    Modül matrisini piksel başına palet indeksine çevirir (0 = zemin, 1 = koyu modül); logo bindirme gibi
+    8 bitlik palet resmi gereken işler için.
+    Girdiler: matris (kenarsız bool matris), kutu_boyutu (int), kenar (int)
+    Çıktı: np.ndarray (uint8, yükseklik x genişlik)
+    """
+    modul_satirlari = np.pad(np.asarray(matris, dtype=np.uint8), kenar)
+    return np.repeat(np.repeat(modul_satirlari, kutu_boyutu, axis=0), kutu_boyutu, axis=1)
+
+def palet_png_olustur(indeksler: np.ndarray, palet: Sequence[Tuple[int, ...]],
+                      sikistirma: int = VARSAYILAN_SIKISTIRMA) -> bytes:
+    """
+    Palet indeksli piksel dizisinden 8 bitlik palet PNG üretir (PIL kodlayıcısı kullanılmaz).
+    Bir önceki satırın aynısı olan satırlar "Up" (tamamen sıfır), diğerleri "Sub" filtresiyle yazılır.
+    Girdiler: indeksler (2B uint8 dizi), palet ((R, G, B) veya (R, G, B, A) demetleri, en fazla 256),
+              sikistirma (int) - zlib düzeyi (0-9)
+    Çıktı: PNG baytları (alfa < 255 olan girdi varsa tRNS ile)
+    """
+    yukseklik, genislik = indeksler.shape
+    farkli = np.ones(yukseklik, dtype=bool)
+    farkli[1:] = (indeksler[1:] != indeksler[:-1]).any(axis=1)
+    filtreli = np.zeros((yukseklik, genislik + 1), dtype=np.uint8)
+    filtreli[:, 0] = np.where(farkli, 1, 2)  # 1 = Sub, 2 = Up
+    satirlar = indeksler[farkli]
+    filtreli[farkli, 1] = satirlar[:, 0]
+    # uint8 çıkarma 256 modunda sarar (PNG Sub filtresiyle aynı aritmetik)
+    filtreli[farkli, 2:] = satirlar[:, 1:] - satirlar[:, :-1]
+
+    ek_parcalar = _parca(b"PLTE", bytes(bilesen for renk in palet for bilesen in renk[:3]))
+    alfalar = [renk[3] if len(renk) == 4 else 255 for renk in palet]
+    if min(alfalar) < 255:
+        son = max(i for i, alfa in enumerate(alfalar) if alfa < 255)
+        ek_parcalar += _parca(b"tRNS", bytes(alfalar[:son + 1]))
+    return b"".join((
+        PNG_IMZASI,
+        _parca(b"IHDR", struct.pack(">IIBBBBB", genislik, yukseklik, 8, 3, 0, 0, 0)),
+        ek_parcalar,
+        _parca(b"IDAT", zlib.compress(filtreli.tobytes(), sikistirma)),
+        _parca(b"IEND", b"")
+    ))
+
+def png_olustur(matris: Union[np.ndarray, Sequence[Sequence[bool]]], kutu_boyutu: int = 10, kenar: int = 4,
+                on_plan_renk: Renk = "black", arka_renk: Renk = "white",
+                sikistirma: int = VARSAYILAN_SIKISTIRMA) -> bytes:
+    """
+    Modül matrisinden 1 bitlik PNG üretir; renk ve saydamlık kuralları qrcode'un PilImage fabrikasıyla aynıdır:
+    "black"/"white" -> 1 bit gri tonlu, arka_renk "transparent" -> saydam zeminli palet, diğerleri -> palet.
+    Girdiler: matris (kenarsız bool matris), kutu_boyutu (int), kenar (int), on_plan_renk, arka_renk,
+              sikistirma (int) - zlib düzeyi (0-9)
+    Çıktı: PNG baytları
+    """
+    satirlar = piksel_satirlari(matris, kutu_boyutu, kenar)
+    boyut = (len(matris) + 2 * kenar) * kutu_boyutu
+    on_plan = on_plan_renk.lower() if isinstance(on_plan_renk, str) else on_plan_renk
+    arka = arka_renk.lower() if isinstance(arka_renk, str) else arka_renk
+
+    ek_parcalar = b""
+    if on_plan == "black" and arka == "white":
+        # Gri tonlu 1 bit: 0 siyah, 1 beyaz (qrcode'un "1" kipi)
+        renk_tipi = 0
+        satirlar = ~satirlar
+    else:
+        renk_tipi = 3
+        if arka == "transparent":
+            # qrcode RGBA zemini ilklendirmez: saydam siyah
+            arka_rgba, on_plan_rgba = (0, 0, 0, 0), renk_coz(on_plan)
+            on_plan_rgba = on_plan_rgba if len(on_plan_rgba) == 4 else on_plan_rgba + (255,)
+            ek_parcalar = _parca(b"tRNS", bytes((arka_rgba[3], on_plan_rgba[3])))
+        else:
+            # RGB kipinde alfa bileşeni yok sayılır
+            arka_rgba, on_plan_rgba = renk_coz(arka), renk_coz(on_plan)
+        ek_parcalar = _parca(b"PLTE", bytes(arka_rgba[:3] + on_plan_rgba[:3])) + ek_parcalar
+
+    # Her satırın başına filtre baytı (0 = filtresiz)
+    ham = np.pad(satirlar, ((0, 0), (1, 0))).tobytes()
+    return b"".join((
+        PNG_IMZASI,
+        _parca(b"IHDR", struct.pack(">IIBBBBB", boyut, boyut, 1, renk_tipi, 0, 0, 0)),
+        ek_parcalar,
+        _parca(b"IDAT", zlib.compress(ham, sikistirma)),
+        _parca(b"IEND", b"")
+    ))
+
+def qr_png_olustur(qr, on_plan_renk: Renk = "black", arka_renk: Renk = "white",
+                   sikistirma: int = VARSAYILAN_SIKISTIRMA) -> bytes:
+    """
+    qrcode.QRCode nesnesini qr.make_image(fill_color=..., back_color=...).save(..., "PNG") ile aynı
+    görüntüye, PIL fabrikasını atlayarak çevirir.
+    Girdiler: qr (qrcode.QRCode), on_plan_renk, arka_renk, sikistirma (int)
+    Çıktı: PNG baytları
+    """
+    # get_matrix() kenarı Python listeleriyle ekler; kenarsız modüller alınıp NumPy ile doldurulur
+    if qr.data_cache is None:
+        qr.make()
+    return png_olustur(qr.modules, qr.box_size, qr.border, on_plan_renk, arka_renk, sikistirma)
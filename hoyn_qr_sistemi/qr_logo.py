@@ -0,0 +1,287 @@
+# Hoyn QR Logo Modülü
+# Bu modül, markalı QR kodları için logoyu QR'ın ortasına bindirir.
+# Logo dosyasını açmak, ölçeklemek, palete indirgemek ve maskesini çıkarmak pahalıdır; bu yüzden hazır varlıklar
+# (ölçeklenmiş RGBA karo, 254 renge indirgenmiş palet karosu, ikili maske, karonun maskeyle yapıştırıldığı
+# temizlenmiş logo alanı ve SVG için PNG kodlaması) (logo, modül boyutu, alan kenarı) anahtarıyla LRU önbellekte
+# tutulur. Dosya logolarının anahtarı yol + değişiklik zamanı + boyuttur; dosya değişince yeniden yüklenir.
+# PNG 8 bitlik palet resmi olarak qr_cizici ile yazılır (0 zemin, 1 koyu modül, 2+ logo renkleri): hazır alan
+# modül indekslerine tek atamayla kopyalanır, logo renkleri zemine palet girdisi başına bir kez karıştırılır;
+# çağrı başına PIL çizimi, maskeli yapıştırma ve PIL PNG kodlaması yapılmaz.
+# Logonun altındaki modüller matriste açık renge çekilir (ön maskeleme), böylece logo kenarında yarım modül
+# kalmaz. Kapanan alan QR genişliğinin ~%22'sidir; H düzeyi hata düzeltme (%30) bu kaybı karşılar ve
+# logo kullanan QR'lar H ile üretilmelidir (qr_uretici bunu kendisi yapar).
+# Logo verilmezse Hoyn işareti (mor zemin üzerinde beyaz "H") çizilir.
+# Gerekli kütüphaneler: PIL (Pillow), hashlib, threading; NumPy varsa PNG qr_cizici ile yazılır.
+# Kurulum: pip install qrcode[pil]
+
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from PIL import Image, ImageColor, ImageDraw
+
+# Logo kenarının QR modül sayısına oranı (kenar boşluğu hariç)
+LOGO_ORANI = 0.22
+# Palet indeksleri: 0 zemin, 1 koyu modül, logo renkleri LOGO_PALET_BASI'ndan başlar
+LOGO_PALET_BASI = 2
+# Hoyn ana rengi (README tasarım sistemi)
+HOYN_RENGI = "#E040FB"
+
+Logo = Union[str, bytes, None]
+
+class LogoVarligi(NamedTuple):
+    """
+    Önbellekteki hazır logo: ölçeklenmiş RGBA karo, palet karosu (indeksler LOGO_PALET_BASI kaydırılmış),
+    palet karosunun RGBA renkleri, ikili maske (alfa > 0), temizlenmiş logo alanı (zemin indeksli kare,
+    karo her yandan yarım modül içeride maskeyle yapıştırılmış) ve karonun PNG kodlaması (SVG için).
+    """
+    karo: Image.Image
+    indeksler: Image.Image
+    palet: Tuple[Tuple[int, int, int, int], ...]
+    maske: Image.Image
+    alan: Image.Image
+    png: bytes
+
+def _varsayilan_logo() -> Image.Image:
+    """
+    Logo verilmediğinde kullanılan Hoyn işareti (yuvarlatılmış mor kare, beyaz "H").
+    """
+    logo = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    cizim = ImageDraw.Draw(logo)
+    cizim.rounded_rectangle((0, 0, 255, 255), radius=56, fill=HOYN_RENGI)
+    for kutu in ((64, 56, 100, 200), (156, 56, 192, 200), (100, 110, 156, 146)):
+        cizim.rectangle(kutu, fill="white")
+    return logo
+
+def _logo_kimligi(logo: Logo) -> tuple:
+    if logo is None:
+        return ("varsayilan",)
+    if isinstance(logo, str):
+        bilgi = os.stat(logo)
+        return ("dosya", os.path.abspath(logo), bilgi.st_mtime_ns, bilgi.st_size)
+    if isinstance(logo, (bytes, bytearray)):
+        return ("bayt", hashlib.blake2b(logo, digest_size=16).digest())
+    raise ValueError(f"Logo dosya yolu veya bayt olmalı: {type(logo).__name__}")
+
+def _varlik_hazirla(logo: Logo, kutu_boyutu: int, alan_kenari: int) -> LogoVarligi:
+    """
+    Logoyu yükler, en-boy oranını koruyarak (alan_kenari - 1) modüllük kareye sığdırır, saydam karoya ortalar
+    ve alan_kenari modüllük temizlenmiş alana yerleştirir.
+    """
+    kenar_px = max(1, (alan_kenari - 1) * kutu_boyutu)
+    if logo is None:
+        kaynak = _varsayilan_logo()
+    else:
+        kaynak = Image.open(logo if isinstance(logo, str) else io.BytesIO(logo))
+        kaynak = kaynak.convert("RGBA")
+    kaynak.thumbnail((kenar_px, kenar_px), Image.LANCZOS)
+    karo = Image.new("RGBA", (kenar_px, kenar_px), (0, 0, 0, 0))
+    karo.paste(kaynak, ((kenar_px - kaynak.width) // 2, (kenar_px - kaynak.height) // 2))
+    # Palete indirgeme: zemin ve koyu modül için iki girdi ayrılır. Az renkli logolar (tipik durum) birebir
+    # paletlenir; fazlası FASTOCTREE ile 254 renge yaklaştırılır.
+    renk_sayilari = karo.getcolors(256 - LOGO_PALET_BASI)
+    if renk_sayilari is not None:
+        palet = tuple(renk for _, renk in renk_sayilari)
+        sira = {bytes(renk): indeks for indeks, renk in enumerate(palet, LOGO_PALET_BASI)}
+        pikseller = karo.tobytes()
+        indeksler = Image.frombytes("P", karo.size, bytes(sira[pikseller[i:i + 4]]
+                                                         for i in range(0, len(pikseller), 4)))
+    else:
+        indirgenmis = karo.quantize(256 - LOGO_PALET_BASI, method=Image.Quantize.FASTOCTREE)
+        renkler = indirgenmis.getpalette("RGBA")
+        palet = tuple(tuple(renkler[i:i + 4]) for i in range(0, len(renkler), 4))
+        indeksler = indirgenmis.point(lambda indeks: indeks + LOGO_PALET_BASI)
+    maske = karo.getchannel("A").point(lambda alfa: 255 if alfa else 0)
+    alan = Image.new("P", (alan_kenari * kutu_boyutu,) * 2, 0)
+    bosluk = (alan.width - kenar_px) // 2
+    alan.paste(indeksler, (bosluk, bosluk), maske)
+    png = io.BytesIO()
+    karo.save(png, format="PNG")
+    return LogoVarligi(karo, indeksler, palet, maske, alan, png.getvalue())
+
+class LogoOnbellegi:
+    """
+    (logo kimliği, modül boyutu, alan kenarı) -> LogoVarligi LRU önbelleği.
+    Varlıklar salt okunur kullanılır; yükleme kilit dışında yapılır (aynı anda iki iska aynı varlığı iki kez
+    hazırlayabilir, sonuç aynıdır).
+    """
+
+    def __init__(self, maks_boyut: int = 32):
+        """
+        Girdiler: maks_boyut (int) - tutulacak en fazla varlık
+        """
+        self.maks_boyut = maks_boyut
+        self._kayitlar = OrderedDict()
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+
+    def al(self, logo: Logo, kutu_boyutu: int, alan_kenari: int) -> LogoVarligi:
+        """
+        Hazır varlığı döndürür; yoksa hazırlayıp ekler.
+        Girdiler: logo (dosya yolu, bayt veya None = Hoyn işareti), kutu_boyutu (int) - modül başına piksel,
+                  alan_kenari (int) - logo alanının kenarı (modül, bkz. logo_alani)
+        Çıktı: LogoVarligi
+        """
+        anahtar = (_logo_kimligi(logo), kutu_boyutu, alan_kenari)
+        with self._kilit:
+            varlik = self._kayitlar.get(anahtar)
+            if varlik is not None:
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+                return varlik
+            self.iska += 1
+        varlik = _varlik_hazirla(logo, kutu_boyutu, alan_kenari)
+        with self._kilit:
+            self._kayitlar[anahtar] = varlik
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.maks_boyut:
+                self._kayitlar.popitem(last=False)
+                self.tahliye += 1
+        return varlik
+
+    def temizle(self) -> None:
+        """
+        Tüm varlıkları siler (sayaçlar korunur).
+        """
+        with self._kilit:
+            self._kayitlar.clear()
+
+    def istatistikler(self) -> dict:
+        """
+        Çıktı: dict (boyut, isabet, iska, isabet_orani, tahliye)
+        """
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                "boyut": len(self._kayitlar),
+                "isabet": self.isabet,
+                "iska": self.iska,
+                "isabet_orani": self.isabet / toplam if toplam else 0.0,
+                "tahliye": self.tahliye
+            }
+
+# Global logo varlık önbelleği
+logo_onbellegi = LogoOnbellegi()
+
+def logo_alani(modul_sayisi: int) -> Tuple[int, int]:
+    """
+    Logonun kapattığı ortalanmış kare (modül cinsinden, kenar boşluğu hariç).
+    Girdiler: modul_sayisi (int) - QR'ın bir kenarındaki modül sayısı (tek sayı)
+    Çıktı: (başlangıç modülü, kenar modül sayısı)
+    """
+    kenar = max(3, int(modul_sayisi * LOGO_ORANI))
+    if (modul_sayisi - kenar) % 2:
+        kenar -= 1  # Tam ortalamak için kenar da tek olmalı
+    return (modul_sayisi - kenar) // 2, kenar
+
+def matrisi_temizle(moduller: List[List[bool]], alan: Tuple[int, int]) -> List[List[bool]]:
+    """
+    Logo alanındaki modülleri açık renge çeker (ön maskeleme; orijinal matris değişmez).
+    """
+    baslangic, kenar = alan
+    temiz = [list(satir) for satir in moduller]
+    for satir in temiz[baslangic:baslangic + kenar]:
+        satir[baslangic:baslangic + kenar] = [False] * kenar
+    return temiz
+
+def _h_duzeyi_gerekli(qr) -> None:
+    import qrcode
+    if qr.error_correction != qrcode.constants.ERROR_CORRECT_H:
+        raise ValueError("Logo bindirmek için hata düzeltme düzeyi ERROR_CORRECT_H olmalı")
+
+def _rgba(renk, saydam_zemin: bool) -> Tuple[int, int, int, int]:
+    if isinstance(renk, (tuple, list)):
+        renk = tuple(int(bilesen) for bilesen in renk)
+    else:
+        renk = ImageColor.getrgb(renk)
+    # qrcode RGB kipinde rengin alfa bileşenini yok sayar
+    return renk if saydam_zemin and len(renk) == 4 else renk[:3] + (255,)
+
+def _karistir(renk: Tuple[int, ...], zemin: Tuple[int, ...]) -> Tuple[int, ...]:
+    alfa = renk[3]
+    return tuple((renk[i] * alfa + zemin[i] * (255 - alfa) + 127) // 255 for i in range(3)) + (255,)
+
+def _indeks_resmi(moduller: List[List[bool]], kutu_boyutu: int, kenar: int) -> Image.Image:
+    """
+    NumPy yokken matrisi palet indeksli ("P") resme çevirir: 0 zemin, 1 koyu modül (modül başına dikdörtgen).
+    """
+    boyut = (len(moduller) + 2 * kenar) * kutu_boyutu
+    resim = Image.new("P", (boyut, boyut), 0)
+    cizim = ImageDraw.Draw(resim)
+    for y, satir in enumerate(moduller, kenar):
+        for x, koyu in enumerate(satir, kenar):
+            if koyu:
+                cizim.rectangle((x * kutu_boyutu, y * kutu_boyutu, (x + 1) * kutu_boyutu - 1,
+                                 (y + 1) * kutu_boyutu - 1), fill=1)
+    return resim
+
+def logo_paleti(varlik: LogoVarligi, on_plan_renk="#000000", arka_renk="#FFFFFF") -> Tuple[Tuple[int, ...], ...]:
+    """
+    Logolu QR'ın paleti: 0 zemin, 1 koyu modül, ardından zemine karıştırılmış logo renkleri.
+    Saydam zeminde logo renkleri alfalarıyla olduğu gibi kalır (saydam üzerine bindirme = kendisi).
+    Çıktı: RGBA demetleri
+    """
+    saydam = isinstance(arka_renk, str) and arka_renk.lower() == "transparent"
+    zemin = (0, 0, 0, 0) if saydam else _rgba(arka_renk, False)
+    logo_renkleri = varlik.palet if saydam else tuple(_karistir(renk, zemin) for renk in varlik.palet)
+    return (zemin, _rgba(on_plan_renk, saydam)) + logo_renkleri
+
+def logo_png_olustur(qr, on_plan_renk="#000000", arka_renk="#FFFFFF", logo: Logo = None,
+                     sikistirma: int = 6, onbellek: Optional[LogoOnbellegi] = None) -> bytes:
+    """
+    Logolu QR PNG'si üretir: modül indekslerine önbellekteki hazır logo alanı (temizlenmiş kare + palet karosu)
+    tek dilim ataması ile yazılır ve qr_cizici.palet_png_olustur ile 8 bitlik palet PNG'ye kodlanır.
+    NumPy yoksa aynı görüntü PIL ile çizilip kaydedilir.
+    Girdiler: qr (qrcode.QRCode, H düzeyi), on_plan_renk, arka_renk, logo (yol, bayt veya None),
+              sikistirma (int) - zlib düzeyi, onbellek (LogoOnbellegi) - varsayılan global önbellek
+    Çıktı: PNG baytları (8 bit palet; saydam zeminde palet alfası tRNS ile)
+    """
+    _h_duzeyi_gerekli(qr)
+    onbellek = logo_onbellegi if onbellek is None else onbellek
+    baslangic, kenar = logo_alani(qr.modules_count)
+    kutu = qr.box_size
+    varlik = onbellek.al(logo, kutu, kenar)
+    palet = logo_paleti(varlik, on_plan_renk, arka_renk)
+    konum = (qr.border + baslangic) * kutu
+    try:
+        import numpy as np
+        from qr_cizici import modul_indeksleri, palet_png_olustur
+    except ImportError:
+        resim = _indeks_resmi(qr.modules, kutu, qr.border)
+        resim.paste(varlik.alan, (konum, konum))
+        if min(renk[3] for renk in palet) < 255:
+            resim.putpalette(bytes(bilesen for renk in palet for bilesen in renk), "RGBA")
+        else:
+            resim.putpalette(bytes(bilesen for renk in palet for bilesen in renk[:3]), "RGB")
+        cikti = io.BytesIO()
+        resim.save(cikti, format="PNG", compress_level=sikistirma)
+        return cikti.getvalue()
+
+    indeksler = modul_indeksleri(qr.modules, kutu, qr.border)
+    # Logo alanındaki modüller de bu atamayla silinir (alan karesi zemin + logo indeksleridir)
+    indeksler[konum:konum + varlik.alan.height, konum:konum + varlik.alan.width] = np.asarray(varlik.alan)
+    return palet_png_olustur(indeksler, palet, sikistirma)
+
+def logo_svg_olustur(qr, on_plan_renk="#000000", arka_renk="#FFFFFF", logo: Logo = None,
+                     onbellek: Optional[LogoOnbellegi] = None) -> str:
+    """
+    Logolu QR SVG'si üretir: logo alanı temizlenmiş matrisin yolu + önbellekteki karonun gömülü PNG'si.
+    Girdiler: qr (qrcode.QRCode, H düzeyi), on_plan_renk, arka_renk, logo (yol, bayt veya None), onbellek
+    Çıktı: SVG metni
+    """
+    from qr_uretici import qr_svg_olustur
+    _h_duzeyi_gerekli(qr)
+    onbellek = logo_onbellegi if onbellek is None else onbellek
+    baslangic, kenar = alan = logo_alani(qr.modules_count)
+    varlik = onbellek.al(logo, qr.box_size, kenar)
+    svg = qr_svg_olustur(matrisi_temizle(qr.modules, alan), qr.box_size, qr.border, on_plan_renk, arka_renk)
+    konum = qr.border + baslangic + 0.5
+    resim = (f'<image x="{konum}" y="{konum}" width="{kenar - 1}" height="{kenar - 1}" '
+             f'href="data:image/png;base64,{base64.b64encode(varlik.png).decode("ascii")}"/>')
+    return svg[:-len("</svg>")] + resim + "</svg>"
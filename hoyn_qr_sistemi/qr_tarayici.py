@@ -1,42 +1,38 @@
 # Hoyn QR Tarayıcı Modülü
 # Bu modül, QR kodlarını tarar, doğrular ve profil sayfasına yönlendirir.
-# Doğrulama adımları: sistem kimliği, zaman damgası, hash kontrolü.
+# Doğrulama hattı (tek geçiş): yapısal tanıma, tek çözme, tek imza doğrulama, zaman damgası, profil.
+# Sonuçlar guvenlik.DogrulamaKodu koduyla döner; mesajlar ui_mesajlari üzerinden eşlenir.
+# Profiller depolama arka ucundan (varsayılan: SQLite, profil önbelleği LRU + TTL, negatif kayıtlı) çözülür.
 # Üçüncü parti tarayıcı koruması: User-Agent kontrolü ile uyarı.
-# Gerekli kütüphaneler: qrcode, cryptography, base64, json, time, requests (simülasyon için).
+# Gerekli kütüphaneler: qrcode, cryptography, base64, requests (simülasyon için).
 # Kurulum: pip install qrcode cryptography
 
 import base64
-import json
-import time
 from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-import qrcode
 from io import BytesIO
 import os
+from typing import Optional, Tuple
 from urllib.parse import urlparse
 
-# Şifreleme anahtarı (qr_uretici.py ile aynı olmalı)
-ENCRYPTION_KEY = b'example_key_32_bytes_long_12345'  # Gerçekte güvenli yönetilmeli
-cipher_suite = Fernet(Fernet.generate_key())  # Demo için, aynı anahtar ile senkronize edilmeli
-from guvenlik import guvenlik_yoneticisi
-cipher_suite = guvenlik_yoneticisi.cipher_suite  # Güvenlik modülünden anahtar al
+from guvenlik import guvenlik_yoneticisi, qr_payload_kodu, DogrulamaKodu
+from ui_mesajlari import tarama_kodu_mesaji
 
-# Basit veritabanı simülasyonu (gerçekte veritabani.py kullanılacak)
-PROFIL_VERITABANI = {
-    "test-profile-1": {"isim": "Cumhur", "mesaj": "Hoş Geldiniz! 🎉"},
-    "test-profile-2": {"isim": "Kullanıcı", "mesaj": "Profilinize Hoş Geldiniz!"}
-}
+def __getattr__(ad: str):
+    """
+    Geriye uyumluluk: qr_tarayici.cipher_suite güvenlik modülünün anahtarıdır (ilk erişimde yüklenir).
+    """
+    if ad == "cipher_suite":
+        return guvenlik_yoneticisi.cipher_suite
+    raise AttributeError(f"module {__name__!r} has no attribute {ad!r}")
 
 def qr_veri_coz(sifrelenmis_base64: str) -> dict:
     """
-    Şifrelenmiş QR verisini çözer.
+    Şifrelenmiş QR verisini çözer (HOYN_QR_V1 veya HOYN_QR_V2).
     Girdiler: sifrelenmis_base64 (str)
     Çıktı: Çözülmüş payload dict veya None (hata durumunda)
     """
     try:
-        sifrelenmis = base64.b64decode(sifrelenmis_base64)
-        cozulmus = guvenlik_yoneticisi.veri_coz(sifrelenmis_base64)
+        cozulmus = guvenlik_yoneticisi.payload_coz(sifrelenmis_base64)
         if cozulmus is None:
             return None
         return cozulmus
@@ -46,32 +42,29 @@ def qr_veri_coz(sifrelenmis_base64: str) -> dict:
 
 def hash_dogrula(payload: dict) -> bool:
     """
-    Payload'un hash'ini doğrular.
+    Payload'un hash'ini üretimde kullanılan imza arka ucuyla (HMAC / kompakt MAC) doğrular.
     Girdiler: payload (dict)
     Çıktı: bool (doğru mu?)
     """
-    try:
-        # Hash hesapla (profil_id, sistem_kimligi, zaman_damgasi)
-        veri = json.dumps({
-            "profil_id": payload["profil_id"],
-            "sistem_kimligi": payload["sistem_kimligi"],
-            "zaman_damgasi": payload["zaman_damgasi"]
-        }).encode()
-        hash_nesnesi = hashes.Hash(hashes.SHA256())
-        hash_nesnesi.update(veri)
-        hesaplanan_hash = hash_nesnesi.finalize().hex()
-        return hesaplanan_hash == payload["hash"]
-    except Exception:
-        return False
+    return guvenlik_yoneticisi.imza_dogrula(payload)
 
 def zaman_damgasi_gecerli_mi(zaman_damgasi: int) -> bool:
     """
-    Zaman damgasının 5 dakika içinde olup olmadığını kontrol eder.
+    Zaman damgasının 5 dakika içinde olup olmadığını kontrol eder (saat kayması toleransı dahil,
+    tarama hattıyla aynı kural: guvenlik_yoneticisi.zaman_damgasi_gecerli_mi).
     Girdiler: zaman_damgasi (int)
     Çıktı: bool
     """
-    mevcut_zaman = int(time.time())
-    return (mevcut_zaman - zaman_damgasi) <= 300  # 5 dakika = 300 saniye
+    return guvenlik_yoneticisi.zaman_damgasi_gecerli_mi(zaman_damgasi)
+
+def profil_bilgisi_al(profil_id: str) -> dict:
+    """
+    Aktif profili depolama arka ucundan çözer (varsayılan SQLite yöneticisinde profil önbelleği üzerinden).
+    Girdiler: profil_id (str)
+    Çıktı: Profil bilgileri dict veya None
+    """
+    import veritabani  # sqlite3 yalnızca ilk profil aramasında yüklenir
+    return veritabani.depolama_arka_ucu().profil_bilgisi_al(profil_id)
 
 def profil_var_mi(profil_id: str) -> bool:
     """
@@ -79,71 +72,80 @@ def profil_var_mi(profil_id: str) -> bool:
     Girdiler: profil_id (str)
     Çıktı: bool
     """
-    return profil_id in PROFIL_VERITABANI
+    return profil_bilgisi_al(profil_id) is not None
 
-def qr_tara_ve_dogrula(qr_veri: str, user_agent: str = None, tarayici_tipi: str = "hoyn_scanner") -> dict:
+# Sonuç kodu -> tarama sonucu seviyesi ('basarili', 'uyari', 'hata')
+TARAMA_SONUC_SEVIYELERI = {
+    DogrulamaKodu.BASARILI: "basarili",
+    DogrulamaKodu.SISTEM_KIMLIGI_UYUMSUZ: "uyari",
+    DogrulamaKodu.UCUNCU_PARTI: "uyari",
+}
+
+def tarama_sonucu_olustur(kod: DogrulamaKodu, profil_bilgisi: dict = None) -> dict:
     """
-    QR kodunu tarar ve doğrular. Tarayıcı tipine göre işlem yapar.
-    Girdiler: qr_veri (base64 QR string veya raw data), user_agent (str), tarayici_tipi (str)
-    Çıktı: dict (sonuç: 'basarili', 'uyari', 'hata'; mesaj: str; profil_bilgisi: dict)
-    """
-    # Önce veriyi çöz
-    payload = qr_veri_coz(qr_veri)
-    if not payload:
-        return {
-            "sonuc": "hata",
-            "mesaj": "⚠️ Bu bir Hoyn QR kodu değildir. Yine de bu bağlantıyı ziyaret etmek istiyor musunuz?",
-            "profil_bilgisi": None
-        }
-    
-    # Sistem kimliği kontrolü
-    if payload.get("sistem_kimligi") != "HOYN_QR_V1":
-        return {
-            "sonuc": "uyari",
-            "mesaj": "⚠️ Bu bir Hoyn QR kodu değildir. Yine de devam etmek ister misiniz? [Evet] [Hayır]",
-            "profil_bilgisi": None
-        }
-    
-    # Hash doğrulama
-    if not hash_dogrula(payload):
-        return {
-            "sonuc": "hata",
-            "mesaj": "🔐 QR kodu doğrulanamadı. Lütfen yeni bir QR oluşturun.",
-            "profil_bilgisi": None
-        }
-    
-    # Zaman damgası kontrolü
-    if not zaman_damgasi_gecerli_mi(payload["zaman_damgasi"]):
-        return {
-            "sonuc": "hata",
-            "mesaj": "⏰ QR kodu süresi dolmuş. Lütfen yeni bir tane oluşturun.",
-            "profil_bilgisi": None
-        }
-    
-    # Profil kontrolü
-    profil_id = payload["profil_id"]
-    if not profil_var_mi(profil_id):
-        return {
-            "sonuc": "hata",
-            "mesaj": "👤 Profil bulunamadı.",
-            "profil_bilgisi": None
-        }
+    Sonuç kodundan tarama sonucu sözlüğünü oluşturur.
+    Girdiler: kod (DogrulamaKodu), profil_bilgisi (dict)
+    Çıktı: dict (sonuc, kod, mesaj, profil_bilgisi)
+    """
+    return {
+        "sonuc": TARAMA_SONUC_SEVIYELERI.get(kod, "hata"),
+        "kod": kod,
+        "mesaj": tarama_kodu_mesaji(kod, profil_bilgisi),
+        "profil_bilgisi": profil_bilgisi
+    }
+
+def tarama_payload_kodu(qr_veri: str, tarayici_tipi: str = "hoyn_scanner") -> Tuple[DogrulamaKodu, Optional[dict]]:
+    """
+    Tarama hattının kripto aşaması: tek çözme, tek imza doğrulama, zaman damgası, tarayıcı tipi.
+    Veritabanına dokunmaz ve kodu tekrar koruyucuya kaydetmez (asenkron API bunu kripto havuzunda çalıştırır).
+    Girdiler: qr_veri (str), tarayici_tipi (str)
+    Çıktı: (DogrulamaKodu, payload dict veya None)
+    """
+    # Çözme + imza + zaman damgası (guvenlik hattı); tekrar oynatma en sonda
+    kod, payload = qr_payload_kodu(qr_veri, tekrar_kaydet=False)
+    if kod is not DogrulamaKodu.BASARILI:
+        return kod, payload
     
     # Tarayıcı tipi kontrolü (üçüncü parti koruma)
     if tarayici_tipi != "hoyn_scanner":
-        return {
-            "sonuc": "uyari",
-            "mesaj": "🔐 Bu QR kodu yalnızca Hoyn QR Tarayıcı ile okunabilir. Lütfen uygulamamızı indirin: [indir.hoyn.app]",
-            "profil_bilgisi": None
-        }
+        return DogrulamaKodu.UCUNCU_PARTI, payload
+    
+    return DogrulamaKodu.BASARILI, payload
+
+def tarama_sonucunu_tamamla(payload: dict, profil_bilgisi: Optional[dict]) -> dict:
+    """
+    Tarama hattının son aşaması: profil sonucu ve tekrar oynatma (kod yalnız kabul edilen taramada tüketilir).
+    Girdiler: payload (dict) - tarama_payload_kodu'nun kabul ettiği payload,
+              profil_bilgisi (dict) - payload'daki profilin araması (bulunamadıysa None)
+    Çıktı: dict (sonuc, kod, mesaj, profil_bilgisi)
+    """
+    if profil_bilgisi is None:
+        return tarama_sonucu_olustur(DogrulamaKodu.PROFIL_BULUNAMADI)
+    
+    # Tekrar oynatma kontrolü
+    if not guvenlik_yoneticisi.tekrar_kontrolu(payload):
+        return tarama_sonucu_olustur(DogrulamaKodu.TEKRAR_OYNATMA)
     
     # Başarılı: Profil bilgisini döndür
-    profil_bilgisi = PROFIL_VERITABANI[profil_id]
-    return {
-        "sonuc": "basarili",
-        "mesaj": f"{profil_bilgisi['isim']} Profiline Hoş Geldiniz! 🎉",
-        "profil_bilgisi": profil_bilgisi
-    }
+    return tarama_sonucu_olustur(DogrulamaKodu.BASARILI, profil_bilgisi)
+
+def qr_tara_ve_dogrula(qr_veri: str, user_agent: str = None, tarayici_tipi: str = "hoyn_scanner") -> dict:
+    """
+    QR kodunu tarar ve doğrular. Tarayıcı tipine göre işlem yapar.
+    Hat tek geçişlidir: yapısal tanıma, tek çözme, tek imza doğrulama, zaman damgası, tarayıcı tipi,
+    profil araması; ilk başarısız aşamada döner (yabancı içerikler en ucuz yoldan reddedilir).
+    Üçüncü parti tarayıcılar profil aramasından önce döner: profilin varlığı onlara açık edilmez.
+    Kod, tekrar koruyucuya yalnız tarama kabul edildiğinde (hoyn_scanner + profil bulundu) kaydedilir;
+    üçüncü parti ve profilsiz taramalar kodu tüketmez.
+    Girdiler: qr_veri (base64 QR string veya raw data), user_agent (str), tarayici_tipi (str)
+    Çıktı: dict (sonuç: 'basarili', 'uyari', 'hata'; kod: DogrulamaKodu; mesaj: str; profil_bilgisi: dict)
+    """
+    kod, payload = tarama_payload_kodu(qr_veri, tarayici_tipi)
+    if kod is not DogrulamaKodu.BASARILI:
+        return tarama_sonucu_olustur(kod)
+    
+    # Profil kontrolü (tek arama; önbellekten)
+    return tarama_sonucunu_tamamla(payload, profil_bilgisi_al(payload["profil_id"]))
 
 # QR görüntüsünden veri çıkarma (simülasyon)
 def qr_resminden_veri_cek(qr_base64: str) -> str:
@@ -153,6 +155,7 @@ def qr_resminden_veri_cek(qr_base64: str) -> str:
     Çıktı: Çözülmüş veri string
     """
     try:
+        import qrcode
         qr_img_data = base64.b64decode(qr_base64)
         img = BytesIO(qr_img_data)
         qr = qrcode.QRCode()
@@ -167,7 +170,8 @@ def qr_resminden_veri_cek(qr_base64: str) -> str:
 if __name__ == "__main__":
     # Test QR verisi (qr_uretici.py'den)
     from qr_uretici import sifrelenmis_veri_olustur
-    test_profil_id = "test-profile-1"
+    from veritabani import profil_olustur
+    test_profil_id = profil_olustur("test-user", "Cumhur")
     test_veri = sifrelenmis_veri_olustur(test_profil_id)
     
     # Hoyn scanner ile test
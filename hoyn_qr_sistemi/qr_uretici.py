@@ -1,27 +1,77 @@
 # Hoyn QR Üretici Modülü
 # Bu modül, profil bazlı şifrelenmiş QR kodları üretir.
 # Özelleştirme seçenekleri: renkler, AI tasarımı (basit renk tabanlı simülasyon).
-# Gerekli kütüphaneler: qrcode, cryptography, base64, json, uuid, hashlib, time.
+# Gerekli kütüphaneler: qrcode, cryptography, base64, json, uuid, hashlib, time, html, itertools.
+# qrcode (ve PIL) ilk QR resmi üretiminde yüklenir; yalnız payload üreten çağrılar bu maliyeti ödemez.
+# PNG, NumPy kuruluysa qr_cizici ile doğrudan yazılır; değilse qrcode'un PIL resim fabrikası kullanılır.
+# Çıktı biçimleri: base64 PNG (varsayılan), ham PNG baytları, dosya benzeri hedef ve vektörel SVG.
+# Çizim profilleri (ekran, etiket, poster, kucuk_resim) hedef boyuta göre hata düzeltme düzeyi, en küçük
+# QR sürümü, kutu boyutu ve sessiz bölge seçer.
+# Logo (logo_ekle veya logo yolu/baytları) qr_logo ile bindirilir; hata düzeltme otomatik olarak H'ye çıkar.
 # Kurulum: pip install qrcode[pil] cryptography
 
-import qrcode
 import json
 import base64
+import html
+import itertools
 import uuid
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
 import time
+from typing import BinaryIO, List, NamedTuple, Tuple, Union
 
-from guvenlik import guvenlik_yoneticisi
+from guvenlik import guvenlik_yoneticisi, SISTEM_KIMLIGI_V2
+
+# qr_olustur çıktı biçimleri ve PIL'in varsayılanıyla aynı PNG zlib düzeyi
+QR_CIKTI_BICIMLERI = ("base64", "png", "svg")
+PNG_SIKISTIRMA = 6
+
+class CizimProfili(NamedTuple):
+    """
+    Kullanım yerine göre QR düzeni: denenecek hata düzeltme düzeyleri (yüksekten düşüğe), hedef boyut
+    (piksel ya da dpi ile milimetre), sessiz bölge (kenar, modül) ve güvenilir okuma için modül başına en az piksel.
+    """
+    ad: str
+    hata_duzeltme: Tuple[str, ...]
+    hedef_piksel: int = 0
+    hedef_mm: float = 0
+    dpi: int = 0
+    kenar: int = 4
+    min_kutu: int = 1
+
+    def hedef_boyut(self, hedef_piksel: int = None, hedef_mm: float = None) -> int:
+        """
+        Girdiler: hedef_piksel (int), hedef_mm (float) - verilirse profilin varsayılanını geçersiz kılar
+        Çıktı: Hedef resim kenarı (piksel)
+        """
+        if hedef_piksel:
+            return int(hedef_piksel)
+        if hedef_mm or not self.hedef_piksel:
+            if not self.dpi:
+                raise ValueError(f"{self.ad} profilinde dpi yok; hedef_piksel verin")
+            return round((hedef_mm or self.hedef_mm) / 25.4 * self.dpi)
+        return self.hedef_piksel
+
+# Adlı çizim profilleri. Basılı profillerde en küçük modül ~0,34 mm (300 dpi'da 4 px, 150 dpi'da 2 px üstü).
+CIZIM_PROFILLERI = {profil.ad: profil for profil in (
+    # Telefon/masaüstü ekranı: ölçeklenmeyen, net kenarlı görüntü
+    CizimProfili("ekran", ("M", "L"), hedef_piksel=300, kenar=4, min_kutu=3),
+    # Yaka kartı/ürün etiketi: 25 mm, 300 dpi baskı; aşınmaya karşı önce Q
+    CizimProfili("etiket", ("Q", "M", "L"), hedef_mm=25, dpi=300, kenar=4, min_kutu=4),
+    # Afiş: 200 mm, 150 dpi; uzaktan ve kısmen kapanmış okuma için önce H
+    CizimProfili("poster", ("H", "Q", "M"), hedef_mm=200, dpi=150, kenar=4, min_kutu=3),
+    # Liste/önizleme küçük resmi: okunabilirlik ikincil, en küçük dosya
+    CizimProfili("kucuk_resim", ("L",), hedef_piksel=96, kenar=2, min_kutu=1),
+)}
 
 def sifrelenmis_veri_olustur(profil_id: str, sistem_kimligi: str = "HOYN_QR_V1") -> str:
     """
     Şifrelenmiş JSON payload oluşturur.
     Girdiler: profil_id (str), sistem_kimligi (str)
-    Çıktı: Şifrelenmiş base64 string
+    Çıktı: Şifrelenmiş base64 string (HOYN_QR_V2 için kompakt URL-safe base64)
     """
+    if sistem_kimligi == SISTEM_KIMLIGI_V2:
+        return guvenlik_yoneticisi.kompakt_payload_olustur(profil_id)
+    
     # Güvenlik modülünden payload oluştur
     payload = {
         "profil_id": profil_id,
@@ -32,20 +82,65 @@ def sifrelenmis_veri_olustur(profil_id: str, sistem_kimligi: str = "HOYN_QR_V1")
     # Şifrele
     return guvenlik_yoneticisi.veri_sifrele(payload)
 
-def qr_olustur(profil_id: str, arka_renk: str = "#FFFFFF", on_plan_renk: str = "#000000", logo_ekle: bool = False, ai_tasarim_modu: bool = False) -> str:
+def qr_olustur(profil_id: str, arka_renk: str = "#FFFFFF", on_plan_renk: str = "#000000", logo_ekle: bool = False, ai_tasarim_modu: bool = False,
+               sistem_kimligi: str = "HOYN_QR_V1", cikti: str = "base64", hedef: BinaryIO = None,
+               sikistirma: int = PNG_SIKISTIRMA, profil: str = None, hedef_piksel: int = None,
+               hedef_mm: float = None, logo: Union[str, bytes] = None) -> Union[str, bytes, int]:
     """
     Kullanıcının seçtiği renkler ve logo ile QR kodu üretir.
     AI tasarımı: Basit renk varyasyonu simülasyonu (gerçek AI için external API çağrısı eklenebilir).
-    Girdiler: profil_id (str), arka_renk (str), on_plan_renk (str), logo_ekle (bool), ai_tasarim_modu (bool)
-    Çıktı: base64 formatında QR resmi
+    Girdiler: profil_id (str), arka_renk (str), on_plan_renk (str), logo_ekle (bool), ai_tasarim_modu (bool),
+              sistem_kimligi (str) - HOYN_QR_V2 daha küçük QR sürümü üretir,
+              cikti (str) - "base64" (PNG, base64 metin), "png" (ham PNG baytları) veya "svg" (vektörel, metin),
+              hedef (ikili dosya benzeri) - verilirse ham PNG/SVG baytları buraya yazılır,
+              sikistirma (int) - PNG zlib düzeyi (0 en hızlı, 9 en küçük),
+              profil (str) - CIZIM_PROFILLERI'nden biri (ekran, etiket, poster, kucuk_resim); None ise
+              eski düzen (kutu 10 px, kenar 5, hata düzeltme M), hedef_piksel (int) / hedef_mm (float) -
+              profilin hedef boyutunu geçersiz kılar,
+              logo (str veya bytes) - logo dosyası yolu veya baytları; verilirse logo_ekle gerekmez,
+              logo_ekle tek başına Hoyn işaretini bindirir (her iki durumda hata düzeltme H olur)
+    Çıktı: base64 formatında QR resmi (str), PNG baytları (bytes), SVG metni (str);
+           hedef verilmişse yazılan bayt sayısı (int)
     """
+    if cikti not in QR_CIKTI_BICIMLERI:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {cikti!r} ({', '.join(QR_CIKTI_BICIMLERI)})")
+    
     # Şifrelenmiş veri oluştur
-    sifrelenmis_veri = sifrelenmis_veri_olustur(profil_id)
+    sifrelenmis_veri = sifrelenmis_veri_olustur(profil_id, sistem_kimligi)
+    resim = qr_resmi_uret(sifrelenmis_veri, arka_renk, on_plan_renk, logo_ekle, ai_tasarim_modu,
+                          "svg" if cikti == "svg" else "png", sikistirma, profil, hedef_piksel, hedef_mm, logo)
     
-    # QR nesnesi oluştur
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(sifrelenmis_veri)
-    qr.make(fit=True)
+    # Dosya/akış hedefi: ara kopya ve base64 yok
+    if hedef is not None:
+        hedef.write(resim)
+        return len(resim)
+    if cikti == "png":
+        return resim
+    if cikti == "svg":
+        return resim.decode("utf-8")
+    
+    # Base64'e çevir
+    img_str = base64.b64encode(resim).decode()
+    
+    return img_str
+
+def qr_resmi_uret(sifrelenmis_veri: str, arka_renk: str = "#FFFFFF", on_plan_renk: str = "#000000",
+                  logo_ekle: bool = False, ai_tasarim_modu: bool = False, bicim: str = "png",
+                  sikistirma: int = PNG_SIKISTIRMA, profil: str = None, hedef_piksel: int = None,
+                  hedef_mm: float = None, logo: Union[str, bytes] = None) -> bytes:
+    """
+    Hazır payload'ı QR resmine çevirir (qr_olustur ve toplu QR üretiminin ortak çizim adımı).
+    Girdiler: sifrelenmis_veri (str), arka_renk (str), on_plan_renk (str), logo_ekle (bool), ai_tasarim_modu (bool),
+              bicim (str) - "png" veya "svg", sikistirma (int) - PNG zlib düzeyi,
+              profil (str), hedef_piksel (int), hedef_mm (float) - bkz. qr_nesnesi_olustur,
+              logo (str veya bytes) - bkz. qr_olustur
+    Çıktı: PNG veya SVG (UTF-8) baytları
+    """
+    # Logo modüllerin ~%5'ini kapatır; yalnız H düzeyi (%30 kurtarma) bunu güvenle karşılar
+    logo_var = logo_ekle or logo is not None
+    
+    # QR nesnesi oluştur (qrcode/PIL yalnızca resim üretilirken yüklenir)
+    qr = qr_nesnesi_olustur(sifrelenmis_veri, profil, hedef_piksel, hedef_mm, "H" if logo_var else None)
     
     # AI modu aktifse renkleri karıştır (basit simülasyon)
     if ai_tasarim_modu:
@@ -54,24 +149,115 @@ def qr_olustur(profil_id: str, arka_renk: str = "#FFFFFF", on_plan_renk: str = "
         arka_renk = f"#{random.randint(0,255):02x}{random.randint(0,255):02x}{random.randint(0,255):02x}"
         on_plan_renk = f"#{random.randint(0,255):02x}{random.randint(0,255):02x}{random.randint(0,255):02x}"
     
-    # Stil ekle (standart PIL image factory kullan)
-    img = qr.make_image(
-        fill_color=on_plan_renk,
-        back_color=arka_renk
-    )
+    # Logo ekle (logo verilmemişse Hoyn işareti)
+    if logo_var:
+        return qr_resmini_kodla(qr, arka_renk, on_plan_renk, bicim, sikistirma, logo=logo, logo_ekle=True)
     
-    # Logo ekle (basit, eğer logo varsa)
-    if logo_ekle:
-        # Logo ekleme kodu (örnek, gerçek logo yolu eklenebilir)
-        pass  # TODO: Logo overlay
+    return qr_resmini_kodla(qr, arka_renk, on_plan_renk, bicim, sikistirma)
+
+def qr_nesnesi_olustur(veri: str, profil: str = None, hedef_piksel: int = None, hedef_mm: float = None,
+                       hata_duzeltme: str = None):
+    """
+    Veriyi QR matrisine çevirir. Profil verilmişse hata düzeltme düzeyleri sırayla denenir: her düzeyde veriye
+    yeten en küçük sürüm bulunur (maske seçimi yapılmadan), kutu boyutu hedef boyuta sığan en büyük tamsayı
+    olur ve kutu min_kutu'ya ulaşan ilk (en dayanıklı) düzey seçilir. Hiçbiri ulaşmazsa son düzey min_kutu ile
+    çizilir (resim hedeften büyük olur). Matris yalnız bir kez, seçilen düzeyde kurulur.
+    Girdiler: veri (str), profil (str) - CIZIM_PROFILLERI anahtarı veya None (eski düzen),
+              hedef_piksel (int), hedef_mm (float),
+              hata_duzeltme (str) - "L", "M", "Q" veya "H"; verilirse profilin düzey listesi yerine yalnız bu
+              düzey kullanılır (logo bindirme H ister)
+    Çıktı: qrcode.QRCode (make yapılmış; box_size ve border ayarlı)
+    """
+    import qrcode
+    if hata_duzeltme is not None and hata_duzeltme not in ("L", "M", "Q", "H"):
+        raise ValueError(f"Bilinmeyen hata düzeltme düzeyi: {hata_duzeltme!r} (L, M, Q, H)")
+    if profil is None:
+        qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        if hata_duzeltme is not None:
+            qr.error_correction = getattr(qrcode.constants, f"ERROR_CORRECT_{hata_duzeltme}")
+        qr.add_data(veri)
+        qr.make(fit=True)
+        return qr
     
-    # Base64'e çevir
-    from io import BytesIO
-    buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
+    cizim_profili = CIZIM_PROFILLERI.get(profil)
+    if cizim_profili is None:
+        raise ValueError(f"Bilinmeyen çizim profili: {profil!r} ({', '.join(CIZIM_PROFILLERI)})")
+    hedef = cizim_profili.hedef_boyut(hedef_piksel, hedef_mm)
+    qr = qrcode.QRCode(box_size=1, border=cizim_profili.kenar)
+    qr.add_data(veri)
+    duzeyler = cizim_profili.hata_duzeltme if hata_duzeltme is None else (hata_duzeltme,)
+    for duzey in duzeyler:
+        qr.error_correction = getattr(qrcode.constants, f"ERROR_CORRECT_{duzey}")
+        genislik = 4 * qr.best_fit() + 17 + 2 * cizim_profili.kenar
+        if hedef // genislik >= cizim_profili.min_kutu:
+            break
+    qr.box_size = max(hedef // genislik, cizim_profili.min_kutu)
+    qr.make(fit=False)
+    return qr
+
+def qr_resmini_kodla(qr, arka_renk: str = "#FFFFFF", on_plan_renk: str = "#000000", bicim: str = "png",
+                     sikistirma: int = PNG_SIKISTIRMA, logo: Union[str, bytes] = None,
+                     logo_ekle: bool = False) -> bytes:
+    """
+    Hazır qrcode.QRCode nesnesini PNG veya SVG baytlarına kodlar.
+    Girdiler: qr (qrcode.QRCode), arka_renk (str), on_plan_renk (str), bicim (str) - "png" / "svg",
+              sikistirma (int) - PNG zlib düzeyi, logo (str veya bytes) / logo_ekle (bool) - logo bindirilir
+              (qr H düzeyinde olmalı; önbellekli varlıklar qr_logo.logo_onbellegi'nde)
+    Çıktı: bytes
+    """
+    if logo_ekle or logo is not None:
+        import qr_logo
+        if bicim == "svg":
+            return qr_logo.logo_svg_olustur(qr, on_plan_renk, arka_renk, logo).encode("utf-8")
+        return qr_logo.logo_png_olustur(qr, on_plan_renk, arka_renk, logo, sikistirma)
     
-    return img_str
+    if bicim == "svg":
+        return qr_svg_olustur(qr.modules, qr.box_size, qr.border, on_plan_renk, arka_renk).encode("utf-8")
+    
+    try:
+        # Vektörel çizici: aynı pikseller, modül başına PIL çizim çağrısı yok
+        from qr_cizici import qr_png_olustur
+    except ImportError:
+        # NumPy yoksa standart PIL image factory kullan
+        img = qr.make_image(
+            fill_color=on_plan_renk,
+            back_color=arka_renk
+        )
+        from io import BytesIO
+        buffer = BytesIO()
+        img.save(buffer, format='PNG', compress_level=sikistirma)
+        return buffer.getvalue()
+    return qr_png_olustur(qr, on_plan_renk, arka_renk, sikistirma)
+
+def _svg_rengi(renk: Union[str, tuple]) -> str:
+    if isinstance(renk, (tuple, list)):
+        renk = f"rgb({int(renk[0])},{int(renk[1])},{int(renk[2])})"
+    return html.escape(renk, quote=True)
+
+def qr_svg_olustur(modul_matrisi: List[List[bool]], kutu_boyutu: int = 10, kenar: int = 4,
+                   on_plan_renk: Union[str, tuple] = "#000000", arka_renk: Union[str, tuple] = "#FFFFFF") -> str:
+    """
+    Modül matrisinden vektörel SVG üretir: her satırdaki ardışık koyu modüller tek bir dikdörtgen alt yoludur,
+    tüm QR tek <path> öğesidir (rasterleştirme yok). Koordinatlar modül birimindedir; piksel boyutu
+    PNG ile aynıdır. arka_renk "transparent" ise zemin çizilmez.
+    Girdiler: modul_matrisi (kenarsız bool matris), kutu_boyutu (int), kenar (int), on_plan_renk, arka_renk
+    Çıktı: SVG metni
+    """
+    genislik = len(modul_matrisi) + 2 * kenar
+    piksel = genislik * kutu_boyutu
+    parcalar = []
+    for y, satir in enumerate(modul_matrisi, kenar):
+        x = 0
+        for koyu, grup in itertools.groupby(satir):
+            uzunluk = sum(1 for _ in grup)
+            if koyu:
+                parcalar.append(f"M{x + kenar},{y}h{uzunluk}v1h-{uzunluk}z")
+            x += uzunluk
+    zemin = ("" if isinstance(arka_renk, str) and arka_renk.lower() == "transparent"
+             else f'<rect width="100%" height="100%" fill="{_svg_rengi(arka_renk)}"/>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{piksel}" height="{piksel}" '
+            f'viewBox="0 0 {genislik} {genislik}" shape-rendering="crispEdges">'
+            f'{zemin}<path fill="{_svg_rengi(on_plan_renk)}" d="{"".join(parcalar)}"/></svg>')
 
 # Test fonksiyonu
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+# Hoyn QR Tembel Başlatma Modülü
+# Bu modül, modül düzeyindeki global yöneticilerin (guvenlik_yoneticisi, veritabani_yoneticisi)
+# içe aktarmada değil ilk kullanımda kurulmasını sağlayan vekil sınıfı içerir.
+# Böylece içe aktarma anahtar dosyası okumaz/oluşturmaz, SQLite açmaz ve çıktı yazmaz.
+# Gerekli kütüphaneler: threading.
+
+import threading
+from typing import Any, Callable
+
+class TembelTekil:
+    """
+    İlk öznitelik erişiminde fabrikayı bir kez çağırıp nesneyi kuran, sonra tüm erişimleri ona ileten vekil.
+    Öznitelik okuma, yazma ve silme (unittest.mock.patch.object dahil) gerçek nesneye yönlenir.
+    """
+
+    def __init__(self, fabrika: Callable[[], Any]):
+        """
+        Girdiler: fabrika (Callable) - nesneyi kuran argümansız fonksiyon
+        """
+        object.__setattr__(self, "_tembel_fabrika", fabrika)
+        object.__setattr__(self, "_tembel_nesne", None)
+        object.__setattr__(self, "_tembel_kilit", threading.Lock())
+
+    def tembel_nesne(self) -> Any:
+        """
+        Gerçek nesneyi döndürür (gerekirse iş parçacığı güvenli şekilde kurar).
+        """
+        nesne = self._tembel_nesne
+        if nesne is None:
+            with self._tembel_kilit:
+                nesne = self._tembel_nesne
+                if nesne is None:
+                    nesne = self._tembel_fabrika()
+                    object.__setattr__(self, "_tembel_nesne", nesne)
+        return nesne
+
+    def tembel_kuruldu_mu(self) -> bool:
+        """
+        Çıktı: bool (gerçek nesne kuruldu mu?)
+        """
+        return self._tembel_nesne is not None
+
+    def __getattr__(self, ad: str) -> Any:
+        return getattr(self.tembel_nesne(), ad)
+
+    def __setattr__(self, ad: str, deger: Any) -> None:
+        setattr(self.tembel_nesne(), ad, deger)
+
+    def __delattr__(self, ad: str) -> None:
+        delattr(self.tembel_nesne(), ad)
+
+    def __repr__(self) -> str:
+        if self._tembel_nesne is None:
+            return f"<TembelTekil (kurulmadı): {self._tembel_fabrika!r}>"
+        return repr(self._tembel_nesne)
@@ -23,45 +23,28 @@ from guvenlik import HoynGuvenlikYoneticisi, sifrelenmis_qr_payload_olustur, qr_
 from veritabani import HoynVeritabaniYoneticisi, profil_olustur, profil_var_mi as db_profil_var_mi, qr_tarama_logla
 from ui_mesajlari import mesaj_al, profil_hos_geldin, qr_tarama_sonucu
 
-# Test veritabanı dosyasını temizle
+# Her test kendi geçici dizininde ve kendi test veritabanıyla çalışır
 @pytest.fixture(autouse=True)
-def temizlik():
-    """Her test öncesi veritabanını temizler."""
-    # Test dosyalarını kullan
-    test_db = "test_hoyn_db.db"
-    test_key = "test_hoyn_key.key"
+def temizlik(tmp_path, monkeypatch):
+    """Her test öncesi çalışma dizinini ve global veritabanı yöneticisini test için ayırır."""
+    import veritabani
+    from tembel import TembelTekil
     
-    if os.path.exists(test_db):
-        try:
-            os.remove(test_db)
-        except PermissionError:
-            pass  # Dosya kullanımda olabilir, görmezden gel
-    if os.path.exists(test_key):
-        try:
-            os.remove(test_key)
-        except PermissionError:
-            pass
+    # Göreli yollar (varsayılan veritabanı, anahtar dosyaları) paylaşılan dizin yerine tmp_path'e düşer
+    monkeypatch.chdir(tmp_path)
+    test_db = str(tmp_path / "test_hoyn_db.db")
     
-    # Global instance'ları test versiyonları ile değiştir
-    original_db_file = VERITABANI_DOSYASI
-    VERITABANI_DOSYASI = test_db
+    # Global instance'ları test versiyonları ile değiştir (monkeypatch test sonunda geri yükler)
+    monkeypatch.setattr(veritabani, "VERITABANI_DOSYASI", test_db)
+    test_yoneticisi = TembelTekil(lambda: veritabani.HoynVeritabaniYoneticisi(test_db))
+    monkeypatch.setattr(veritabani, "veritabani_yoneticisi", test_yoneticisi)
     
     yield
     
-    # Temizlik
-    if os.path.exists(test_db):
-        try:
-            os.remove(test_db)
-        except PermissionError:
-            pass
-    if os.path.exists(test_key):
-        try:
-            os.remove(test_key)
-        except PermissionError:
-            pass
-    
-    # Orijinal değerleri geri yükle
-    VERITABANI_DOSYASI = original_db_file
+    # Temizlik: arka plan yazıcısını durdur, bağlantıları kapat
+    if test_yoneticisi.tembel_kuruldu_mu():
+        test_yoneticisi.log_yaziciyi_kapat()
+        test_yoneticisi.baglantilari_kapat()
 
 class TestQRUretici:
     """QR Üretici modülü testleri."""
@@ -95,17 +78,196 @@ class TestQRUretici:
         # Renk özelleştirme
         qr_renk = qr_olustur(profil_id, arka_renk="#FF0000", on_plan_renk="#00FF00")
         assert isinstance(qr_renk, str)
+    
+    def test_qr_cizici_make_image_ile_ayni(self):
+        """Vektörel çizici qrcode'un PIL fabrikasıyla piksel piksel aynı görüntüyü üretmeli."""
+        pytest.importorskip("numpy")
+        import io
+        import qrcode
+        from PIL import Image
+        from qr_cizici import qr_png_olustur
+        
+        qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        qr.add_data(sifrelenmis_veri_olustur("test-profil-123"))
+        qr.make(fit=True)
+        for on_plan, arka in [("#000000", "#FFFFFF"), ("black", "white"), ("#00FF00", "#F00"),
+                              ("red", "transparent"), ((10, 20, 30), (200, 100, 0))]:
+            buffer = io.BytesIO()
+            qr.make_image(fill_color=on_plan, back_color=arka).save(buffer, format="PNG")
+            eski = Image.open(io.BytesIO(buffer.getvalue()))
+            yeni = Image.open(io.BytesIO(qr_png_olustur(qr, on_plan, arka)))
+            assert yeni.size == eski.size
+            assert yeni.convert("RGBA").tobytes() == eski.convert("RGBA").tobytes()
+        # Siyah/beyaz, qrcode gibi 1 bit gri tonlu kalmalı
+        assert Image.open(io.BytesIO(qr_png_olustur(qr, "black", "white"))).mode == "1"
+    
+    def test_qr_olustur_cikti_bicimleri(self, tmp_path):
+        """qr_olustur ham PNG, dosya hedefi ve SVG verebilmeli; zlib düzeyi pikselleri değiştirmemeli."""
+        import io
+        import re
+        import qrcode
+        from PIL import Image
+        from qr_uretici import qr_resmini_kodla
+        from main import qr_goster
+        
+        png = qr_olustur("test-profil-123", cikti="png")
+        assert png.startswith(b"\x89PNG\r\n\x1a\n")
+        hedef = io.BytesIO()
+        assert qr_olustur("test-profil-123", hedef=hedef) == len(hedef.getvalue())
+        assert hedef.getvalue().startswith(b"\x89PNG")
+        assert qr_olustur("test-profil-123", cikti="svg").startswith("<svg")
+        with pytest.raises(ValueError):
+            qr_olustur("test-profil-123", cikti="jpg")
+        
+        qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        qr.add_data(sifrelenmis_veri_olustur("test-profil-123"))
+        qr.make(fit=True)
+        hizli, kucuk = qr_resmini_kodla(qr, sikistirma=0), qr_resmini_kodla(qr, sikistirma=9)
+        assert len(kucuk) < len(hizli)
+        assert Image.open(io.BytesIO(hizli)).tobytes() == Image.open(io.BytesIO(kucuk)).tobytes()
+        
+        # SVG yolundaki dikdörtgenler tam olarak koyu modüllerdir
+        svg = qr_resmini_kodla(qr, "#FFFFFF", "#123456", bicim="svg").decode()
+        assert 'width="{0}" height="{0}"'.format(Image.open(io.BytesIO(kucuk)).size[0]) in svg
+        koyu = {(y, x + i) for x, y, uzunluk in
+                (map(int, parca) for parca in re.findall(r"M(\d+),(\d+)h(\d+)", svg)) for i in range(uzunluk)}
+        matris = qr.get_matrix()
+        assert koyu == {(y, x) for y, satir in enumerate(matris) for x, deger in enumerate(satir) if deger}
+        
+        # qr_goster baytları yeniden kodlamadan yazar
+        with patch("builtins.print"):
+            qr_goster(kucuk, str(tmp_path / "qr.png"))
+            qr_goster(base64.b64encode(kucuk).decode(), str(tmp_path / "qr_b64.png"))
+        assert (tmp_path / "qr.png").read_bytes() == (tmp_path / "qr_b64.png").read_bytes() == kucuk
+    
+    def test_cizim_profilleri(self):
+        """Çizim profilleri hedef boyuta sığan en dayanıklı hata düzeltme düzeyini ve kutu boyutunu seçmeli."""
+        import io
+        import uuid
+        import qrcode
+        from PIL import Image
+        from guvenlik import SISTEM_KIMLIGI_V2
+        from qr_uretici import CIZIM_PROFILLERI, qr_nesnesi_olustur
+        
+        kompakt = sifrelenmis_veri_olustur(str(uuid.uuid4()), SISTEM_KIMLIGI_V2)
+        for ad, profil in CIZIM_PROFILLERI.items():
+            qr = qr_nesnesi_olustur(kompakt, ad)
+            hedef = profil.hedef_boyut()
+            boyut = (qr.modules_count + 2 * qr.border) * qr.box_size
+            assert qr.border == profil.kenar and qr.box_size >= profil.min_kutu
+            assert hedef // (qr.modules_count + 2 * qr.border) == qr.box_size and boyut <= hedef
+            # Seçilen sürüm, seçilen düzeyde veriye yeten en küçük sürüm
+            kontrol = qrcode.QRCode(error_correction=qr.error_correction)
+            kontrol.add_data(kompakt)
+            assert kontrol.best_fit() == qr.version
+        # Kompakt payload afişte en yüksek (H) düzeyle sığar
+        assert qr_nesnesi_olustur(kompakt, "poster").error_correction == qrcode.constants.ERROR_CORRECT_H
+        
+        # Uzun V1 payload 25 mm etikete Q ile sığmaz: daha düşük düzeye iner, modül en az min_kutu kalır
+        uzun = sifrelenmis_veri_olustur("test-profil-123")
+        etiket = qr_nesnesi_olustur(uzun, "etiket")
+        assert etiket.error_correction != qrcode.constants.ERROR_CORRECT_Q
+        assert etiket.box_size == CIZIM_PROFILLERI["etiket"].min_kutu
+        assert qr_nesnesi_olustur(uzun, "etiket", hedef_mm=60).error_correction == qrcode.constants.ERROR_CORRECT_Q
+        
+        kucuk = Image.open(io.BytesIO(qr_olustur("test-profil-123", profil="kucuk_resim", hedef_piksel=128,
+                                                 cikti="png")))
+        assert kucuk.size[0] <= 128
+        assert Image.open(io.BytesIO(base64.b64decode(qr_olustur("test-profil-123")))).size[0] > 128
+        with pytest.raises(ValueError):
+            qr_olustur("test-profil-123", profil="billboard")
+    
+    def test_toplu_qr_uretimi(self, tmp_path):
+        """Toplu QR üretimi ZIP'e/dizine akmalı; hatalı işler diğerlerini durdurmadan raporlanmalı."""
+        import io
+        import uuid
+        import zipfile
+        from PIL import Image
+        from toplu_qr import QRIsi, dosyadan_toplu_qr_uret, toplu_qr_uret
+        
+        profil_idleri = [str(uuid.uuid4()) for _ in range(5)]
+        isler = profil_idleri + [
+            {"profil_id": "renkli", "on_plan_renk": "#FF0000", "dosya_adi": "kart.png"},
+            {"profil_id": "renk-hatali", "arka_renk": "renk-degil"},
+            QRIsi("kacak", dosya_adi="../kacak.png"),
+            profil_idleri[0],  # Yinelenen dosya adı
+        ]
+        for isci_sayisi in (0, 2):
+            hedef = tmp_path / f"qr_{isci_sayisi}.zip"
+            ilerleme = []
+            rapor = toplu_qr_uret(iter(isler), str(hedef), isci_sayisi=isci_sayisi, parca_boyutu=2,
+                                  ilerleme=lambda *sayilar: ilerleme.append(sayilar))
+            assert (rapor.okunan, rapor.uretilen) == (9, 6)
+            assert [hata.satir_no for hata in rapor.hatalar] == [7, 8, 9]
+            assert "renk-hatali" in rapor.hatalar[0].hata and "Geçersiz dosya adı" in rapor.hatalar[1].hata
+            assert ilerleme[-1] == (9, 6, 3)
+            with zipfile.ZipFile(hedef) as arsiv:
+                assert sorted(arsiv.namelist()) == sorted([f"{p}.png" for p in profil_idleri] + ["kart.png"])
+                resim = Image.open(io.BytesIO(arsiv.read("kart.png"))).convert("RGB")
+                assert (255, 0, 0) in {renk for _, renk in resim.getcolors()}
+        
+        # CSV iş dosyası -> dizin; hata satır numarası dosyadaki satırdır
+        csv_dosyasi = tmp_path / "isler.csv"
+        csv_dosyasi.write_text("profil_id,logo_ekle,dosya_adi\na,hayır,\nb,belki,\n,,\n", encoding="utf-8")
+        rapor = dosyadan_toplu_qr_uret(str(csv_dosyasi), str(tmp_path / "kartlar"), isci_sayisi=0)
+        assert os.listdir(tmp_path / "kartlar") == ["a.png"]
+        assert [hata.satir_no for hata in rapor.hatalar] == [3, 4]
+    
+    def test_logo_bindirme(self, tmp_path):
+        """Logo H düzeyinde bindirilmeli; logo alanı dışı pikseller aynı kalmalı, hazır varlık önbellekten gelmeli."""
+        pytest.importorskip("numpy")
+        import io
+        import qrcode
+        from PIL import Image
+        import qr_logo
+        from qr_uretici import qr_nesnesi_olustur, qr_resmini_kodla
+        
+        veri = sifrelenmis_veri_olustur("test-profil-123")
+        qr = qr_nesnesi_olustur(veri, "ekran", hata_duzeltme="H")
+        assert qr.error_correction == qrcode.constants.ERROR_CORRECT_H
+        onbellek = qr_logo.LogoOnbellegi(maks_boyut=1)
+        kirmizi = io.BytesIO()
+        Image.new("RGBA", (300, 150), (255, 0, 0, 255)).save(kirmizi, format="PNG")
+        
+        duz = Image.open(io.BytesIO(qr_resmini_kodla(qr, "#FFFFFF", "#000000"))).convert("RGB")
+        logolu = Image.open(io.BytesIO(qr_logo.logo_png_olustur(qr, "#000000", "#FFFFFF", kirmizi.getvalue(),
+                                                                onbellek=onbellek)))
+        assert logolu.size == duz.size and logolu.mode == "P"
+        logolu = logolu.convert("RGB")
+        baslangic, kenar = qr_logo.logo_alani(qr.modules_count)
+        alan = [(qr.border + baslangic) * qr.box_size, (qr.border + baslangic + kenar) * qr.box_size]
+        merkez = logolu.size[0] // 2
+        assert logolu.getpixel((merkez, merkez)) == (255, 0, 0)
+        # Geniş logo en-boy oranını korur: alanın üst kenarı temizlenmiş zemin olarak kalır
+        assert logolu.getpixel((merkez, alan[0] + qr.box_size)) == (255, 255, 255)
+        maske = Image.new("L", duz.size, 255)
+        maske.paste(0, (alan[0], alan[0], alan[1], alan[1]))
+        assert Image.composite(logolu, duz, maske).tobytes() == duz.tobytes()
+        
+        # Aynı (logo, karo boyutu) ikinci kez yüklenmez; farklı logo LRU'dan eskisini çıkarır
+        qr_logo.logo_png_olustur(qr, "#000000", "#FFFFFF", kirmizi.getvalue(), onbellek=onbellek)
+        qr_logo.logo_png_olustur(qr, "#000000", "transparent", None, onbellek=onbellek)
+        assert onbellek.istatistikler() == {"boyut": 1, "isabet": 1, "iska": 2, "isabet_orani": 1 / 3,
+                                            "tahliye": 1}
+        
+        # qr_olustur logo için H'ye yükseltir; H olmayan QR'a bindirme reddedilir
+        png = qr_olustur("test-profil-123", logo_ekle=True, profil="ekran", cikti="png")
+        assert (0xE0, 0x40, 0xFB) in {renk for _, renk in Image.open(io.BytesIO(png)).convert("RGB").getcolors()}
+        logo_dosyasi = tmp_path / "logo.png"
+        logo_dosyasi.write_bytes(kirmizi.getvalue())
+        svg = qr_olustur("test-profil-123", logo=str(logo_dosyasi), profil="ekran", cikti="svg")
+        assert svg.count("<image ") == 1 and "data:image/png;base64," in svg
+        with pytest.raises(ValueError):
+            qr_logo.logo_png_olustur(qr_nesnesi_olustur(veri, "ekran", hata_duzeltme="L"), logo=None)
 
 class TestQRTarayici:
     """QR Tarayıcı modülü testleri."""
     
-    @patch('qr_tarayici.PROFIL_VERITABANI')
-    def test_qr_tara_ve_dogrula_basari(self, mock_db):
+    def test_qr_tara_ve_dogrula_basari(self):
         """Başarılı QR tarama test."""
-        mock_db.__contains__.return_value = True
-        mock_db.__getitem__.return_value = {"isim": "Test Kullanıcı", "mesaj": "Hoş Geldiniz!"}
+        profil_id = profil_olustur("tarayici-user", "Test Kullanıcı")
         
-        test_veri = sifrelenmis_veri_olustur("test-profile-1")
+        test_veri = sifrelenmis_veri_olustur(profil_id)
         sonuc = qr_tara_ve_dogrula(test_veri, tarayici_tipi="hoyn_scanner")
         
         assert sonuc["sonuc"] == "basarili"
@@ -120,26 +282,98 @@ class TestQRTarayici:
         assert "Hoyn QR Tarayıcı" in sonuc["mesaj"]
     
     def test_hash_dogrulama(self):
-        """Hash doğrulama test."""
-        payload = {
+        """Hash doğrulama test (üretimdeki HMAC ile aynı olmalı)."""
+        from guvenlik import guvenlik_yoneticisi
+        payload = guvenlik_yoneticisi.zaman_damgasi_ekle_ve_hashle({
             "profil_id": "test-123",
-            "sistem_kimligi": "HOYN_QR_V1",
-            "zaman_damgasi": int(time.time()),
-            "hash": ""
-        }
+            "sistem_kimligi": "HOYN_QR_V1"
+        })
         
-        # Hash hesapla
-        veri = json.dumps({
+        assert hash_dogrula(payload) == True
+        
+        # Düz SHA-256 (eski tarayıcı hesabı) ve değiştirilmiş alanlar reddedilmeli
+        from cryptography.hazmat.primitives import hashes
+        hash_nesnesi = hashes.Hash(hashes.SHA256())
+        hash_nesnesi.update(json.dumps({
             "profil_id": payload["profil_id"],
             "sistem_kimligi": payload["sistem_kimligi"],
             "zaman_damgasi": payload["zaman_damgasi"]
-        }).encode()
-        from cryptography.hazmat.primitives import hashes
-        hash_nesnesi = hashes.Hash(hashes.SHA256())
-        hash_nesnesi.update(veri)
-        payload["hash"] = hash_nesnesi.finalize().hex()
+        }).encode())
+        assert hash_dogrula(dict(payload, hash=hash_nesnesi.finalize().hex())) == False
+        assert hash_dogrula(dict(payload, profil_id="test-456")) == False
+    
+    def test_tarama_hatti_sonuc_kodlari(self):
+        """Tarama hattı her aşamada uygun sonuç kodunu ve UI mesajını döndürmeli."""
+        from guvenlik import DogrulamaKodu
+        from ui_mesajlari import ui_mesajlari
+        gecerli = sifrelenmis_veri_olustur(profil_olustur("hat-user", "Ayşe"))
         
-        assert hash_dogrula(payload) == True
+        sonuc = qr_tara_ve_dogrula(gecerli)
+        assert sonuc["kod"] is DogrulamaKodu.BASARILI
+        assert sonuc["mesaj"] == ui_mesajlari.profil_hos_geldin_mesaji("Ayşe")
+        
+        assert qr_tara_ve_dogrula("https://example.com")["kod"] is DogrulamaKodu.HOYN_DEGIL
+        
+        bozuk = gecerli[:-8] + ("A" if gecerli[-8] != "A" else "B") + gecerli[-7:]
+        assert qr_tara_ve_dogrula(bozuk)["kod"] is DogrulamaKodu.SIFRE_COZME_HATASI
+        
+        with patch('guvenlik.time.time', return_value=time.time() + 400):
+            sonuc = qr_tara_ve_dogrula(gecerli)
+        assert sonuc["kod"] is DogrulamaKodu.SURE_DOLMUS
+        assert sonuc["mesaj"] == ui_mesajlari.mesaj_al("QR_SURE_DOLMU")
+        
+        sonuc = qr_tara_ve_dogrula(sifrelenmis_veri_olustur("olmayan-profil"))
+        assert sonuc["kod"] is DogrulamaKodu.PROFIL_BULUNAMADI
+        assert sonuc["mesaj"] == ui_mesajlari.mesaj_al("PROFIL_BULUNAMADI")
+        
+        # İmza yalnızca bir kez doğrulanmalı
+        from guvenlik import guvenlik_yoneticisi
+        with patch.object(guvenlik_yoneticisi, 'imza_dogrula', wraps=guvenlik_yoneticisi.imza_dogrula) as casus:
+            qr_tara_ve_dogrula(gecerli)
+        assert casus.call_count == 1
+    
+    def test_reddedilen_tarama_kodu_tuketmez(self):
+        """Üçüncü parti taraması kodu tüketmemeli; ardından gelen Hoyn taraması başarılı olmalı."""
+        from guvenlik import DogrulamaKodu, guvenlik_yoneticisi
+        guvenlik_yoneticisi.tekrar_koruyucuyu_etkinlestir(dilim_basina_eleman=1000)
+        guvenlik_yoneticisi.dogrulama_onbellegini_etkinlestir()
+        try:
+            kod = sifrelenmis_veri_olustur(profil_olustur("tekrar-user", "Deniz"))
+            assert qr_tara_ve_dogrula(kod, tarayici_tipi="third_party")["kod"] is DogrulamaKodu.UCUNCU_PARTI
+            assert qr_tara_ve_dogrula(kod, tarayici_tipi="third_party")["kod"] is DogrulamaKodu.UCUNCU_PARTI
+            assert qr_tara_ve_dogrula(kod)["kod"] is DogrulamaKodu.BASARILI
+            assert qr_tara_ve_dogrula(kod)["kod"] is DogrulamaKodu.TEKRAR_OYNATMA
+            
+            profilsiz = sifrelenmis_veri_olustur("olmayan-profil")
+            assert qr_tara_ve_dogrula(profilsiz)["kod"] is DogrulamaKodu.PROFIL_BULUNAMADI
+            assert guvenlik_yoneticisi.guvenlik_istatistikleri()["tekrar_koruyucu"]["kontrol"] == 2
+        finally:
+            guvenlik_yoneticisi.tekrar_koruyucuyu_kapat()
+            guvenlik_yoneticisi.dogrulama_onbellegini_kapat()
+    
+    def test_on_filtre_yabanci_icerik(self, capsys):
+        """Hoyn olmayan QR içerikleri şifre çözülmeden ve çıktı yazılmadan reddedilmeli."""
+        import uuid
+        from guvenlik import payload_bicimi_tani
+        yabancilar = [
+            "https://example.com/menu?masa=12",
+            "BEGIN:VCARD\nVERSION:3.0\nFN:Ayşe Yılmaz\nTEL:+905551112233\nEND:VCARD",
+            "WIFI:T:WPA;S:Kafe;P:sifre123;;",
+            "8690000000001",
+            base64.b64encode(os.urandom(300)).decode(),
+            "o" + "A" * 42,
+        ]
+        with patch('cryptography.fernet.Fernet.decrypt') as mock_decrypt:
+            for icerik in yabancilar:
+                assert payload_bicimi_tani(icerik) is None
+                sonuc = qr_tara_ve_dogrula(icerik)
+                assert sonuc["sonuc"] == "hata"
+                assert "Hoyn QR kodu değildir" in sonuc["mesaj"]
+            mock_decrypt.assert_not_called()
+        assert capsys.readouterr().out == ""
+        
+        assert payload_bicimi_tani(sifrelenmis_veri_olustur("on-filtre")) == "HOYN_QR_V1"
+        assert payload_bicimi_tani(sifrelenmis_veri_olustur(str(uuid.uuid4()), "HOYN_QR_V2")) == "HOYN_QR_V2"
     
     def test_zaman_damgasi_gecerli(self):
         """Geçerli zaman damgası test."""
@@ -147,6 +381,7 @@ class TestQRTarayici:
         assert zaman_damgasi_gecerli_mi(mevcut_zaman) == True
         assert zaman_damgasi_gecerli_mi(mevcut_zaman - 100) == True
         assert zaman_damgasi_gecerli_mi(mevcut_zaman - 400) == False  # 6.6 dakika eski
+        assert zaman_damgasi_gecerli_mi(mevcut_zaman + 600) == False  # Saat kayması toleransından ileri
 
 class TestGuvenlik:
     """Güvenlik modülü testleri."""
@@ -188,6 +423,406 @@ class TestGuvenlik:
         guvenlik = HoynGuvenlikYoneticisi()
         assert guvenlik.zaman_damgasi_gecerli_mi(int(time.time())) == True
         assert guvenlik.zaman_damgasi_gecerli_mi(int(time.time()) - 400) == False
+    
+    def test_toplu_payload_olusturma(self):
+        """Toplu payload üretimi test."""
+        from guvenlik import guvenlik_yoneticisi
+        profil_idleri = [f"toplu-{i}" for i in range(25)]
+        payloadlar = list(guvenlik_yoneticisi.toplu_payload_olustur(profil_idleri, parca_boyutu=7))
+        
+        assert len(payloadlar) == 25
+        zaman_damgalari = set()
+        for profil_id, sifrelenmis in zip(profil_idleri, payloadlar):
+            dogru_mu, _, payload = qr_payload_dogrula(sifrelenmis)
+            assert dogru_mu == True
+            assert payload["profil_id"] == profil_id
+            zaman_damgalari.add(payload["zaman_damgasi"])
+        assert len(zaman_damgalari) == 1  # Tek parti, tek zaman damgası
+    
+    def test_toplu_payload_isci_havuzu(self):
+        """Toplu payload üretimi süreç havuzu test."""
+        from guvenlik import guvenlik_yoneticisi
+        profil_idleri = [f"havuz-{i}" for i in range(10)]
+        payloadlar = list(guvenlik_yoneticisi.toplu_payload_olustur(profil_idleri, isci_sayisi=2, parca_boyutu=3))
+        
+        assert [qr_payload_dogrula(p)[2]["profil_id"] for p in payloadlar] == profil_idleri
+    
+    def test_kompakt_payload_v2(self):
+        """HOYN_QR_V2 kompakt payload üretim ve doğrulama test."""
+        import uuid
+        profil_id = str(uuid.uuid4())
+        kompakt = sifrelenmis_qr_payload_olustur(profil_id, "HOYN_QR_V2")
+        
+        assert len(kompakt) == 44
+        assert "=" not in kompakt and "+" not in kompakt and "/" not in kompakt
+        dogru_mu, _, payload = qr_payload_dogrula(kompakt)
+        assert dogru_mu == True
+        assert payload["profil_id"] == profil_id
+        assert payload["sistem_kimligi"] == "HOYN_QR_V2"
+        
+        # Tek bir bayt değişirse MAC tutmamalı
+        ham = bytearray(base64.urlsafe_b64decode(kompakt))
+        ham[5] ^= 0x01
+        dogru_mu, mesaj, _ = qr_payload_dogrula(base64.urlsafe_b64encode(bytes(ham)).decode())
+        assert dogru_mu == False
+        assert "Hash doğrulama başarısız" in mesaj
+    
+    def test_kompakt_payload_v2_tarayici(self):
+        """HOYN_QR_V2 tarayıcı çift yığın doğrulama test."""
+        profil_id = profil_olustur("kompakt-user", "Kompakt")
+        kompakt = sifrelenmis_veri_olustur(profil_id, "HOYN_QR_V2")
+        sonuc = qr_tara_ve_dogrula(kompakt, tarayici_tipi="hoyn_scanner")
+        assert sonuc["sonuc"] == "basarili"
+    
+    def test_dogrulama_onbellegi(self):
+        """Doğrulama önbelleği isabet ve LRU tahliye test."""
+        from guvenlik import guvenlik_yoneticisi
+        onbellek = guvenlik_yoneticisi.dogrulama_onbellegini_etkinlestir(maks_boyut=2)
+        try:
+            payloadlar = [sifrelenmis_qr_payload_olustur(f"onbellek-{i}") for i in range(3)]
+            assert qr_payload_dogrula(payloadlar[0])[0] == True
+            assert qr_payload_dogrula(payloadlar[0])[0] == True
+            assert onbellek.istatistikler()["isabet"] == 1
+            
+            qr_payload_dogrula(payloadlar[1])
+            qr_payload_dogrula(payloadlar[2])
+            istatistik = onbellek.istatistikler()
+            assert istatistik["boyut"] == 2
+            assert istatistik["tahliye"] == 1
+            
+            # Geçersiz payload önbelleğe alınmamalı
+            assert qr_payload_dogrula("gecersiz")[0] == False
+            assert onbellek.istatistikler()["boyut"] == 2
+        finally:
+            guvenlik_yoneticisi.dogrulama_onbellegini_kapat()
+    
+    def test_dogrulama_onbellegi_gecerlilik_penceresi(self):
+        """Önbellek kaydı payload geçerlilik süresini aşmamalı."""
+        from guvenlik import guvenlik_yoneticisi
+        onbellek = guvenlik_yoneticisi.dogrulama_onbellegini_etkinlestir(maks_ttl=3600)
+        try:
+            sifrelenmis = sifrelenmis_qr_payload_olustur("onbellek-pencere")
+            assert qr_payload_dogrula(sifrelenmis)[0] == True
+            
+            gelecek = time.time() + 301
+            with patch('guvenlik.time.time', return_value=gelecek):
+                dogru_mu, mesaj, _ = qr_payload_dogrula(sifrelenmis)
+            assert dogru_mu == False
+            assert "süresi dolmuş" in mesaj
+            assert onbellek.istatistikler()["suresi_dolan"] == 1
+        finally:
+            guvenlik_yoneticisi.dogrulama_onbellegini_kapat()
+    
+    def test_anahtar_halkasi_dondurme(self, tmp_path, monkeypatch):
+        """Anahtar döndürme sonrası eski kodların doğrulanması test."""
+        import uuid
+        from cryptography.fernet import Fernet
+        
+        def halka_tanimi(aktif, anahtarlar):
+            return json.dumps({"aktif": aktif, "anahtarlar": anahtarlar})
+        
+        anahtar_1 = {"fernet": Fernet.generate_key().decode(), "hmac": "hmac-1"}
+        anahtar_2 = {"fernet": Fernet.generate_key().decode(), "hmac": "hmac-2"}
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", halka_tanimi(1, {"1": anahtar_1}))
+        guvenlik = HoynGuvenlikYoneticisi(str(tmp_path / "halka.key"))
+        
+        profil_id = str(uuid.uuid4())
+        eski_v1 = guvenlik.veri_sifrele(guvenlik.zaman_damgasi_ekle_ve_hashle(
+            {"profil_id": profil_id, "sistem_kimligi": "HOYN_QR_V1"}))
+        eski_v2 = guvenlik.kompakt_payload_olustur(profil_id)
+        
+        # Süreç yeniden başlatılmadan yeni anahtara geç
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", halka_tanimi(2, {"1": anahtar_1, "2": anahtar_2}))
+        guvenlik.anahtar_halkasini_yenile()
+        assert guvenlik.anahtar_halkasi.aktif.anahtar_id == 2
+        for eski in (eski_v1, eski_v2):
+            payload = guvenlik.payload_coz(eski)
+            assert payload["anahtar_id"] == 1
+            assert guvenlik.tam_dogrulama_yap(payload)[0] == True
+        yeni = guvenlik.kompakt_payload_olustur(profil_id)
+        assert guvenlik.payload_coz(yeni)["anahtar_id"] == 2
+        
+        # Emekli anahtar halkadan çıkarılınca eski kodlar reddedilir
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", halka_tanimi(2, {"2": anahtar_2}))
+        guvenlik.anahtar_halkasini_yenile()
+        assert guvenlik.payload_coz(eski_v1) is None
+        dogru_mu, mesaj = guvenlik.tam_dogrulama_yap(guvenlik.payload_coz(eski_v2))
+        assert dogru_mu == False
+        assert "Bilinmeyen anahtar" in mesaj
+        
+        # Tarama hattında bilinmeyen V1 anahtar kimliği şifre çözme hatası değil, V2'deki gibi ANAHTAR_BILINMIYOR
+        import guvenlik as guvenlik_modulu
+        monkeypatch.setattr(guvenlik_modulu, "guvenlik_yoneticisi", guvenlik)
+        for eski in (eski_v1, eski_v2):
+            assert guvenlik_modulu.qr_payload_kodu(eski)[0] is guvenlik_modulu.DogrulamaKodu.ANAHTAR_BILINMIYOR
+    
+    def test_calisma_zamani_anahtarlari_yenilemede_korunur(self, tmp_path, monkeypatch):
+        """imza_arka_ucunu_ayarla ile eklenen anahtarlar anahtar_halkasini_yenile sonrası da doğrulanmalı."""
+        import uuid
+        from cryptography.fernet import Fernet
+        from guvenlik import Blake2bImzaArkaUcu
+        monkeypatch.delenv("HOYN_ANAHTAR_HALKASI", raising=False)
+        monkeypatch.delenv("HOYN_ANAHTAR_HALKASI_DOSYASI", raising=False)
+        guvenlik = HoynGuvenlikYoneticisi(str(tmp_path / "calisma.key"))
+        profil_id = str(uuid.uuid4())
+        
+        yeni_id = guvenlik.imza_arka_ucunu_ayarla(Blake2bImzaArkaUcu(b"blake-anahtari"))
+        kodlar = [guvenlik.veri_sifrele(guvenlik.zaman_damgasi_ekle_ve_hashle(
+            {"profil_id": profil_id, "sistem_kimligi": "HOYN_QR_V1"})), guvenlik.kompakt_payload_olustur(profil_id)]
+        
+        guvenlik.anahtar_halkasini_yenile()
+        assert guvenlik.anahtar_halkasi.aktif.anahtar_id == 0
+        for kod in kodlar:
+            payload = guvenlik.payload_coz(kod)
+            assert payload["anahtar_id"] == yeni_id
+            assert guvenlik.tam_dogrulama_yap(payload)[0] == True
+        
+        # Aynı kimlik halka tanımında da varsa tanım kazanır
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", json.dumps({"aktif": yeni_id, "anahtarlar": {
+            str(yeni_id): {"fernet": Fernet.generate_key().decode(), "hmac": "hmac"}}}))
+        guvenlik.anahtar_halkasini_yenile()
+        assert guvenlik.anahtar_halkasi.girdi(yeni_id).imzalayici.ad == "hmac-sha256"
+        assert yeni_id not in guvenlik.calisma_zamani_girdileri
+    
+    def test_uc_basamakli_anahtar_kimligi(self, tmp_path, monkeypatch):
+        """100-255 anahtar kimlikli V1 kodlar ön filtreden geçip doğrulanmalı."""
+        import uuid
+        from cryptography.fernet import Fernet
+        from guvenlik import payload_bicimi_tani, SISTEM_KIMLIGI_V1
+        
+        for anahtar_id in (99, 100, 255):
+            monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", json.dumps({"aktif": anahtar_id, "anahtarlar": {
+                str(anahtar_id): {"fernet": Fernet.generate_key().decode(), "hmac": "hmac"}}}))
+            guvenlik = HoynGuvenlikYoneticisi(str(tmp_path / f"halka_{anahtar_id}.key"))
+            kod = guvenlik.veri_sifrele(guvenlik.zaman_damgasi_ekle_ve_hashle(
+                {"profil_id": str(uuid.uuid4()), "sistem_kimligi": "HOYN_QR_V1"}))
+            assert payload_bicimi_tani(kod) == SISTEM_KIMLIGI_V1
+            payload = guvenlik.payload_coz(kod)
+            assert payload["anahtar_id"] == anahtar_id
+            assert guvenlik.tam_dogrulama_yap(payload)[0] == True
+    
+    def test_imza_arka_uclari(self, tmp_path):
+        """BLAKE2b ve Ed25519 imza arka uçları test (V1 ve V2)."""
+        import uuid
+        from guvenlik import Blake2bImzaArkaUcu, Ed25519ImzaArkaUcu
+        guvenlik = HoynGuvenlikYoneticisi(str(tmp_path / "imza.key"))
+        profil_id = str(uuid.uuid4())
+        
+        for imzalayici in (Blake2bImzaArkaUcu(b"blake-anahtari"), Ed25519ImzaArkaUcu(os.urandom(32))):
+            guvenlik.imza_arka_ucunu_ayarla(imzalayici)
+            v1 = guvenlik.veri_sifrele(guvenlik.zaman_damgasi_ekle_ve_hashle(
+                {"profil_id": profil_id, "sistem_kimligi": "HOYN_QR_V1"}))
+            v2 = guvenlik.kompakt_payload_olustur(profil_id)
+            for kod in (v1, v2):
+                payload = guvenlik.payload_coz(kod)
+                assert guvenlik.tam_dogrulama_yap(payload)[0] == True
+                payload["zaman_damgasi"] += 1
+                assert guvenlik.tam_dogrulama_yap(payload)[0] == False
+        
+        # Yeni kimlik en küçük boş kimliktir; 255 kullanımdayken taşmaz, halka doluysa açık hata verir
+        from cryptography.fernet import Fernet
+        from guvenlik import AnahtarGirdisi, AnahtarHalkasi
+        fernet_anahtari = Fernet.generate_key()
+        guvenlik.anahtar_halkasini_ayarla(AnahtarHalkasi([AnahtarGirdisi(255, fernet_anahtari, b"h")], 255))
+        assert guvenlik.imza_arka_ucunu_ayarla(Blake2bImzaArkaUcu(b"blake-anahtari")) == 0
+        guvenlik.anahtar_halkasini_ayarla(AnahtarHalkasi(
+            [AnahtarGirdisi(anahtar_id, fernet_anahtari, b"h") for anahtar_id in range(256)], 255))
+        with pytest.raises(ValueError, match="dolu"):
+            guvenlik.imza_arka_ucunu_ayarla(Blake2bImzaArkaUcu(b"blake-anahtari"))
+    
+    def test_kisaltilmis_v1_imzasi_reddedilir(self, tmp_path):
+        """V1 yalnız tam imzayla doğrulanmalı: kompakt uzunluğa kısaltılmış hash geçmemeli."""
+        import uuid
+        from guvenlik import Blake2bImzaArkaUcu, KOMPAKT_MAC_UZUNLUGU
+        guvenlik = HoynGuvenlikYoneticisi(str(tmp_path / "kisa.key"))
+        
+        for imzalayici in (None, Blake2bImzaArkaUcu(b"blake-anahtari")):
+            if imzalayici is not None:
+                guvenlik.imza_arka_ucunu_ayarla(imzalayici)
+            payload = guvenlik.payload_coz(guvenlik.veri_sifrele(guvenlik.zaman_damgasi_ekle_ve_hashle(
+                {"profil_id": str(uuid.uuid4()), "sistem_kimligi": "HOYN_QR_V1"})))
+            assert guvenlik.tam_dogrulama_yap(payload)[0] == True
+            for uzunluk in (KOMPAKT_MAC_UZUNLUGU, 16, 31):
+                kisa = dict(payload, hash=payload["hash"][:2 * uzunluk])
+                assert guvenlik.tam_dogrulama_yap(kisa)[0] == False
+    
+    def test_ed25519_yalniz_acik_anahtarla_dogrulama(self, tmp_path, monkeypatch):
+        """Tarayıcı düğümü paylaşılan sır olmadan, yalnızca açık anahtarla V2 doğrular."""
+        import uuid
+        from guvenlik import Ed25519ImzaArkaUcu
+        imzalayici = Ed25519ImzaArkaUcu(os.urandom(32))
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", json.dumps({"aktif": 5, "anahtarlar": {
+            "5": {"imza": "ed25519", "ozel_anahtar": imzalayici.ozel_anahtar.hex()}}}))
+        uretici = HoynGuvenlikYoneticisi(str(tmp_path / "uretici.key"))
+        kod = uretici.kompakt_payload_olustur(str(uuid.uuid4()))
+        
+        monkeypatch.setenv("HOYN_ANAHTAR_HALKASI", json.dumps({"aktif": 5, "anahtarlar": {
+            "5": {"imza": "ed25519", "acik_anahtar": imzalayici.acik_anahtar.hex()}}}))
+        tarayici = HoynGuvenlikYoneticisi(str(tmp_path / "tarayici.key"))
+        assert tarayici.tam_dogrulama_yap(tarayici.payload_coz(kod))[0] == True
+        with pytest.raises(ValueError):
+            tarayici.kompakt_payload_olustur(str(uuid.uuid4()))
+    
+    def test_tekrar_koruyucu(self):
+        """Tekrar oynatılan payload'un reddedilmesi test (önbellek isabetleri dahil)."""
+        from guvenlik import guvenlik_yoneticisi
+        guvenlik_yoneticisi.tekrar_koruyucuyu_etkinlestir(dilim_basina_eleman=1000)
+        guvenlik_yoneticisi.dogrulama_onbellegini_etkinlestir()
+        try:
+            sifrelenmis = sifrelenmis_qr_payload_olustur("tekrar-test")
+            assert qr_payload_dogrula(sifrelenmis)[0] == True
+            dogru_mu, mesaj, _ = qr_payload_dogrula(sifrelenmis)
+            assert dogru_mu == False
+            assert "Tekrar oynatma" in mesaj
+            assert qr_payload_dogrula(sifrelenmis_qr_payload_olustur("tekrar-test-2"))[0] == True
+            
+            istatistik = guvenlik_yoneticisi.guvenlik_istatistikleri()["tekrar_koruyucu"]
+            assert istatistik["kontrol"] == 3
+            assert istatistik["red"] == 1
+        finally:
+            guvenlik_yoneticisi.tekrar_koruyucuyu_kapat()
+            guvenlik_yoneticisi.dogrulama_onbellegini_kapat()
+    
+    def test_tekrar_koruyucu_sabit_bellek(self):
+        """Dilimler dönerken bellek sabit kalmalı ve eski dilimler sıfırlanmalı."""
+        from guvenlik import TekrarKoruyucu
+        koruyucu = TekrarKoruyucu(pencere=300, dilim_suresi=60, dilim_basina_eleman=1000)
+        bellek = koruyucu.istatistikler()["bellek_bayt"]
+        simdi = int(time.time())
+        assert koruyucu.kontrol_et_ve_ekle(b"kod", simdi) == True
+        assert koruyucu.kontrol_et_ve_ekle(b"kod", simdi) == False
+        
+        # Pencere kadar ileri sar: aynı yuva yeni dilim için sıfırlanır
+        with patch('guvenlik.time.time', return_value=simdi + 60 * koruyucu.dilim_sayisi):
+            for i in range(500):
+                koruyucu.kontrol_et_ve_ekle(b"kod-%d" % i, simdi + 60 * koruyucu.dilim_sayisi)
+            assert koruyucu.kontrol_et_ve_ekle(b"kod", simdi + 60 * koruyucu.dilim_sayisi) == True
+        assert koruyucu.istatistikler()["bellek_bayt"] == bellek
+
+    def test_ileri_tarihli_payload_tekrari(self):
+        """İleri tarihli payload süre kontrolünden geçmemeli ve koruyucuda kayıtsız kalmamalı."""
+        from guvenlik import guvenlik_yoneticisi, TekrarKoruyucu, SAAT_KAYMASI_TOLERANSI
+        simdi = int(time.time())
+        assert guvenlik_yoneticisi.zaman_damgasi_gecerli_mi(simdi + SAAT_KAYMASI_TOLERANSI) == True
+        assert guvenlik_yoneticisi.zaman_damgasi_gecerli_mi(simdi + 600) == False
+        
+        with patch('guvenlik.time.time', return_value=simdi + 600):
+            ileri_tarihli = sifrelenmis_qr_payload_olustur("ileri-tarihli")
+        guvenlik_yoneticisi.tekrar_koruyucuyu_etkinlestir(dilim_basina_eleman=1000)
+        try:
+            for _ in range(3):
+                dogru_mu, mesaj, _ = qr_payload_dogrula(ileri_tarihli)
+                assert dogru_mu == False
+                assert "süresi dolmuş" in mesaj
+        finally:
+            guvenlik_yoneticisi.tekrar_koruyucuyu_kapat()
+        
+        # Koruyucu tek başına da ileri tarihli kimliği kaydeder (en yeni dilimde)
+        koruyucu = TekrarKoruyucu(pencere=300, dilim_suresi=60, dilim_basina_eleman=1000)
+        assert koruyucu.kontrol_et_ve_ekle(b"ileri", simdi + 3600) == True
+        assert koruyucu.kontrol_et_ve_ekle(b"ileri", simdi + 3600) == False
+        assert koruyucu.istatistikler()["kapsam_disi"] == 2
+
+class TestAsenkron:
+    """Asenkron tarama/doğrulama API testleri."""
+    
+    def test_eszamanli_tarama_geri_basinc(self):
+        """Çok sayıda eşzamanlı tarama sınırlı havuzda, bekleyen iş sınırını aşmadan tamamlanmalı."""
+        import asyncio
+        from asenkron import SinirliYurutucu, qr_tara_ve_dogrula_async, qr_payload_dogrula_async
+        yurutucu = SinirliYurutucu("test", 2, 8)
+        db_yurutucu = SinirliYurutucu("test-db", 1, 4)
+        profil_id = profil_olustur("asenkron-user", "Asenkron Profil")
+        kodlar = [sifrelenmis_veri_olustur(profil_id) for _ in range(100)] + ["https://example.com"] * 100
+        
+        async def tara():
+            return await asyncio.gather(*(qr_tara_ve_dogrula_async(kod) for kod in kodlar))
+        
+        # Profil araması kripto havuzunda değil, veritabanı havuzunda çalışmalı
+        import veritabani
+        arama_is_parcaciklari = set()
+        gercek_arama = veritabani.depolama_arka_ucu().profil_bilgisi_al
+        
+        def izlenen_arama(aranan_id):
+            import threading
+            arama_is_parcaciklari.add(threading.current_thread().name.split("_")[0])
+            return gercek_arama(aranan_id)
+        
+        try:
+            with patch('asenkron.kripto_yurutucu', yurutucu), patch('asenkron.veritabani_yurutucu', db_yurutucu), \
+                    patch.object(veritabani.depolama_arka_ucu(), 'profil_bilgisi_al', izlenen_arama):
+                sonuclar = asyncio.run(tara())
+                # Aynı yürütücü yeni bir olay döngüsünde de kullanılabilmeli
+                dogru_mu, _, payload = asyncio.run(qr_payload_dogrula_async(kodlar[0]))
+        finally:
+            yurutucu.kapat()
+            db_yurutucu.kapat()
+        
+        assert arama_is_parcaciklari == {"hoyn-test-db"}
+        assert db_yurutucu.istatistikler()["bekleyen"] == 0
+        
+        assert [sonuc["sonuc"] for sonuc in sonuclar] == ["basarili"] * 100 + ["hata"] * 100
+        assert dogru_mu == True and payload["profil_id"] == profil_id
+        istatistik = yurutucu.istatistikler()
+        assert 1 <= istatistik["en_yuksek_bekleyen"] <= 8
+        assert istatistik["bekleyen"] == 0
+    
+    def test_asenkron_profil_ve_loglama(self):
+        """Asenkron profil arama ve tarama loglama senkron sürümlerle aynı sonucu vermeli."""
+        import asyncio
+        from asenkron import profil_bilgisi_al_async, profil_var_mi_async, qr_tarama_logla_async
+        from veritabani import tarama_loglarini_al
+        profil_id = profil_olustur("async-test-user", "Async Profil", "")
+        
+        async def akis():
+            profil = await profil_bilgisi_al_async(profil_id)
+            loglar = await asyncio.gather(*(qr_tarama_logla_async(profil_id, "hoyn_scanner", basarili_mi=True)
+                                            for _ in range(5)))
+            return profil, loglar, await profil_var_mi_async("olmayan-profil-123")
+        
+        profil, loglar, olmayan = asyncio.run(akis())
+        assert profil["isim"] == "Async Profil"
+        assert loglar == [True] * 5
+        assert olmayan == False
+        assert len(tarama_loglarini_al(profil_id)) == 5
+
+class TestBaslangic:
+    """Tembel başlatma ve yan etkisiz içe aktarma testleri."""
+    
+    def test_ice_aktarma_yan_etkisiz(self, tmp_path):
+        """Modülleri içe aktarmak dosya oluşturmamalı, çıktı yazmamalı, ağır kütüphaneleri yüklememeli."""
+        import subprocess
+        import sys
+        modul_dizini = os.path.dirname(os.path.abspath(__file__))
+        kod = ("import sys, guvenlik, veritabani, ui_mesajlari, qr_uretici, qr_tarayici, asenkron; "
+               "print(sorted(m for m in ('cryptography', 'PIL', 'qrcode', 'multiprocessing') if m in sys.modules))")
+        sonuc = subprocess.run([sys.executable, "-c", kod], cwd=tmp_path, capture_output=True, text=True, check=True,
+                               env=dict(os.environ, PYTHONPATH=modul_dizini))
+        assert sonuc.stdout == "[]\n"
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_tembel_tekil(self):
+        """Vekil nesne ilk erişimde bir kez kurulmalı ve öznitelikleri gerçek nesneye iletmeli."""
+        from tembel import TembelTekil
+        kurulumlar = []
+        
+        class Ornek:
+            def __init__(self):
+                kurulumlar.append(1)
+                self.deger = 1
+            
+            def topla(self, x):
+                return self.deger + x
+        
+        vekil = TembelTekil(Ornek)
+        assert vekil.tembel_kuruldu_mu() == False and kurulumlar == []
+        assert vekil.topla(2) == 3
+        vekil.deger = 10
+        assert vekil.tembel_nesne().deger == 10
+        with patch.object(vekil, 'topla', return_value=0):
+            assert vekil.topla(2) == 0
+        assert vekil.topla(2) == 12
+        assert kurulumlar == [1]
 
 class TestVeritabani:
     """Veritabanı modülü testleri."""
@@ -255,6 +890,416 @@ class TestVeritabani:
         # Mevcut olmayan profil
         assert db_profil_var_mi("olmayan-profil-123") == False
 
+    def test_kalici_baglantilar(self, tmp_path):
+        """Her iş parçacığı tek kalıcı WAL bağlantısı kullanmalı; eşzamanlı yazmalar kaybolmamalı."""
+        import threading
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "kalici.db"))
+        conn = db.baglanti_olustur()
+        assert db.baglanti_olustur() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        
+        profil_id = db.profil_olustur("kalici-test", "Kalıcı Profil")
+        is_parcacigi_baglantilari = []
+        
+        def logla():
+            is_parcacigi_baglantilari.append(db.baglanti_olustur())
+            for _ in range(20):
+                assert db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=db.profil_var_mi(profil_id))
+        
+        is_parcaciklari = [threading.Thread(target=logla) for _ in range(4)]
+        for is_parcacigi in is_parcaciklari:
+            is_parcacigi.start()
+        for is_parcacigi in is_parcaciklari:
+            is_parcacigi.join()
+        
+        assert len({id(baglanti) for baglanti in is_parcacigi_baglantilari + [conn]}) == 5
+        assert len(db.tarama_loglarini_al(profil_id)) == 80
+        
+        db.baglantilari_kapat()
+        assert db.baglanti_olustur() is not conn
+        assert db.profil_var_mi(profil_id) == True
+        assert db.profil_var_mi("olmayan-profil") == False
+
+    def test_log_yazici_parti_ve_kapanis(self, tmp_path):
+        """Arka plan yazıcısı logları parti halinde yazmalı, kapanışta kuyruğu boşaltmalı."""
+        import threading
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "log_yazici.db"))
+        profil_id = db.profil_olustur("log-yazici", "Log Yazıcı Profil")
+        yazici = db.log_yaziciyi_etkinlestir(parti_boyutu=50, parti_suresi=60)
+        
+        def logla():
+            for _ in range(30):
+                assert db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True) == True
+        
+        is_parcaciklari = [threading.Thread(target=logla) for _ in range(4)]
+        for is_parcacigi in is_parcaciklari:
+            is_parcacigi.start()
+        for is_parcacigi in is_parcaciklari:
+            is_parcacigi.join()
+        # Bilinmeyen profil partiyi bozmamalı
+        db.qr_tarama_logla("olmayan-profil", "hoyn_scanner")
+        db.log_yaziciyi_kapat()
+        
+        istatistik = yazici.istatistikler()
+        assert istatistik["yazilan"] == 120 and istatistik["hatali"] == 1
+        assert istatistik["kuyruk_derinligi"] == 0
+        assert istatistik["bosaltma_sayisi"] >= 3  # iki dolu parti + kapanış
+        assert istatistik["en_uzun_bosaltma_ms"] > 0
+        assert len(db.tarama_loglarini_al(profil_id)) == 120
+        assert db.log_yazici is None
+    
+    def test_log_yazici_sqlite_hatasinda_calismayi_surdurur(self, tmp_path):
+        """Bütünlük dışı bir SQLite hatası (ör. kilitli veritabanı) yalnız o kaydı düşürmeli, yazıcı çalışmalı."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "kilitli.db"))
+        profil_id = db.profil_olustur("kilitli", "Kilitli Profil")
+        yazici = db.log_yaziciyi_etkinlestir(parti_boyutu=100, parti_suresi=60)
+        gercek_ekle = db.tarama_loglarini_ekle
+        
+        def kilitli_ekle(conn, kayitlar):
+            if any(kayit[1] == "kilitli" for kayit in kayitlar):
+                raise sqlite3.OperationalError("database is locked")
+            return gercek_ekle(conn, kayitlar)
+        
+        try:
+            with patch.object(db, 'tarama_loglarini_ekle', side_effect=kilitli_ekle):
+                for tip in ("t0", "kilitli", "t1"):
+                    assert db.qr_tarama_logla(profil_id, tip) == True
+                assert yazici.bosalt() == True
+                # Yazıcı iş parçacığı hâlâ çalışıyor: sonraki kayıtlar da yazılır
+                db.qr_tarama_logla(profil_id, "t2")
+                assert yazici.bosalt(zaman_asimi=5) == True
+            istatistik = yazici.istatistikler()
+            assert istatistik["yazilan"] == 3 and istatistik["hatali"] == 1
+            assert "locked" in istatistik["son_hata"]
+            assert sorted(log["tarayici_tipi"] for log in db.tarama_loglarini_al(profil_id)) == ["t0", "t1", "t2"]
+        finally:
+            db.log_yaziciyi_kapat()
+    
+    def test_log_yazici_tasma_politikalari(self, tmp_path):
+        """Dolu kuyrukta yeniyi_at yeni kaydı, eskiyi_at en eski kaydı atmalı."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "tasma.db"))
+        profil_id = db.profil_olustur("tasma", "Taşma Profil")
+        for politika, beklenen_tipler in (("yeniyi_at", ["t0", "t1", "t2"]), ("eskiyi_at", ["t5", "t6", "t7"])):
+            db.baglanti_olustur().execute("DELETE FROM qr_tarama_loglari")
+            db.baglanti_olustur().commit()
+            yazici = db.log_yaziciyi_etkinlestir(parti_boyutu=100, parti_suresi=60, kuyruk_boyutu=3,
+                                                 tasma_politikasi=politika)
+            sonuclar = [db.qr_tarama_logla(profil_id, f"t{i}") for i in range(8)]
+            assert sonuclar == ([True] * 3 + [False] * 5 if politika == "yeniyi_at" else [True] * 8)
+            assert yazici.istatistikler()["atilan"] == 5
+            assert yazici.bosalt(zaman_asimi=5) == True
+            assert sorted(log["tarayici_tipi"] for log in db.tarama_loglarini_al(profil_id)) == beklenen_tipler
+            db.log_yaziciyi_kapat()
+    
+    def test_log_yazici_sure_esigi(self, tmp_path):
+        """Parti dolmasa da en eski kayıt parti_suresi kadar bekleyince yazılmalı."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "sure.db"))
+        profil_id = db.profil_olustur("sure", "Süre Profil")
+        yazici = db.log_yaziciyi_etkinlestir(parti_boyutu=1000, parti_suresi=0.05)
+        try:
+            db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True)
+            son = time.time() + 5
+            while yazici.istatistikler()["yazilan"] < 1 and time.time() < son:
+                time.sleep(0.01)
+            assert len(db.tarama_loglarini_al(profil_id)) == 1
+        finally:
+            db.log_yaziciyi_kapat()
+    
+    def test_sema_gocleri(self, tmp_path):
+        """Sürümsüz eski veritabanı güncel sürüme taşınmalı; yeni göç yalnızca bir kez uygulanmalı."""
+        from veritabani import SEMA_GOCLERI, sema_goclerini_uygula, sutun_ekle
+        yol = str(tmp_path / "eski.db")
+        eski = sqlite3.connect(yol)
+        eski.execute("CREATE TABLE profiller (profil_id TEXT PRIMARY KEY, kullanici_id TEXT NOT NULL, "
+                     "isim TEXT NOT NULL, aciklama TEXT, olusturma_zamani TIMESTAMP, "
+                     "guncelleme_zamani TIMESTAMP, aktif_mi BOOLEAN DEFAULT 1)")
+        eski.commit()
+        eski.close()
+        
+        db = HoynVeritabaniYoneticisi(yol)
+        assert db.sema_surumu() == SEMA_GOCLERI[-1][0]
+        conn = db.baglanti_olustur()
+        indeksler = {satir[0] for satir in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_tarama_loglari_zaman", "idx_tarama_loglari_profil_zaman",
+                "idx_profiller_aktif_kullanici"} <= indeksler
+        
+        gocler = SEMA_GOCLERI + [(SEMA_GOCLERI[-1][0] + 1, "Deneme sütunu",
+                                  (sutun_ekle("profiller", "etiket", "TEXT DEFAULT ''"),))]
+        assert sema_goclerini_uygula(conn, gocler) == gocler[-1][0]
+        assert sema_goclerini_uygula(conn, gocler) == gocler[-1][0]
+        assert "etiket" in {satir[1] for satir in conn.execute("PRAGMA table_info(profiller)")}
+    
+    def test_tarama_loglari_keyset_sayfalama(self, tmp_path):
+        """Sayfalar imleçle birleşince tam listeyi atlamasız/tekrarsız ve aynı sırayla vermeli."""
+        from veritabani import TaramaLogu
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "sayfa.db"))
+        profil_id = db.profil_olustur("sayfa", "Sayfa Profil")
+        for i in range(25):  # Aynı saniyede çok sayıda kayıt: sıralama log_id ile belirlenir
+            db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=i % 2 == 0)
+        
+        tumu = list(db.tarama_loglarini_gez(profil_id, parti_boyutu=4))
+        assert len(tumu) == 25 and isinstance(tumu[0], TaramaLogu)
+        assert tumu[0].basarili_mi is True
+        
+        sayfalar, imlec = [], None
+        while True:
+            sayfa = list(db.tarama_loglarini_gez(profil_id, limit=10, imlec=imlec))
+            if not sayfa:
+                break
+            sayfalar.extend(sayfa)
+            imlec = sayfa[-1].imlec
+        assert sayfalar == tumu
+        assert db.tarama_loglarini_al(profil_id) == [log._asdict() for log in tumu]
+    
+    def test_gunluk_tarama_ozetleri(self, tmp_path):
+        """Özetler tekil ve parti yazımlarında güncellenmeli; yeniden oluşturma ham loglarla eşleşmeli."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "ozet.db"))
+        profil_id = db.profil_olustur("ozet", "Özet Profil")
+        db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True)
+        db.qr_tarama_logla(profil_id, "third_party", basarili_mi=False)
+        db.log_yaziciyi_etkinlestir(parti_boyutu=10)
+        for _ in range(3):
+            db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True)
+        db.log_yaziciyi_kapat()
+        
+        bugun = db.baglanti_olustur().execute("SELECT date('now')").fetchone()[0]
+        beklenen = {bugun: {"toplam": 5, "basarili": 4, "basarisiz": 1,
+                            "tarayici_tipleri": {"hoyn_scanner": 4, "third_party": 1}}}
+        assert db.gunluk_tarama_sayilari(profil_id) == beklenen
+        assert db.gunluk_tarama_sayilari() == beklenen
+        
+        # Bozulmuş özetler ham loglardan düzeltilir; ham logu olmayan eski günler korunur
+        conn = db.baglanti_olustur()
+        conn.execute("UPDATE gunluk_taramalar SET tarama_sayisi = 99")
+        conn.execute("INSERT INTO gunluk_taramalar VALUES ('2000-01-01', 'hoyn_scanner', 1, 7)")
+        conn.commit()
+        assert db.tarama_ozetlerini_yeniden_olustur() == 5
+        assert db.gunluk_tarama_sayilari() == beklenen
+        assert conn.execute("SELECT tarama_sayisi FROM gunluk_taramalar WHERE gun = '2000-01-01'").fetchone()[0] == 7
+    
+    def test_profil_onbellegi(self, tmp_path):
+        """Önbellek isabetleri veritabanına inmemeli; güncelleme/devre dışı bırakma anında yansımalı."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "onbellek.db"))
+        onbellek = db.profil_onbellegini_etkinlestir(maks_boyut=2, ttl=60, negatif_ttl=60)
+        profil_id = db.profil_olustur("onbellek", "Eski İsim")
+        
+        with patch.object(db, '_profil_oku', wraps=db._profil_oku) as okuma:
+            assert db.profil_bilgisi_al(profil_id)["isim"] == "Eski İsim"
+            assert db.profil_var_mi(profil_id) == True
+            assert db.profil_var_mi("olmayan-profil") == False
+            assert db.profil_var_mi("olmayan-profil") == False  # Negatif kayıt
+            assert okuma.call_count == 2
+            
+            assert db.profil_guncelle(profil_id, isim="Yeni İsim") == True
+            assert db.profil_bilgisi_al(profil_id)["isim"] == "Yeni İsim"
+            assert db.profil_devre_disi_birak(profil_id) == True
+            assert db.profil_var_mi(profil_id) == False
+            assert okuma.call_count == 4
+        
+        # Dönen kopyayı değiştirmek önbelleği bozmamalı; LRU sınırı korunmalı
+        diger_id = db.profil_olustur("onbellek", "Diğer")
+        db.profil_bilgisi_al(diger_id)["isim"] = "Bozuk"
+        assert db.profil_bilgisi_al(diger_id)["isim"] == "Diğer"
+        istatistik = onbellek.istatistikler()
+        assert istatistik["boyut"] == 2 and istatistik["tahliye"] >= 1
+        assert istatistik["negatif_isabet"] == 1 and istatistik["gecersiz_kilinan"] == 2
+        assert 0 < istatistik["isabet_orani"] < 1
+    
+    def test_tarayici_profil_onbellegi(self):
+        """Tarayıcı profilleri önbellekten çözmeli; devre dışı profil bulunamamalı."""
+        from guvenlik import DogrulamaKodu
+        from veritabani import veritabani_yoneticisi, profil_devre_disi_birak
+        profil_id = profil_olustur("tarayici-onbellek", "Önbellek Profil")
+        kod = sifrelenmis_veri_olustur(profil_id)
+        
+        onceki = veritabani_yoneticisi.profil_onbellegi.istatistikler()["isabet"]
+        assert qr_tara_ve_dogrula(kod)["kod"] is DogrulamaKodu.BASARILI
+        assert qr_tara_ve_dogrula(kod)["profil_bilgisi"]["isim"] == "Önbellek Profil"
+        assert veritabani_yoneticisi.profil_onbellegi.istatistikler()["isabet"] > onceki
+        
+        assert profil_devre_disi_birak(profil_id) == True
+        assert qr_tara_ve_dogrula(kod)["kod"] is DogrulamaKodu.PROFIL_BULUNAMADI
+    
+    def test_aylik_log_bolumleri(self, tmp_path):
+        """Loglar ay bölümlerine yazılmalı, pencereyle örtüşen bölümlerden okunmalı, saklama dosya silmeli."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "bolum.db"))
+        profil_id = db.profil_olustur("bolum", "Bölüm Profil")
+        bolumler = db.log_bolumlemesini_etkinlestir()
+        
+        bu_ay = time.strftime("%Y-%m", time.gmtime())
+        yil, ay = map(int, bu_ay.split("-"))
+        onceki_aylar = [f"{(yil * 12 + ay - 1 - i) // 12:04d}-{(yil * 12 + ay - 1 - i) % 12 + 1:02d}" for i in (2, 1)]
+        conn = db.baglanti_olustur()
+        db.tarama_loglarini_ekle(conn, [(profil_id, "hoyn_scanner", None, None, None, True, f"{a}-01 12:00:00")
+                                        for a in onceki_aylar for _ in range(3)])
+        conn.commit()
+        assert db.qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True) == True
+        assert db.qr_tarama_logla("olmayan-profil", "hoyn_scanner") == False  # Bölümde de yabancı anahtar
+        assert bolumler.aylar() == onceki_aylar + [bu_ay]
+        assert conn.execute("SELECT COUNT(*) FROM qr_tarama_loglari").fetchone()[0] == 0
+        
+        # Keyset sayfalama bölümler arasında kesintisiz; kısa pencere eski bölümleri hiç bağlamaz
+        tumu = list(db.tarama_loglarini_gez(profil_id, son_gun_sayisi=120))
+        assert len(tumu) == 7 and tumu[0].tarama_zamani[:7] == bu_ay
+        assert len({log.log_id for log in tumu}) == 7
+        sayfalar, imlec = [], None
+        while True:
+            sayfa = list(db.tarama_loglarini_gez(profil_id, 120, limit=3, imlec=imlec))
+            if not sayfa:
+                break
+            sayfalar.extend(sayfa)
+            imlec = sayfa[-1].imlec
+        assert sayfalar == tumu
+        
+        # Saklama: en eski ay arşivlenip silinir, özetleri korunur
+        assert db.log_bolumlerini_temizle(2, arsivle=True) == onceki_aylar[:1]
+        assert bolumler.aylar() == onceki_aylar[1:] + [bu_ay]
+        assert len(list(db.tarama_loglarini_gez(profil_id, 120))) == 4
+        assert db.gunluk_tarama_sayilari(profil_id, 120)[f"{onceki_aylar[0]}-01"]["toplam"] == 3
+        arsiv = bolumler.arsivlenmis_bolumu_ac(onceki_aylar[0])
+        assert arsiv.execute("SELECT COUNT(*) FROM qr_tarama_loglari").fetchone()[0] == 3
+        with pytest.raises(sqlite3.OperationalError):
+            arsiv.execute("DELETE FROM qr_tarama_loglari")
+    
+    def test_toplu_profil_aktarimi(self, tmp_path):
+        """CSV/JSONL içe aktarma partiler halinde eklemeli, hatalı satırları raporlamalı; dışa aktarma akmalı."""
+        from toplu_aktarim import profilleri_ice_aktar, profilleri_disa_aktar
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "toplu.db"))
+        csv_dosyasi = tmp_path / "profiller.csv"
+        csv_dosyasi.write_text("kullanici_id,isim,aciklama\n" +
+                               "".join(f"firma,Personel {i},\n" for i in range(5)) +
+                               ",İsimsiz,\nfirma,,boş isim\n", encoding="utf-8")
+        ilerleme = []
+        
+        with patch("builtins.print") as yazdir:
+            rapor = profilleri_ice_aktar(str(csv_dosyasi), parti_boyutu=2, yonetici=db,
+                                         ilerleme=lambda *sayilar: ilerleme.append(sayilar))
+        yazdir.assert_not_called()  # Profil başına çıktı yok
+        assert (rapor.okunan, rapor.eklenen) == (7, 5)
+        assert [(hata.satir_no, hata.hata) for hata in rapor.hatalar] == [(7, "kullanici_id boş"), (8, "isim boş")]
+        assert ilerleme[-1] == (7, 5, 2) and len(ilerleme) == 3
+        assert db.profil_sayisi_al("firma") == 5
+        
+        jsonl_dosyasi = tmp_path / "profiller.jsonl"
+        jsonl_dosyasi.write_text('{"kullanici_id": "ekip", "isim": "Ayşe"}\n{bozuk\n[1]\n', encoding="utf-8")
+        rapor = profilleri_ice_aktar(str(jsonl_dosyasi), yonetici=db)
+        assert rapor.eklenen == 1 and [hata.satir_no for hata in rapor.hatalar] == [2, 3]
+        
+        # Yinelenen profil_id partiyi düşürmez, yalnızca ilgili kayıt raporlanır
+        mevcut = db.profil_olustur("ekip", "Mevcut")
+        hatalar = db.profilleri_toplu_ekle([("yeni-1", "ekip", "Yeni", ""), (mevcut, "ekip", "Kopya", "")])
+        assert [sira for sira, _ in hatalar] == [1] and db.profil_var_mi("yeni-1")
+        
+        cikti = tmp_path / "disa.jsonl"
+        assert profilleri_disa_aktar(str(cikti), kullanici_id="ekip", yonetici=db) == 3
+        satirlar = [json.loads(satir) for satir in cikti.read_text(encoding="utf-8").splitlines()]
+        assert [satir["isim"] for satir in satirlar] == ["Ayşe", "Mevcut", "Yeni"]
+        assert profilleri_disa_aktar(str(tmp_path / "disa.csv"), yonetici=db) == 8
+        with pytest.raises(ValueError):
+            profilleri_disa_aktar(str(tmp_path / "disa.xml"), yonetici=db)
+    
+    def test_kolon_arsivi(self, tmp_path):
+        """Kolonsal arşiv SQLite ile aynı dağılımları vermeli; sütunlar memmap ile okunmalı."""
+        np = pytest.importorskip("numpy")
+        from kolon_arsivi import KolonArsivi, tarama_loglarini_arsivle
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "kolon.db"))
+        profiller = [db.profil_olustur("kolon", f"Profil {i}") for i in range(3)]
+        simdi = time.time()
+        kayitlar = [(profiller[i % 3], ("hoyn_scanner", "third_party")[i % 2], None, None, None, i % 5 != 0,
+                     time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(simdi - i * 3500))) for i in range(101)]
+        conn = db.baglanti_olustur()
+        db.tarama_loglarini_ekle(conn, kayitlar)
+        conn.commit()
+        
+        arsiv = tarama_loglarini_arsivle(str(tmp_path / "arsiv"), 365, db)
+        assert len(arsiv) == 101 and arsiv.zamana_gore_sirali
+        assert isinstance(KolonArsivi(str(tmp_path / "arsiv")).zaman, np.memmap)
+        assert arsiv.zaman.dtype == np.int64 and arsiv.tarayici_kodlari.dtype == np.uint16
+        
+        loglar = db.tarama_loglarini_al(None, 365)
+        saatler = [0] * 24
+        for log in loglar:
+            saatler[int(log["tarama_zamani"][11:13])] += 1
+        assert arsiv.saat_dagilimi().tolist() == saatler
+        assert arsiv.tarayici_dagilimi() == {"hoyn_scanner": 51, "third_party": 50}
+        assert int(arsiv.basarili.sum()) == sum(1 for log in loglar if log["basarili_mi"])
+        assert arsiv.saat_tarayici_tablosu(saat_farki=3).sum(axis=0).tolist() == [51, 50]
+        assert arsiv.tarayici_dagilimi(tarayici_tipi="third_party", basarili_mi=False) == {"third_party": 10}
+        assert sum(sayi for _, sayi in arsiv.en_cok_taranan_profiller()) == 101
+        
+        # Zaman aralığı [baslangic, bitis): sıralı arşivde ikili arama
+        orta = int(arsiv.zaman[50])
+        assert arsiv.saat_dagilimi(baslangic=orta).sum() == 51
+        assert arsiv.saat_dagilimi(bitis=orta).sum() == 50
+        
+        bos = tarama_loglarini_arsivle(str(tmp_path / "bos"), 365, HoynVeritabaniYoneticisi(str(tmp_path / "bos.db")))
+        assert len(bos) == 0 and bos.saat_dagilimi().sum() == 0
+    
+    def test_depolama_arka_uclari(self, tmp_path):
+        """Bellek, tek dosya ve parçalı SQLite arka uçları aynı sözleşmeyi sağlamalı; yardımcılar arka ucu izlemeli."""
+        import veritabani
+        from veritabani import BellekDepolamaArkaUcu, ParcaliSqliteDepolamaArkaUcu, depolama_arka_ucunu_ayarla
+        parcali = ParcaliSqliteDepolamaArkaUcu(str(tmp_path / "parca.db"), parca_sayisi=3)
+        arka_uclar = [BellekDepolamaArkaUcu(), HoynVeritabaniYoneticisi(str(tmp_path / "tek.db")), parcali]
+        
+        for arka_uc in arka_uclar:
+            profiller = [arka_uc.profil_olustur("kullanici", f"Profil {i}") for i in range(6)]
+            for i in range(24):
+                assert arka_uc.qr_tarama_logla(profiller[i % 6], ("hoyn_scanner", "third_party")[i % 2],
+                                               basarili_mi=i % 3 == 0)
+            assert arka_uc.qr_tarama_logla("olmayan-profil", "hoyn_scanner") == False
+            
+            tumu = list(arka_uc.tarama_loglarini_gez(son_gun_sayisi=1))
+            assert len(tumu) == 24 and len({log.log_id for log in tumu}) == 24
+            sayfalar, imlec = [], None
+            while True:
+                sayfa = list(arka_uc.tarama_loglarini_gez(None, 1, limit=5, imlec=imlec))
+                if not sayfa:
+                    break
+                sayfalar.extend(sayfa)
+                imlec = sayfa[-1].imlec
+            assert sayfalar == tumu, arka_uc.ad
+            assert len(arka_uc.tarama_loglarini_al(profiller[1], 1)) == 4
+            
+            gunler = arka_uc.gunluk_tarama_sayilari(None, 1)
+            assert sum(gun["toplam"] for gun in gunler.values()) == 24
+            assert sum(gun["basarili"] for gun in gunler.values()) == 8
+            assert arka_uc.profil_devre_disi_birak(profiller[0]) and not arka_uc.profil_var_mi(profiller[0])
+        
+        # Parçalı: profil ve logları özetle seçilen tek dosyada
+        dagilim = [parca.profil_sayisi_al("kullanici") for parca in parcali.parcalar]
+        assert sum(dagilim) == 5 and parcali.parca_no(profiller[1]) == parcali.parca_no(profiller[1])
+        
+        bellek = BellekDepolamaArkaUcu()
+        onceki = depolama_arka_ucunu_ayarla(bellek)
+        try:
+            profil_id = profil_olustur("kullanici", "Bellek Profil")
+            assert bellek.profil_var_mi(profil_id) and veritabani.tarama_loglarini_al(profil_id) == []
+            sonuc = qr_tara_ve_dogrula(sifrelenmis_qr_payload_olustur(profil_id))
+            assert sonuc["sonuc"] == "basarili" and sonuc["profil_bilgisi"]["isim"] == "Bellek Profil"
+        finally:
+            depolama_arka_ucunu_ayarla(onceki)
+    
+    def test_sorgu_planlari_indeks_kullanir(self, tmp_path):
+        """Log ve profil sayımı sorguları tam tablo taraması ve geçici sıralama yapmamalı."""
+        db = HoynVeritabaniYoneticisi(str(tmp_path / "plan.db"))
+        conn = db.baglanti_olustur()
+        sema = db.log_bolumlemesini_etkinlestir().bagla(conn, "2024-01")
+        beklenen = [
+            (db.tarama_loglari_sorgusu(), "idx_tarama_loglari_zaman"),
+            (db.tarama_loglari_sorgusu("profil-1"), "idx_tarama_loglari_profil_zaman"),
+            (db.tarama_loglari_sorgusu("profil-1", imlec=("2024-01-01 00:00:00", 5), limit=10),
+             "idx_tarama_loglari_profil_zaman"),
+            (db.tarama_loglari_sorgusu("profil-1", limit=10, tablo=f"{sema}.qr_tarama_loglari"),
+             "idx_tarama_loglari_profil_zaman"),
+            (db.profil_sayisi_sorgusu(), "COVERING INDEX idx_profiller_aktif_kullanici"),
+            (db.profil_sayisi_sorgusu("kullanici-1"), "COVERING INDEX idx_profiller_aktif_kullanici"),
+        ]
+        for (sorgu, parametreler), indeks in beklenen:
+            plan = " | ".join(satir[-1] for satir in conn.execute("EXPLAIN QUERY PLAN " + sorgu, parametreler))
+            assert indeks in plan, plan
+            assert "SCAN" not in plan and "TEMP B-TREE" not in plan, plan
+
 class TestUIMesajlari:
     """UI Mesajları modülü testleri."""
     
@@ -329,11 +1374,9 @@ class TestEntegrasyon:
         assert payload["profil_id"] == profil_id
         
         # 5. Tarama simülasyonu
-        mock_db = {"test-profile-1": {"isim": "Entegrasyon Test", "mesaj": "Hoş Geldiniz!"}}
-        with patch('qr_tarayici.PROFIL_VERITABANI', mock_db):
-            sonuc = qr_tara_ve_dogrula(sifrelenmis_payload, tarayici_tipi="hoyn_scanner")
-            assert sonuc["sonuc"] == "basarili"
-            assert "Entegrasyon Test Profiline Hoş Geldiniz!" in sonuc["mesaj"]
+        sonuc = qr_tara_ve_dogrula(sifrelenmis_payload, tarayici_tipi="hoyn_scanner")
+        assert sonuc["sonuc"] == "basarili"
+        assert "Entegrasyon Test Profiline Hoş Geldiniz!" in sonuc["mesaj"]
         
         # 6. Loglama
         log_basari = qr_tarama_logla(profil_id, "hoyn_scanner", basarili_mi=True)
@@ -377,9 +1420,11 @@ class TestMainEntegrasyonu:
         from main import qr_uretme_islemi
         with patch('main.profil_var_mi', return_value=True):
             with patch('main.qr_olustur') as mock_qr_olustur:
-                mock_qr_olustur.return_value = "test_qr_base64_data"
-                qr_base64 = qr_uretme_islemi("valid-profile-id")
-                assert qr_base64 == "test_qr_base64_data"
+                mock_qr_olustur.return_value = b"test_qr_png_data"
+                qr_png = qr_uretme_islemi("valid-profile-id")
+                assert qr_png == b"test_qr_png_data"
+                # CLI ham PNG ister: base64 kodlama/çözme turu yok
+                assert mock_qr_olustur.call_args.kwargs["cikti"] == "png"
 
 # Ana test runner
 if __name__ == "__main__":
@@ -0,0 +1,262 @@
+# Hoyn QR Toplu Profil Aktarım Modülü
+# Bu modül, profilleri CSV veya JSONL dosyalarından toplu içe aktarır ve aynı biçimlerde dışa aktarır.
+# İçe aktarma akış halindedir: satırlar dosyadan tek tek okunur, doğrulanır, her birine UUID üretilir ve
+# parti_boyutu satırlık partiler tek işlemde executemany ile eklenir. Her partiden sonra ilerleme bildirilir;
+# hatalı satırlar atlanır ve satır numarası + nedenle raporlanır.
+# Dışa aktarma profilleri veritabanından fetchmany ile okuyup satır satır yazar (tablo belleğe alınmaz).
+# Komut satırı: python toplu_aktarim.py ice-aktar profiller.csv [--hata-raporu hatalar.csv]
+#               python toplu_aktarim.py disa-aktar profiller.jsonl [--kullanici ID] [--tumu]
+# Gerekli kütüphaneler: csv, json, uuid (standart kütüphane).
+
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Callable, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+import veritabani
+
+# Bir işlemde eklenen profil sayısı
+TOPLU_PARTI_BOYUTU = 1000
+
+# Dosya uzantısı -> biçim
+BICIM_UZANTILARI = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# İçe aktarmada okunan alanlar (diğer sütunlar yok sayılır; profil_id her satır için yeniden üretilir)
+ZORUNLU_ALANLAR = ("kullanici_id", "isim")
+ICE_AKTARILAN_ALANLAR = ZORUNLU_ALANLAR + ("aciklama",)
+
+class SatirHatasi(NamedTuple):
+    """
+    İçe aktarılamayan satır: dosyadaki satır numarası ve neden.
+    """
+    satir_no: int
+    hata: str
+
+class IceAktarmaRaporu(NamedTuple):
+    """
+    Toplu içe aktarma sonucu.
+    """
+    okunan: int
+    eklenen: int
+    hatalar: List[SatirHatasi]
+    sure: float
+
+    @property
+    def hatali(self) -> int:
+        return len(self.hatalar)
+
+def bicim_belirle(dosya: Union[str, TextIO], bicim: str = None) -> str:
+    """
+    Dosya biçimini belirler: verilen bicim ya da dosya uzantısı (.csv, .jsonl, .ndjson).
+    Girdiler: dosya (str yol veya metin dosyası), bicim (str) - "csv" / "jsonl"
+    Çıktı: "csv" veya "jsonl" (belirlenemezse ValueError)
+    """
+    if bicim is None:
+        ad = dosya if isinstance(dosya, str) else getattr(dosya, "name", "")
+        bicim = BICIM_UZANTILARI.get(os.path.splitext(str(ad))[1].lower())
+    if bicim not in BICIM_UZANTILARI.values():
+        raise ValueError(f"Desteklenmeyen dosya biçimi: {bicim or dosya!r} (csv veya jsonl)")
+    return bicim
+
+@contextlib.contextmanager
+def _dosya_ac(dosya: Union[str, TextIO], kip: str) -> Iterator[TextIO]:
+    """
+    Yol verilmişse dosyayı açıp kapatır; açık dosya nesnesini olduğu gibi kullanır.
+    """
+    if not isinstance(dosya, str):
+        yield dosya
+        return
+    # utf-8-sig: Excel'in eklediği BOM başlıkta görünmez
+    with open(dosya, kip, encoding="utf-8-sig" if kip == "r" else "utf-8", newline="") as acik:
+        yield acik
+
+def _satirlari_oku(dosya: TextIO, bicim: str,
+                   zorunlu_alanlar: Tuple[str, ...] = ZORUNLU_ALANLAR) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Satırları akış halinde okur.
+    Çıktı: (satir_no, satır dict veya None, hata mesajı veya None) üreteci
+    """
+    if bicim == "csv":
+        okuyucu = csv.DictReader(dosya)
+        eksik = [alan for alan in zorunlu_alanlar if alan not in (okuyucu.fieldnames or ())]
+        if eksik:
+            raise ValueError(f"CSV başlığında eksik sütun: {', '.join(eksik)}")
+        for satir in okuyucu:
+            yield okuyucu.line_num, satir, None
+        return
+    for satir_no, metin in enumerate(dosya, 1):
+        if not metin.strip():
+            continue
+        try:
+            satir = json.loads(metin)
+        except ValueError as e:
+            yield satir_no, None, f"Geçersiz JSON: {e}"
+            continue
+        if not isinstance(satir, dict):
+            yield satir_no, None, "Satır bir JSON nesnesi değil"
+            continue
+        yield satir_no, satir, None
+
+def satirlari_gez(kaynak: Union[str, TextIO], bicim: str = None,
+                  zorunlu_alanlar: Tuple[str, ...] = ZORUNLU_ALANLAR) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    CSV/JSONL dosyasını satır satır okur (toplu QR üretimi gibi diğer toplu işler için).
+    Girdiler: kaynak (str yol veya metin dosyası), bicim (str) - varsayılan uzantıdan,
+              zorunlu_alanlar (tuple) - CSV başlığında bulunması gereken sütunlar
+    Çıktı: (satir_no, satır dict veya None, hata mesajı veya None) üreteci
+    """
+    bicim = bicim_belirle(kaynak, bicim)
+    with _dosya_ac(kaynak, "r") as dosya:
+        yield from _satirlari_oku(dosya, bicim, zorunlu_alanlar)
+
+def profil_kaydi_olustur(satir: dict) -> Tuple[str, str, str, str]:
+    """
+    Satırı doğrular ve yeni UUID ile ekleme kaydına çevirir.
+    Girdiler: satir (dict) - kullanici_id, isim (zorunlu), aciklama (opsiyonel)
+    Çıktı: (profil_id, kullanici_id, isim, aciklama); geçersizse ValueError
+    """
+    degerler = {}
+    for alan in ICE_AKTARILAN_ALANLAR:
+        deger = satir.get(alan)
+        if deger is None:
+            deger = ""
+        if not isinstance(deger, str):
+            raise ValueError(f"{alan} metin olmalı")
+        degerler[alan] = deger.strip()
+    for alan in ZORUNLU_ALANLAR:
+        if not degerler[alan]:
+            raise ValueError(f"{alan} boş")
+    return str(uuid.uuid4()), degerler["kullanici_id"], degerler["isim"], degerler["aciklama"]
+
+def profilleri_ice_aktar(kaynak: Union[str, TextIO], bicim: str = None, parti_boyutu: int = TOPLU_PARTI_BOYUTU,
+                         ilerleme: Callable[[int, int, int], None] = None,
+                         yonetici: "veritabani.HoynVeritabaniYoneticisi" = None) -> IceAktarmaRaporu:
+    """
+    CSV/JSONL dosyasındaki profilleri partiler halinde ekler; hatalı satırlar diğerlerini durdurmaz.
+    Girdiler: kaynak (str yol veya metin dosyası), bicim (str) - varsayılan uzantıdan,
+              parti_boyutu (int) - işlem başına satır, ilerleme (Callable) - her partiden sonra
+              (okunan, eklenen, hatali) ile çağrılır, yonetici - varsayılan global veritabanı yöneticisi
+    Çıktı: IceAktarmaRaporu
+    """
+    yonetici = veritabani.veritabani_yoneticisi if yonetici is None else yonetici
+    bicim = bicim_belirle(kaynak, bicim)
+    baslangic = time.perf_counter()
+    okunan = eklenen = 0
+    hatalar: List[SatirHatasi] = []
+    parti: List[tuple] = []
+    parti_satirlari: List[int] = []
+
+    def partiyi_yaz() -> None:
+        nonlocal eklenen
+        eklenemeyen = yonetici.profilleri_toplu_ekle(parti)
+        hatalar.extend(SatirHatasi(parti_satirlari[sira], hata) for sira, hata in eklenemeyen)
+        eklenen += len(parti) - len(eklenemeyen)
+        parti.clear()
+        parti_satirlari.clear()
+        if ilerleme is not None:
+            ilerleme(okunan, eklenen, len(hatalar))
+
+    with _dosya_ac(kaynak, "r") as dosya:
+        for satir_no, satir, hata in _satirlari_oku(dosya, bicim):
+            okunan += 1
+            if hata is None:
+                try:
+                    parti.append(profil_kaydi_olustur(satir))
+                    parti_satirlari.append(satir_no)
+                except ValueError as e:
+                    hata = str(e)
+            if hata is not None:
+                hatalar.append(SatirHatasi(satir_no, hata))
+            if len(parti) >= parti_boyutu:
+                partiyi_yaz()
+        if parti:
+            partiyi_yaz()
+    return IceAktarmaRaporu(okunan, eklenen, sorted(hatalar), time.perf_counter() - baslangic)
+
+def hata_raporunu_yaz(rapor: IceAktarmaRaporu, hedef: Union[str, TextIO]) -> None:
+    """
+    Hatalı satırları CSV olarak yazar (satir_no, hata).
+    Girdiler: rapor (IceAktarmaRaporu), hedef (str yol veya metin dosyası)
+    """
+    with _dosya_ac(hedef, "w") as dosya:
+        yazici = csv.writer(dosya)
+        yazici.writerow(SatirHatasi._fields)
+        yazici.writerows(rapor.hatalar)
+
+def profilleri_disa_aktar(hedef: Union[str, TextIO], bicim: str = None, kullanici_id: str = None,
+                          sadece_aktif: bool = True,
+                          yonetici: "veritabani.HoynVeritabaniYoneticisi" = None) -> int:
+    """
+    Profilleri akış halinde CSV/JSONL olarak yazar.
+    Girdiler: hedef (str yol veya metin dosyası), bicim (str) - varsayılan uzantıdan,
+              kullanici_id (str) - yalnızca bu kullanıcının profilleri, sadece_aktif (bool),
+              yonetici - varsayılan global veritabanı yöneticisi
+    Çıktı: Yazılan profil sayısı (int)
+    """
+    yonetici = veritabani.veritabani_yoneticisi if yonetici is None else yonetici
+    bicim = bicim_belirle(hedef, bicim)
+    yazilan = 0
+    with _dosya_ac(hedef, "w") as dosya:
+        profiller = yonetici.profilleri_gez(kullanici_id, sadece_aktif)
+        if bicim == "csv":
+            yazici = csv.DictWriter(dosya, fieldnames=veritabani.PROFIL_SUTUNLARI)
+            yazici.writeheader()
+            for profil in profiller:
+                yazici.writerow(profil)
+                yazilan += 1
+        else:
+            for profil in profiller:
+                dosya.write(json.dumps(profil, ensure_ascii=False) + "\n")
+                yazilan += 1
+    return yazilan
+
+def ilerleme_yazdir(okunan: int, eklenen: int, hatali: int) -> None:
+    """
+    İlerlemeyi tek satırda günceller (komut satırı ve main.py için).
+    """
+    print(f"\r   ⏳ Okunan: {okunan}  Eklenen: {eklenen}  Hatalı: {hatali}", end="", flush=True)
+
+def komut_satiri_calistir(argumanlar: List[str]) -> int:
+    """
+    Toplu aktarım komutları: ice-aktar DOSYA [--hata-raporu YOL] | disa-aktar DOSYA [--kullanici ID] [--tumu].
+    DOSYA "-" ise standart girdi/çıktı kullanılır (--bicim gerekir).
+    Girdiler: argumanlar (list) - sys.argv[1:]
+    Çıktı: Çıkış kodu (int): hatalı satır varsa 1
+    """
+    import argparse
+    ayristirici = argparse.ArgumentParser(prog="toplu_aktarim.py", description="Hoyn QR toplu profil aktarımı")
+    ayristirici.add_argument("komut", choices=["ice-aktar", "disa-aktar"])
+    ayristirici.add_argument("dosya", help="CSV/JSONL dosyası ('-': standart girdi/çıktı)")
+    ayristirici.add_argument("--bicim", choices=sorted(set(BICIM_UZANTILARI.values())))
+    ayristirici.add_argument("--parti-boyutu", type=int, default=TOPLU_PARTI_BOYUTU)
+    ayristirici.add_argument("--hata-raporu", help="Hatalı satırların yazılacağı CSV (ice-aktar)")
+    ayristirici.add_argument("--kullanici", help="Yalnızca bu kullanıcının profilleri (disa-aktar)")
+    ayristirici.add_argument("--tumu", action="store_true", help="Devre dışı profilleri de yaz (disa-aktar)")
+    ayristirici.add_argument("--db", default=veritabani.VERITABANI_DOSYASI, help="Veritabanı dosyası")
+    secenekler = ayristirici.parse_args(argumanlar)
+
+    with contextlib.redirect_stdout(sys.stderr):  # Tablo oluşturma çıktısı disa-aktar çıktısına karışmasın
+        yonetici = veritabani.HoynVeritabaniYoneticisi(secenekler.db)
+    if secenekler.komut == "disa-aktar":
+        hedef = sys.stdout if secenekler.dosya == "-" else secenekler.dosya
+        yazilan = profilleri_disa_aktar(hedef, secenekler.bicim, secenekler.kullanici, not secenekler.tumu,
+                                        yonetici)
+        print(f"📤 {yazilan} profil dışa aktarıldı.", file=sys.stderr)
+        return 0
+
+    kaynak = sys.stdin if secenekler.dosya == "-" else secenekler.dosya
+    rapor = profilleri_ice_aktar(kaynak, secenekler.bicim, secenekler.parti_boyutu, ilerleme_yazdir, yonetici)
+    print(f"\n📥 {rapor.eklenen}/{rapor.okunan} profil içe aktarıldı ({rapor.sure:.2f} sn), {rapor.hatali} hatalı satır.")
+    for hata in rapor.hatalar[:10]:
+        print(f"   ❌ Satır {hata.satir_no}: {hata.hata}")
+    if secenekler.hata_raporu:
+        hata_raporunu_yaz(rapor, secenekler.hata_raporu)
+        print(f"   Hata raporu: {secenekler.hata_raporu}")
+    return 1 if rapor.hatalar else 0
+
+if __name__ == "__main__":
+    sys.exit(komut_satiri_calistir(sys.argv[1:]))
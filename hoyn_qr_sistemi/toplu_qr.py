@@ -0,0 +1,267 @@
+# Hoyn QR Toplu QR Üretim Modülü
+# Bu modül, çok sayıda profil için (ör. bir etkinliğin yaka kartları) QR resimlerini süreç havuzunda üretir.
+# Payload'lar ana süreçte şifrelenir; QR matrisi ve PNG çizimi (işin pahalı kısmı) parçalar halinde işçi
+# süreçlere dağıtılır. En fazla isci_sayisi * 2 parça aynı anda bekler ve sonuçlar geldikçe doğrudan ZIP
+# arşivine veya çıktı dizinine yazılır; bellek kullanımı iş sayısından bağımsızdır.
+# Her iş kendi stil seçeneklerini taşır; hatalı işler (geçersiz profil ID, renk, dosya adı) diğerlerini
+# durdurmaz ve sıra numarası + nedenle raporlanır.
+# Komut satırı: python toplu_qr.py isler.csv rozetler.zip [--isci 4] [--profil etiket] [--hata-raporu hatalar.csv]
+# Gerekli kütüphaneler: concurrent.futures, zipfile, itertools (standart kütüphane) + qr_uretici.
+
+import contextlib
+import itertools
+import os
+import sys
+import time
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+from qr_uretici import CIZIM_PROFILLERI, qr_resmi_uret, sifrelenmis_veri_olustur
+from toplu_aktarim import SatirHatasi, hata_raporunu_yaz, satirlari_gez
+
+# İşçiye tek seferde gönderilen QR sayısı
+TOPLU_QR_PARCA_BOYUTU = 32
+
+# İş dosyasında (CSV/JSONL) okunan sütunlar
+QR_ZORUNLU_ALANLAR = ("profil_id",)
+_DOGRU_DEGERLER = {"1", "true", "evet", "e", "yes", "y"}
+_YANLIS_DEGERLER = {"", "0", "false", "hayir", "hayır", "h", "no", "n"}
+
+class QRIsi(NamedTuple):
+    """
+    Tek bir QR resminin profil ID'si, stil seçenekleri ve çıktı dosya adı (varsayılan <profil_id>.png).
+    """
+    profil_id: str
+    arka_renk: str = "#FFFFFF"
+    on_plan_renk: str = "#000000"
+    logo_ekle: bool = False
+    ai_tasarim_modu: bool = False
+    sistem_kimligi: str = "HOYN_QR_V1"
+    dosya_adi: Optional[str] = None
+    profil: Optional[str] = None
+
+class TopluQRRaporu(NamedTuple):
+    """
+    Toplu QR üretimi sonucu; hatalar toplu_aktarim.hata_raporunu_yaz ile yazılabilir.
+    """
+    okunan: int
+    uretilen: int
+    hatalar: List[SatirHatasi]
+    sure: float
+
+    @property
+    def hatali(self) -> int:
+        return len(self.hatalar)
+
+def _mantiksal(deger: Union[str, bool, int, None], alan: str) -> bool:
+    if isinstance(deger, (bool, int)):
+        return bool(deger)
+    metin = (deger or "").strip().lower()
+    if metin in _DOGRU_DEGERLER:
+        return True
+    if metin in _YANLIS_DEGERLER:
+        return False
+    raise ValueError(f"{alan} evet/hayır olmalı: {deger!r}")
+
+def qr_isi_olustur(is_: Union[str, dict, QRIsi]) -> QRIsi:
+    """
+    Profil ID'sini, sözlüğü (CSV/JSONL satırı) veya QRIsi'ni doğrulanmış QRIsi'ne çevirir.
+    Boş veya eksik stil alanları varsayılanları alır; dosya adı dizin içermemelidir.
+    Girdiler: is_ (str, dict veya QRIsi)
+    Çıktı: QRIsi; geçersizse ValueError
+    """
+    if isinstance(is_, str):
+        is_ = QRIsi(is_)
+    elif isinstance(is_, dict):
+        alanlar = {}
+        for alan, varsayilan in QRIsi._field_defaults.items():
+            deger = is_.get(alan)
+            if deger is None or deger == "":
+                continue
+            alanlar[alan] = _mantiksal(deger, alan) if isinstance(varsayilan, bool) else deger
+        is_ = QRIsi(is_.get("profil_id"), **alanlar)
+    elif not isinstance(is_, QRIsi):
+        raise ValueError(f"Geçersiz QR işi: {is_!r}")
+
+    for alan in ("profil_id", "arka_renk", "on_plan_renk", "sistem_kimligi"):
+        if not isinstance(getattr(is_, alan), str) or not getattr(is_, alan).strip():
+            raise ValueError(f"{alan} boş veya metin değil")
+    if is_.profil is not None and is_.profil not in CIZIM_PROFILLERI:
+        raise ValueError(f"Bilinmeyen çizim profili: {is_.profil!r}")
+    dosya_adi = is_.dosya_adi or f"{is_.profil_id.strip()}.png"
+    if (not isinstance(dosya_adi, str) or os.path.basename(dosya_adi) != dosya_adi
+            or "/" in dosya_adi or dosya_adi in (".", "..")):
+        raise ValueError(f"Geçersiz dosya adı: {dosya_adi!r}")
+    return is_._replace(profil_id=is_.profil_id.strip(), dosya_adi=dosya_adi)
+
+def _qr_parcasi_ciz(parca: List[Tuple[int, str, dict]]) -> List[Tuple[int, Optional[bytes], Optional[str]]]:
+    """
+    İşçi süreçte bir parçanın QR resimlerini çizer (hatalar iş başına yakalanır).
+    Girdiler: parca - (no, sifrelenmis_veri, qr_resmi_uret stil argümanları) listesi
+    Çıktı: (no, PNG baytları veya None, hata veya None) listesi
+    """
+    sonuclar = []
+    for no, sifrelenmis_veri, stil in parca:
+        try:
+            sonuclar.append((no, qr_resmi_uret(sifrelenmis_veri, **stil), None))
+        except Exception as e:
+            sonuclar.append((no, None, f"QR çizilemedi: {e}"))
+    return sonuclar
+
+@contextlib.contextmanager
+def _hedef_ac(hedef: str) -> Iterator[Callable[[str, bytes], None]]:
+    """
+    Hedef .zip ile bitiyorsa ZIP arşivine, değilse dizine yazan (dosya_adi, png) fonksiyonunu verir.
+    PNG zaten sıkıştırılmış olduğundan arşiv girdileri ZIP_STORED yazılır.
+    """
+    if hedef.lower().endswith(".zip"):
+        with zipfile.ZipFile(hedef, "w", zipfile.ZIP_STORED) as arsiv:
+            yield arsiv.writestr
+        return
+    os.makedirs(hedef, exist_ok=True)
+
+    def dosyaya_yaz(dosya_adi: str, png: bytes) -> None:
+        with open(os.path.join(hedef, dosya_adi), "wb") as dosya:
+            dosya.write(png)
+
+    yield dosyaya_yaz
+
+def _numarali_islerden_uret(numarali_isler: Iterable[Tuple[int, object, Optional[str]]], hedef: str,
+                            isci_sayisi: Optional[int], parca_boyutu: int,
+                            ilerleme: Optional[Callable[[int, int, int], None]],
+                            profil: Optional[str]) -> TopluQRRaporu:
+    """
+    (no, iş, okuma hatası) üçlülerini üretir ve hedefe yazar (toplu_qr_uret ve dosyadan_toplu_qr_uret ortak gövdesi).
+    """
+    if profil is not None and profil not in CIZIM_PROFILLERI:
+        raise ValueError(f"Bilinmeyen çizim profili: {profil!r} ({', '.join(CIZIM_PROFILLERI)})")
+    isci_sayisi = (os.cpu_count() or 1) if isci_sayisi is None else isci_sayisi
+    baslangic = time.perf_counter()
+    okunan = uretilen = 0
+    hatalar: List[SatirHatasi] = []
+    # Parçada bekleyen işlerin dosya adları (sonuç geldiğinde yazmak için)
+    dosya_adlari: Dict[int, Tuple[str, str]] = {}
+    kullanilan_adlar = set()
+
+    def hazirla() -> Iterator[Tuple[int, str, dict]]:
+        nonlocal okunan
+        for no, is_, hata in numarali_isler:
+            okunan += 1
+            profil_id = is_.get("profil_id") if isinstance(is_, dict) else getattr(is_, "profil_id", is_)
+            if hata is None:
+                try:
+                    is_ = qr_isi_olustur(is_)
+                    if is_.profil is None:
+                        is_ = is_._replace(profil=profil)
+                    if is_.dosya_adi in kullanilan_adlar:
+                        raise ValueError(f"Yinelenen dosya adı: {is_.dosya_adi}")
+                    sifrelenmis_veri = sifrelenmis_veri_olustur(is_.profil_id, is_.sistem_kimligi)
+                except (ValueError, TypeError) as e:
+                    hata = str(e)
+            if hata is not None:
+                hatalar.append(SatirHatasi(no, f"{profil_id}: {hata}" if profil_id and isinstance(profil_id, str) else hata))
+                continue
+            kullanilan_adlar.add(is_.dosya_adi)
+            dosya_adlari[no] = (is_.profil_id, is_.dosya_adi)
+            yield no, sifrelenmis_veri, dict(arka_renk=is_.arka_renk, on_plan_renk=is_.on_plan_renk,
+                                             logo_ekle=is_.logo_ekle, ai_tasarim_modu=is_.ai_tasarim_modu,
+                                             profil=is_.profil)
+
+    hazir = hazirla()
+    parcalar = iter(lambda: list(itertools.islice(hazir, parca_boyutu)), [])
+
+    with _hedef_ac(hedef) as yaz:
+        def sonuclari_yaz(sonuclar: List[Tuple[int, Optional[bytes], Optional[str]]]) -> None:
+            nonlocal uretilen
+            for no, png, hata in sonuclar:
+                profil_id, dosya_adi = dosya_adlari.pop(no)
+                if png is None:
+                    hatalar.append(SatirHatasi(no, f"{profil_id}: {hata}"))
+                    continue
+                yaz(dosya_adi, png)
+                uretilen += 1
+            if ilerleme is not None:
+                ilerleme(okunan, uretilen, len(hatalar))
+
+        if isci_sayisi <= 0:
+            for parca in parcalar:
+                sonuclari_yaz(_qr_parcasi_ciz(parca))
+        else:
+            # Süreç havuzu: toplu_payload_olustur gibi kayan pencere, sıra korunur
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+                bekleyenler = []
+                for parca in parcalar:
+                    bekleyenler.append(havuz.submit(_qr_parcasi_ciz, parca))
+                    if len(bekleyenler) >= isci_sayisi * 2:
+                        sonuclari_yaz(bekleyenler.pop(0).result())
+                for gelecek in bekleyenler:
+                    sonuclari_yaz(gelecek.result())
+    return TopluQRRaporu(okunan, uretilen, sorted(hatalar), time.perf_counter() - baslangic)
+
+def toplu_qr_uret(isler: Iterable[Union[str, dict, QRIsi]], hedef: str, isci_sayisi: int = None,
+                  parca_boyutu: int = TOPLU_QR_PARCA_BOYUTU,
+                  ilerleme: Callable[[int, int, int], None] = None, profil: str = None) -> TopluQRRaporu:
+    """
+    QR resimlerini süreç havuzunda üretir ve akış halinde ZIP arşivine ya da dizine yazar.
+    Girdiler: isler (Iterable) - profil ID'leri, sözlükler veya QRIsi'ler (tembel okunur),
+              hedef (str) - .zip dosyası veya dizin, isci_sayisi (int) - None ise CPU sayısı, 0 ise aynı süreç,
+              parca_boyutu (int) - işçiye gönderilen QR sayısı,
+              ilerleme (Callable) - her parçadan sonra (okunan, uretilen, hatali) ile çağrılır,
+              profil (str) - kendi profili olmayan işlerin çizim profili (qr_uretici.CIZIM_PROFILLERI)
+    Çıktı: TopluQRRaporu (hata satir_no'ları 1'den başlayan iş sırasıdır)
+    """
+    return _numarali_islerden_uret(((no, is_, None) for no, is_ in enumerate(isler, 1)), hedef,
+                                   isci_sayisi, parca_boyutu, ilerleme, profil)
+
+def dosyadan_toplu_qr_uret(kaynak: Union[str, TextIO], hedef: str, bicim: str = None, isci_sayisi: int = None,
+                           parca_boyutu: int = TOPLU_QR_PARCA_BOYUTU,
+                           ilerleme: Callable[[int, int, int], None] = None, profil: str = None) -> TopluQRRaporu:
+    """
+    CSV/JSONL iş dosyasından QR üretir. Sütunlar: profil_id (zorunlu), arka_renk, on_plan_renk, logo_ekle,
+    ai_tasarim_modu, sistem_kimligi, dosya_adi, profil (boş olanlar varsayılanı alır).
+    Girdiler: kaynak (str yol veya metin dosyası), hedef (str), bicim (str) - varsayılan uzantıdan,
+              isci_sayisi (int), parca_boyutu (int), ilerleme (Callable), profil (str) - varsayılan çizim profili
+    Çıktı: TopluQRRaporu (hata satir_no'ları dosyadaki satır numaralarıdır)
+    """
+    return _numarali_islerden_uret(satirlari_gez(kaynak, bicim, QR_ZORUNLU_ALANLAR), hedef,
+                                   isci_sayisi, parca_boyutu, ilerleme, profil)
+
+def ilerleme_yazdir(okunan: int, uretilen: int, hatali: int) -> None:
+    """
+    İlerlemeyi tek satırda günceller (komut satırı ve main.py için).
+    """
+    print(f"\r   ⏳ Okunan: {okunan}  Üretilen: {uretilen}  Hatalı: {hatali}", end="", flush=True)
+
+def komut_satiri_calistir(argumanlar: List[str]) -> int:
+    """
+    Toplu QR komutu: ISLER HEDEF [--isci N] [--parca-boyutu N] [--profil AD] [--hata-raporu YOL].
+    ISLER "-" ise standart girdi kullanılır (--bicim gerekir).
+    Girdiler: argumanlar (list) - sys.argv[1:]
+    Çıktı: Çıkış kodu (int): hatalı iş varsa 1
+    """
+    import argparse
+    ayristirici = argparse.ArgumentParser(prog="toplu_qr.py", description="Hoyn QR toplu QR üretimi")
+    ayristirici.add_argument("isler", help="profil_id ve stil sütunlu CSV/JSONL ('-': standart girdi)")
+    ayristirici.add_argument("hedef", help="ZIP arşivi (.zip) veya çıktı dizini")
+    ayristirici.add_argument("--bicim", choices=["csv", "jsonl"])
+    ayristirici.add_argument("--isci", type=int, default=None, help="İşçi süreç sayısı (varsayılan: CPU sayısı)")
+    ayristirici.add_argument("--parca-boyutu", type=int, default=TOPLU_QR_PARCA_BOYUTU)
+    ayristirici.add_argument("--profil", choices=sorted(CIZIM_PROFILLERI),
+                             help="profil sütunu boş olan işlerin çizim profili")
+    ayristirici.add_argument("--hata-raporu", help="Hatalı işlerin yazılacağı CSV")
+    secenekler = ayristirici.parse_args(argumanlar)
+
+    kaynak = sys.stdin if secenekler.isler == "-" else secenekler.isler
+    rapor = dosyadan_toplu_qr_uret(kaynak, secenekler.hedef, secenekler.bicim, secenekler.isci,
+                                   secenekler.parca_boyutu, ilerleme_yazdir, secenekler.profil)
+    print(f"\n🖨️ {rapor.uretilen}/{rapor.okunan} QR üretildi ({rapor.sure:.2f} sn), {rapor.hatali} hatalı iş.")
+    for hata in rapor.hatalar[:10]:
+        print(f"   ❌ Satır {hata.satir_no}: {hata.hata}")
+    if secenekler.hata_raporu:
+        hata_raporunu_yaz(rapor, secenekler.hata_raporu)
+        print(f"   Hata raporu: {secenekler.hata_raporu}")
+    return 1 if rapor.hatalar else 0
+
+if __name__ == "__main__":
+    sys.exit(komut_satiri_calistir(sys.argv[1:]))
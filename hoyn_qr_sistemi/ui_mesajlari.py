@@ -7,6 +7,20 @@
 import string
 from typing import Dict, Callable, Any
 
+# Tarama hattı sonuç kodları (guvenlik.DogrulamaKodu değerleri) -> mesaj ID'leri
+TARAMA_KODU_MESAJLARI = {
+    "BASARILI": "QR_TARAMA_BASARILI",
+    "HOYN_DEGIL": "NON_HOY_N_QR_UYARI",
+    "SIFRE_COZME_HATASI": "SIFRE_COZME_HATASI",
+    "SISTEM_KIMLIGI_UYUMSUZ": "SISTEM_KIMLIGI_UYUMSUZ",
+    "ANAHTAR_BILINMIYOR": "ANAHTAR_KIMLIGI_BILINMIYOR",
+    "HASH_GECERSIZ": "HASH_DOGRULAMA_BASARISIZ",
+    "SURE_DOLMUS": "QR_SURE_DOLMU",
+    "TEKRAR_OYNATMA": "TEKRAR_OYNATMA_TESPIT",
+    "PROFIL_BULUNAMADI": "PROFIL_BULUNAMADI",
+    "UCUNCU_PARTI": "UCUNCU_PARTI_UYARI",
+}
+
 class HoynUIMesajlari:
     """
     Hoyn QR sistemi için Türkçe UI mesajları yöneticisi.
@@ -55,6 +69,8 @@ class HoynUIMesajlari:
             "SIFRE_COZME_HATASI": "🔐 QR kodu şifresi çözülemedi. Veri bozulmuş olabilir.",
             "HASH_DOGRULAMA_BASARISIZ": "🔐 QR kodu doğrulanamadı. Veri manipüle edilmiş olabilir.",
             "SISTEM_KIMLIGI_UYUMSUZ": "⚠️ Bu bir Hoyn QR kodu değil. Sistem kimliği uyumsuz.",
+            "ANAHTAR_KIMLIGI_BILINMIYOR": "🔐 QR kodu tanınmayan bir anahtarla oluşturulmuş. Lütfen yeni bir QR oluşturun.",
+            "TEKRAR_OYNATMA_TESPIT": "🔁 Bu QR kodu daha önce kullanılmış. Lütfen yeni bir tane oluşturun.",
             
             # Genel hata mesajları
             "BILINMEYEN_HATA": "❌ Bilinmeyen bir hata oluştu. Lütfen tekrar deneyin.",
@@ -129,6 +145,16 @@ class HoynUIMesajlari:
         else:
             return self.mesaj_sozlugu["BILINMEYEN_HATA"]
     
+    def tarama_kodu_mesaji(self, kod: str, profil_bilgisi: Dict = None) -> str:
+        """
+        Tarama hattının sonuç koduna göre mesaj döndürür (başarıda profil hoş geldin mesajı).
+        Girdiler: kod (str veya DogrulamaKodu), profil_bilgisi (Dict)
+        Çıktı: Uygun Türkçe mesaj
+        """
+        if kod == "BASARILI" and profil_bilgisi:
+            return self.profil_hos_geldin_mesaji(profil_bilgisi.get("isim", "Kullanıcı"))
+        return self.mesaj_al(TARAMA_KODU_MESAJLARI.get(kod, "BILINMEYEN_HATA"))
+    
     def ucuncu_parti_tarama_mesaji(self, tarayici_adi: str = "bu tarayıcı") -> str:
         """
         Üçüncü parti tarayıcı için uyarı mesajı oluşturur.
@@ -171,6 +197,12 @@ def qr_tarama_sonucu(sonuc: str, profil_bilgisi: Dict = None) -> str:
     """
     return ui_mesajlari.qr_tarama_sonuc_mesaji(sonuc, profil_bilgisi)
 
+def tarama_kodu_mesaji(kod: str, profil_bilgisi: Dict = None) -> str:
+    """
+    Tarama sonuç kodu mesajı (kısa kullanım).
+    """
+    return ui_mesajlari.tarama_kodu_mesaji(kod, profil_bilgisi)
+
 def hata_mesaji(hata_tipi: str, ek_bilgi: str = "") -> str:
     """
     Hata mesajı oluşturur (kısa kullanım).
@@ -1,108 +1,440 @@
 # Hoyn QR Veritabanı Modülü
 # Bu modül, profil ve QR tarama kayıtlarını SQLite veritabanında yönetir.
 # Şifrelenmiş profil verileri ve tarama logları saklar.
-# Gerekli kütüphaneler: sqlite3, datetime, uuid, json.
+# Her iş parçacığı kalıcı bir bağlantı kullanır (WAL günlük kipi, meşgul zaman aşımı, önbellekli hazır ifadeler).
+# Opsiyonel arka plan log yazıcısı (log_yaziciyi_etkinlestir): tarama logları bellekte sınırlı bir kuyrukta
+# biriktirilir ve boyut/süre eşiğinde tek işlemde executemany ile yazılır.
+# Günlük tarama özetleri (gunluk_profil_taramalari, gunluk_taramalar) tetikleyiciyle güncel tutulur;
+# yeniden hesaplama: python veritabani.py ozetleri-yeniden-olustur.
+# Profil aramaları okuma üzerinden önbelleklidir (ProfilOnbellegi: LRU + TTL, bilinmeyen kimlikler için negatif
+# kayıt); bu süreçteki oluşturma/güncelleme/devre dışı bırakma ilgili kaydı anında geçersiz kılar.
+# Opsiyonel aylık log bölümleri (log_bolumlemesini_etkinlestir): tarama logları ay başına ayrı SQLite
+# dosyalarına yazılır ve gerektiğinde ATTACH edilir; saklama, dosyayı (isteğe bağlı arşivleyip) silmektir.
+# Depolama arka ucu arayüzü (DepolamaArkaUcu): yardımcı fonksiyonlar depolama_arka_ucu() üzerinden çalışır;
+# tek dosya SQLite (varsayılan), bellek içi (testler/ölçümler) ve profil_id özetiyle parçalı SQLite arka uçları.
+# Şema sürümlüdür: SEMA_GOCLERI sırayla uygulanır, uygulanan sürüm PRAGMA user_version'da tutulur.
+# İçe aktarma yan etkisizdir: global yönetici (bağlantı + tablo oluşturma) ilk kullanımda kurulur.
+# Gerekli kütüphaneler: sqlite3, datetime, uuid.
 # Kurulum: Python standart kütüphanesi (sqlite3 dahili)
 
 import sqlite3
-import json
+import atexit
+import heapq
+import itertools
+import time
+import zlib
 from datetime import datetime
 import uuid
 import os
-from typing import Dict, List, Optional, Tuple
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from tembel import TembelTekil
 
 # Veritabanı dosya yolu
 VERITABANI_DOSYASI = "hoyn_qr_veritabani.db"
 
-class HoynVeritabaniYoneticisi:
+# Bağlantı ayarları
+MESGUL_ZAMAN_ASIMI = 5.0  # saniye: başka bir yazıcı kilidi tutarken bekleme süresi
+ONBELLEKLI_IFADE_SAYISI = 256  # bağlantı başına hazır ifade önbelleği
+
+# Tarama logu ekleme ifadesi (tarama_zamani kayıt anında, UTC, CURRENT_TIMESTAMP biçiminde)
+TARAMA_LOGU_EKLE = """
+    INSERT INTO {tablo}
+    (profil_id, tarayici_tipi, user_agent, ip_adresi, coğrafi_konum, basarili_mi, tarama_zamani)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+""".format(tablo="qr_tarama_loglari")
+
+# Profil ekleme ifadesi (profil_olustur ve toplu ekleme) ve dışa aktarılan profil sütunları
+PROFIL_EKLE = """
+    INSERT INTO profiller (profil_id, kullanici_id, isim, aciklama)
+    VALUES (?, ?, ?, ?)
+"""
+PROFIL_SUTUNLARI = ("profil_id", "kullanici_id", "isim", "aciklama", "olusturma_zamani", "aktif_mi")
+
+# Log yazıcısı kuyruğu dolduğunda: engelle (engelleme_suresi kadar bekle, sonra at),
+# yeniyi_at (yeni kaydı reddet), eskiyi_at (en eski kaydı çıkar, yenisini ekle)
+TASMA_POLITIKALARI = ("engelle", "yeniyi_at", "eskiyi_at")
+
+def indeks_olustur(ad: str, tablo: str, sutunlar: Tuple[str, ...], kosul: str = None) -> str:
+    """
+    Göç adımı: indeks oluşturma ifadesi (IF NOT EXISTS; tekrar çalıştırılabilir).
+    Girdiler: ad (str), tablo (str), sutunlar (tuple), kosul (str) - opsiyonel kısmi indeks WHERE koşulu
+    Çıktı: SQL ifadesi (str)
+    """
+    ifade = f"CREATE INDEX IF NOT EXISTS {ad} ON {tablo} ({', '.join(sutunlar)})"
+    if kosul:
+        ifade += f" WHERE {kosul}"
+    return ifade
+
+def sutun_ekle(tablo: str, sutun: str, tanim: str) -> Callable[[sqlite3.Connection], None]:
+    """
+    Göç adımı: sütun yoksa ekler (ALTER TABLE ... ADD COLUMN tek başına tekrar çalıştırılamaz).
+    Girdiler: tablo (str), sutun (str), tanim (str) - ör. "TEXT DEFAULT ''"
+    Çıktı: Bağlantı alan göç adımı fonksiyonu
+    """
+    def adim(conn: sqlite3.Connection) -> None:
+        mevcut = {satir[1] for satir in conn.execute(f"PRAGMA table_info({tablo})")}
+        if sutun not in mevcut:
+            conn.execute(f"ALTER TABLE {tablo} ADD COLUMN {sutun} {tanim}")
+    return adim
+
+# Günlük tarama özetleri: profil başına ve tüm sistem için (gün, tarayici_tipi, basarili_mi) kovaları.
+# Ham loglarla aynı işlemde tetikleyiciyle güncellenir; ham log silinince (saklama) özetler korunur.
+OZET_TABLOLARI = ("gunluk_profil_taramalari", "gunluk_taramalar")
+
+def _ozetleri_doldur(conn: sqlite3.Connection, baslangic_gunu: str, bitis_gunu: str,
+                     kaynak: str = "qr_tarama_loglari") -> None:
+    """
+    Göç/yeniden oluşturma adımı: [baslangic_gunu, bitis_gunu] aralığındaki ham loglardan özet satırlarını ekler.
+    Aynı gün birden çok kaynakta (ana tablo + log bölümü) olabileceğinden mevcut kovaya eklenir.
+    Girdiler: conn (sqlite3.Connection), baslangic_gunu (str), bitis_gunu (str) - YYYY-MM-DD,
+              kaynak (str) - ham log tablosu (ör. bolum_2024_01.qr_tarama_loglari)
+    """
+    aralik = "WHERE tarama_zamani >= ? AND date(tarama_zamani) <= ?"  # Alt sınır indeks aralığını daraltır
+    conn.execute(f"""
+        INSERT INTO gunluk_profil_taramalari (gun, profil_id, tarayici_tipi, basarili_mi, tarama_sayisi)
+        SELECT date(tarama_zamani), profil_id, tarayici_tipi, COALESCE(basarili_mi, 0) != 0, COUNT(*)
+        FROM {kaynak} {aralik}
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (profil_id, gun, tarayici_tipi, basarili_mi) DO UPDATE
+        SET tarama_sayisi = tarama_sayisi + excluded.tarama_sayisi
+    """, (baslangic_gunu, bitis_gunu))
+    conn.execute(f"""
+        INSERT INTO gunluk_taramalar (gun, tarayici_tipi, basarili_mi, tarama_sayisi)
+        SELECT date(tarama_zamani), tarayici_tipi, COALESCE(basarili_mi, 0) != 0, COUNT(*)
+        FROM {kaynak} {aralik}
+        GROUP BY 1, 2, 3
+        ON CONFLICT (gun, tarayici_tipi, basarili_mi) DO UPDATE
+        SET tarama_sayisi = tarama_sayisi + excluded.tarama_sayisi
+    """, (baslangic_gunu, bitis_gunu))
+
+# Şema göçleri: (sürüm, açıklama, adımlar). Adım bir SQL ifadesi ya da bağlantı alan fonksiyondur.
+# Yeni şema değişikliği = listenin sonuna bir sonraki sürüm numarasıyla yeni göç eklemek;
+# uygulanan sürüm PRAGMA user_version'da tutulur, bekleyen göçler açılışta tek işlemde uygulanır.
+SEMA_GOCLERI: List[Tuple[int, str, Tuple]] = [
+    (1, "Temel tablolar: profiller, qr_tarama_loglari", (
+        """
+        CREATE TABLE IF NOT EXISTS profiller (
+            profil_id TEXT PRIMARY KEY,
+            kullanici_id TEXT NOT NULL,
+            isim TEXT NOT NULL,
+            aciklama TEXT,
+            olusturma_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            guncelleme_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            aktif_mi BOOLEAN DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS qr_tarama_loglari (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profil_id TEXT NOT NULL,
+            tarayici_tipi TEXT NOT NULL,
+            user_agent TEXT,
+            ip_adresi TEXT,
+            coğrafi_konum TEXT,
+            tarama_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            basarili_mi BOOLEAN DEFAULT 0,
+            FOREIGN KEY (profil_id) REFERENCES profiller (profil_id)
+        )
+        """,
+    )),
+    (2, "Tarama logu ve profil sayımı indeksleri", (
+        # tarama_loglarini_al (profil filtresiz): zaman aralığı + ORDER BY tarama_zamani DESC, log_id.
+        # Azalan indeks sütunu + örtük artan rowid, sıralamayı geçici B-ağacı olmadan karşılar.
+        indeks_olustur("idx_tarama_loglari_zaman", "qr_tarama_loglari", ("tarama_zamani DESC",)),
+        # tarama_loglarini_al (profil filtreli) ve yabancı anahtar kontrolleri: profil_id eşitliği + zaman
+        indeks_olustur("idx_tarama_loglari_profil_zaman", "qr_tarama_loglari", ("profil_id", "tarama_zamani DESC")),
+        # profil_sayisi_al: aktif_mi (+ kullanici_id) üzerinden COUNT, tabloya inmeden (kapsayan indeks)
+        indeks_olustur("idx_profiller_aktif_kullanici", "profiller", ("aktif_mi", "kullanici_id")),
+    )),
+    (3, "Günlük tarama özet tabloları ve güncelleme tetikleyicisi", (
+        """
+        CREATE TABLE IF NOT EXISTS gunluk_profil_taramalari (
+            gun TEXT NOT NULL,
+            profil_id TEXT NOT NULL,
+            tarayici_tipi TEXT NOT NULL,
+            basarili_mi INTEGER NOT NULL,
+            tarama_sayisi INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (profil_id, gun, tarayici_tipi, basarili_mi)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS gunluk_taramalar (
+            gun TEXT NOT NULL,
+            tarayici_tipi TEXT NOT NULL,
+            basarili_mi INTEGER NOT NULL,
+            tarama_sayisi INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (gun, tarayici_tipi, basarili_mi)
+        ) WITHOUT ROWID
+        """,
+        # Her ham log eklemesi (tekil veya executemany) iki özet kovasını aynı işlemde bir artırır
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tarama_loglari_ozet AFTER INSERT ON qr_tarama_loglari
+        BEGIN
+            INSERT INTO gunluk_profil_taramalari (gun, profil_id, tarayici_tipi, basarili_mi, tarama_sayisi)
+            VALUES (date(NEW.tarama_zamani), NEW.profil_id, NEW.tarayici_tipi, COALESCE(NEW.basarili_mi, 0) != 0, 1)
+            ON CONFLICT (profil_id, gun, tarayici_tipi, basarili_mi) DO UPDATE SET tarama_sayisi = tarama_sayisi + 1;
+            INSERT INTO gunluk_taramalar (gun, tarayici_tipi, basarili_mi, tarama_sayisi)
+            VALUES (date(NEW.tarama_zamani), NEW.tarayici_tipi, COALESCE(NEW.basarili_mi, 0) != 0, 1)
+            ON CONFLICT (gun, tarayici_tipi, basarili_mi) DO UPDATE SET tarama_sayisi = tarama_sayisi + 1;
+        END
+        """,
+        # Mevcut ham loglardan ilk doldurma
+        lambda conn: _ozetleri_doldur(conn, "0000-01-01", "9999-12-31"),
+    )),
+]
+
+def sema_goclerini_uygula(conn: sqlite3.Connection, gocler: List[Tuple[int, str, Tuple]] = None) -> int:
+    """
+    Bekleyen şema göçlerini sırayla ve tek işlemde uygular; PRAGMA user_version'ı günceller.
+    BEGIN IMMEDIATE ile yazma kilidi alındığından aynı dosyayı açan süreçler göçü iki kez uygulamaz;
+    herhangi bir adım hata verirse hiçbir göç uygulanmış sayılmaz.
+    Girdiler: conn (sqlite3.Connection), gocler (list) - varsayılan SEMA_GOCLERI
+    Çıktı: Uygulama sonrası şema sürümü (int)
+    """
+    gocler = SEMA_GOCLERI if gocler is None else gocler
+    mevcut = conn.execute("PRAGMA user_version").fetchone()[0]
+    if not gocler or mevcut >= gocler[-1][0]:
+        return mevcut
+    
+    conn.commit()  # Açık örtük işlem kalmasın
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        mevcut = conn.execute("PRAGMA user_version").fetchone()[0]  # Kilit beklerken başka süreç uygulamış olabilir
+        for surum, aciklama, adimlar in gocler:
+            if surum <= mevcut:
+                continue
+            for adim in adimlar:
+                if callable(adim):
+                    adim(conn)
+                else:
+                    conn.execute(adim)
+            conn.execute(f"PRAGMA user_version = {int(surum)}")
+            mevcut = surum
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return mevcut
+
+class TaramaLogu(NamedTuple):
+    """
+    Tek tarama logu satırı (hafif, demet benzeri; _asdict() ile eski dict biçimine çevrilir).
+    """
+    log_id: int
+    profil_id: str
+    tarayici_tipi: str
+    user_agent: Optional[str]
+    ip_adresi: Optional[str]
+    cografl_konum: Optional[str]
+    tarama_zamani: str
+    basarili_mi: bool
+    
+    @classmethod
+    def satirdan(cls, cursor: sqlite3.Cursor, satir: tuple) -> "TaramaLogu":
+        """
+        sqlite3 row_factory: ham satırı TaramaLogu'ya çevirir.
+        """
+        return cls(*satir[:7], bool(satir[7]))
+    
+    @property
+    def imlec(self) -> Tuple[str, int]:
+        """
+        Çıktı: Bu kayıttan sonrasını getirmek için keyset imleci (tarama_zamani, log_id)
+        """
+        return (self.tarama_zamani, self.log_id)
+
+class GunlukTaramaOzeti(NamedTuple):
+    """
+    Tek günlük özet kovası: o gün, o tarayıcı tipi ve başarı durumu için tarama sayısı.
+    """
+    gun: str
+    tarayici_tipi: str
+    basarili_mi: bool
+    tarama_sayisi: int
+
+class DepolamaArkaUcu:
+    """
+    Profil ve tarama logu depolama arayüzü (modül düzeyindeki yardımcı fonksiyonların arkasındaki katman).
+    Alt sınıflar profil ve log işlemlerini uygular; tarama_loglarini_al, gunluk_tarama_sayilari ve
+    profil_var_mi bunların üzerine kuruludur. Loglar (tarama_zamani DESC, log_id) sırasıyla döner,
+    bilinmeyen profile log yazılamaz (qr_tarama_logla False döner).
+    """
+    
+    ad = "soyut"
+    
+    def profil_olustur(self, kullanici_id: str, isim: str, aciklama: str = "", profil_id: str = None) -> str:
+        """
+        Girdiler: kullanici_id (str), isim (str), aciklama (str), profil_id (str) - verilmezse UUID üretilir
+        Çıktı: profil_id (str)
+        """
+        raise NotImplementedError
+    
+    def profil_bilgisi_al(self, profil_id: str) -> Optional[Dict]:
+        """
+        Çıktı: Aktif profilin bilgileri dict veya None
+        """
+        raise NotImplementedError
+    
+    def profil_var_mi(self, profil_id: str) -> bool:
+        return self.profil_bilgisi_al(profil_id) is not None
+    
+    def profil_devre_disi_birak(self, profil_id: str) -> bool:
+        """
+        Çıktı: bool (aktif bir profil devre dışı bırakıldı mı?)
+        """
+        raise NotImplementedError
+    
+    def qr_tarama_logla(self, profil_id: str, tarayici_tipi: str, user_agent: str = None,
+                        ip_adresi: str = None, cografl_konum: str = None, basarili_mi: bool = False) -> bool:
+        """
+        Çıktı: bool (log başarılı mı?)
+        """
+        raise NotImplementedError
+    
+    def tarama_loglarini_gez(self, profil_id: str = None, son_gun_sayisi: int = 30, limit: int = None,
+                             imlec: Tuple[str, int] = None) -> Iterator[TaramaLogu]:
+        """
+        Girdiler: profil_id (str), son_gun_sayisi (int), limit (int), imlec (tuple) - (tarama_zamani, log_id)
+        Çıktı: En yeniden eskiye TaramaLogu üreteci
+        """
+        raise NotImplementedError
+    
+    def gunluk_tarama_ozeti(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[GunlukTaramaOzeti]:
+        """
+        Çıktı: GunlukTaramaOzeti listesi (en yeni gün önce)
+        """
+        raise NotImplementedError
+    
+    def tarama_loglarini_al(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[Dict]:
+        """
+        Tarama loglarını alır (opsiyonel filtreleme ile).
+        Büyük pencerelerde tarama_loglarini_gez tercih edilmelidir (tüm kayıtları belleğe alır).
+        Girdiler: profil_id (str), son_gun_sayisi (int)
+        Çıktı: Log listesi (dict listesi)
+        """
+        return [log._asdict() for log in self.tarama_loglarini_gez(profil_id, son_gun_sayisi)]
+    
+    def gunluk_tarama_sayilari(self, profil_id: str = None, son_gun_sayisi: int = 30) -> Dict[str, Dict]:
+        """
+        Panel için gün başına toplamlar (gunluk_tarama_ozeti üzerinden).
+        Girdiler: profil_id (str), son_gun_sayisi (int)
+        Çıktı: {gun: {"toplam", "basarili", "basarisiz", "tarayici_tipleri": {tip: sayı}}} (en yeni gün önce)
+        """
+        gunler: Dict[str, Dict] = {}
+        for ozet in self.gunluk_tarama_ozeti(profil_id, son_gun_sayisi):
+            gun = gunler.setdefault(ozet.gun, {"toplam": 0, "basarili": 0, "basarisiz": 0, "tarayici_tipleri": {}})
+            gun["toplam"] += ozet.tarama_sayisi
+            gun["basarili" if ozet.basarili_mi else "basarisiz"] += ozet.tarama_sayisi
+            tipler = gun["tarayici_tipleri"]
+            tipler[ozet.tarayici_tipi] = tipler.get(ozet.tarayici_tipi, 0) + ozet.tarama_sayisi
+        return gunler
+
+class HoynVeritabaniYoneticisi(DepolamaArkaUcu):
     """
     Hoyn QR sistemi için SQLite veritabanı yöneticisi sınıfı.
     Profilleri ve QR tarama loglarını yönetir.
     """
     
+    ad = "sqlite"
+    
     def __init__(self, db_dosyasi: str = VERITABANI_DOSYASI):
         """
         Veritabanı yöneticisini başlatır ve tabloları oluşturur.
         Girdiler: db_dosyasi (str) - Veritabanı dosya yolu
         """
         self.db_dosyasi = db_dosyasi
+        self._yerel = threading.local()
+        self._baglantilar: Dict[int, sqlite3.Connection] = {}  # iş parçacığı kimliği -> bağlantı
+        self._baglanti_kilidi = threading.Lock()
+        self._nesil = 0  # baglantilari_kapat sonrası eski bağlantıları geçersiz kılar
+        self._pid = os.getpid()
+        self.log_yazici = None  # Opsiyonel: log_yaziciyi_etkinlestir
+        self.profil_onbellegi = ProfilOnbellegi()  # profil_onbellegini_kapat ile devre dışı
+        self.log_bolumleri = None  # Opsiyonel: log_bolumlemesini_etkinlestir
         self.baglanti_olustur()
         self.tablolari_olustur()
     
     def baglanti_olustur(self) -> sqlite3.Connection:
         """
-        SQLite veritabanı bağlantısını oluşturur.
+        Bu iş parçacığının kalıcı SQLite bağlantısını döndürür; ilk çağrıda açar.
+        Bağlantı WAL kipinde, meşgul zaman aşımı ve hazır ifade önbelleğiyle kurulur; kapatılmaz.
         Çıktı: sqlite3.Connection nesnesi
         """
+        conn = getattr(self._yerel, "baglanti", None)
+        if conn is not None and self._yerel.nesil == self._nesil and self._pid == os.getpid():
+            return conn
         try:
-            conn = sqlite3.connect(self.db_dosyasi)
+            conn = sqlite3.connect(self.db_dosyasi, timeout=MESGUL_ZAMAN_ASIMI,
+                                   cached_statements=ONBELLEKLI_IFADE_SAYISI, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")  # Okuyucular yazıcıyı beklemez
+            conn.execute("PRAGMA synchronous = NORMAL")  # WAL'da güvenli; her commit'te fsync yok
             conn.execute("PRAGMA foreign_keys = ON")  # Yabancı anahtar kısıtlamalarını etkinleştir
-            return conn
         except Exception as e:
             raise Exception(f"Veritabanı bağlantı hatası: {e}")
+        
+        with self._baglanti_kilidi:
+            if self._pid != os.getpid():
+                # fork sonrası üst sürecin bağlantılarına dokunma
+                self._baglantilar = {}
+                self._pid = os.getpid()
+            # Sonlanmış iş parçacıklarının bağlantılarını kapat
+            canli = {is_parcacigi.ident for is_parcacigi in threading.enumerate()}
+            for kimlik in [kimlik for kimlik in self._baglantilar if kimlik not in canli]:
+                self._baglantilar.pop(kimlik).close()
+            self._baglantilar[threading.get_ident()] = conn
+            self._yerel.nesil = self._nesil
+        self._yerel.baglanti = conn
+        return conn
+    
+    def baglantilari_kapat(self) -> None:
+        """
+        Tüm iş parçacıklarının kalıcı bağlantılarını kapatır (sonraki çağrılar yeniden açar).
+        """
+        with self._baglanti_kilidi:
+            self._nesil += 1
+            baglantilar, self._baglantilar = self._baglantilar, {}
+        for conn in baglantilar.values():
+            conn.close()
     
     def tablolari_olustur(self) -> None:
         """
-        Gerekli tabloları oluşturur: profiller, qr_tarama_loglari.
+        Şemayı güncel sürüme getirir: bekleyen göçleri (SEMA_GOCLERI) sırayla uygular.
         """
         conn = self.baglanti_olustur()
         try:
-            cursor = conn.cursor()
-            
-            # Profiller tablosu
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS profiller (
-                    profil_id TEXT PRIMARY KEY,
-                    kullanici_id TEXT NOT NULL,
-                    isim TEXT NOT NULL,
-                    aciklama TEXT,
-                    olusturma_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    guncelleme_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    aktif_mi BOOLEAN DEFAULT 1
-                )
-            """)
-            
-            # QR Tarama Logları tablosu
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS qr_tarama_loglari (
-                    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    profil_id TEXT NOT NULL,
-                    tarayici_tipi TEXT NOT NULL,
-                    user_agent TEXT,
-                    ip_adresi TEXT,
-                    coğrafi_konum TEXT,
-                    tarama_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    basarili_mi BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (profil_id) REFERENCES profiller (profil_id)
-                )
-            """)
-            
-            conn.commit()
+            sema_goclerini_uygula(conn)
             print("✅ Veritabanı tabloları başarıyla oluşturuldu.")
             
         except Exception as e:
             print(f"Tablo oluşturma hatası: {e}")
             conn.rollback()
-        finally:
-            conn.close()
     
-    def profil_olustur(self, kullanici_id: str, isim: str, aciklama: str = "") -> str:
+    def sema_surumu(self) -> int:
+        """
+        Çıktı: Veritabanının uygulanmış şema sürümü (PRAGMA user_version)
+        """
+        return self.baglanti_olustur().execute("PRAGMA user_version").fetchone()[0]
+    
+    def profil_olustur(self, kullanici_id: str, isim: str, aciklama: str = "", profil_id: str = None) -> str:
         """
         Yeni profil oluşturur ve profil_id döndürür.
-        Girdiler: kullanici_id (str), isim (str), aciklama (str)
+        Girdiler: kullanici_id (str), isim (str), aciklama (str),
+                  profil_id (str) - verilmezse UUID üretilir (parçalı depolama kimliği önceden seçer)
         Çıktı: Oluşturulan profil_id (str)
         """
         conn = self.baglanti_olustur()
         try:
             cursor = conn.cursor()
-            profil_id = str(uuid.uuid4())
+            profil_id = profil_id or str(uuid.uuid4())
             
-            cursor.execute("""
-                INSERT INTO profiller (profil_id, kullanici_id, isim, aciklama)
-                VALUES (?, ?, ?, ?)
-            """, (profil_id, kullanici_id, isim, aciklama))
+            cursor.execute(PROFIL_EKLE, (profil_id, kullanici_id, isim, aciklama))
             
             conn.commit()
+            self._profil_onbellekten_cikar(profil_id)
             print(f"✅ Yeni profil oluşturuldu: {isim} (ID: {profil_id})")
             return profil_id
             
@@ -110,41 +442,98 @@ class HoynVeritabaniYoneticisi:
             print(f"Profil oluşturma hatası: {e}")
             conn.rollback()
             raise
+    
+    def profilleri_toplu_ekle(self, kayitlar: List[Tuple[str, str, str, str]]) -> List[Tuple[int, str]]:
+        """
+        Profilleri tek işlemde executemany ile ekler (profil başına commit ve çıktı yok).
+        Bütünlük hatasında (ör. yinelenen profil_id) işlem geri alınır, kayıtlar tek tek eklenip hatalılar atlanır.
+        Girdiler: kayitlar (list) - (profil_id, kullanici_id, isim, aciklama) demetleri
+        Çıktı: Eklenemeyen kayıtlar: [(kayitlar içindeki sıra, hata mesajı), ...]
+        """
+        conn = self.baglanti_olustur()
+        hatalar = []
+        try:
+            conn.executemany(PROFIL_EKLE, kayitlar)
+            conn.commit()
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            for sira, kayit in enumerate(kayitlar):
+                try:
+                    conn.execute(PROFIL_EKLE, kayit)
+                except sqlite3.IntegrityError as e:
+                    hatalar.append((sira, str(e)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        for kayit in kayitlar:
+            self._profil_onbellekten_cikar(kayit[0])
+        return hatalar
+    
+    def profilleri_gez(self, kullanici_id: str = None, sadece_aktif: bool = True,
+                       parti_boyutu: int = 500) -> Iterator[Dict]:
+        """
+        Profilleri ekleme sırasıyla akış halinde döndürür (fetchmany; tüm tablo belleğe alınmaz).
+        Girdiler: kullanici_id (str) - yalnızca bu kullanıcının profilleri, sadece_aktif (bool),
+                  parti_boyutu (int) - veritabanından bir seferde çekilen satır
+        Çıktı: Profil sözlükleri (PROFIL_SUTUNLARI anahtarlarıyla) üreteci
+        """
+        kosullar, parametreler = [], []
+        if sadece_aktif:
+            kosullar.append("aktif_mi = 1")
+        if kullanici_id is not None:
+            kosullar.append("kullanici_id = ?")
+            parametreler.append(kullanici_id)
+        nerede = f"WHERE {' AND '.join(kosullar)}" if kosullar else ""
+        cursor = self.baglanti_olustur().execute(
+            f"SELECT {', '.join(PROFIL_SUTUNLARI)} FROM profiller {nerede} ORDER BY rowid", parametreler)
+        try:
+            while True:
+                satirlar = cursor.fetchmany(parti_boyutu)
+                if not satirlar:
+                    return
+                for satir in satirlar:
+                    yield dict(zip(PROFIL_SUTUNLARI, satir))
         finally:
-            conn.close()
+            cursor.close()
+    
+    def _profil_oku(self, profil_id: str) -> Optional[Dict]:
+        """
+        Aktif profili doğrudan veritabanından okur (önbelleksiz; hata durumunda istisna fırlatır).
+        Girdiler: profil_id (str)
+        Çıktı: Profil bilgileri dict veya None
+        """
+        satir = self.baglanti_olustur().execute("""
+            SELECT profil_id, kullanici_id, isim, aciklama, olusturma_zamani, aktif_mi
+            FROM profiller 
+            WHERE profil_id = ? AND aktif_mi = 1
+        """, (profil_id,)).fetchone()
+        if satir:
+            return {
+                "profil_id": satir[0],
+                "kullanici_id": satir[1],
+                "isim": satir[2],
+                "aciklama": satir[3],
+                "olusturma_zamani": satir[4],
+                "aktif_mi": satir[5]
+            }
+        return None
     
     def profil_bilgisi_al(self, profil_id: str) -> Optional[Dict]:
         """
-        Profil bilgilerini veritabanından alır.
+        Profil bilgilerini alır (profil önbelleği etkinse önce önbellekten).
         Girdiler: profil_id (str)
         Çıktı: Profil bilgileri dict veya None
         """
-        conn = self.baglanti_olustur()
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT profil_id, kullanici_id, isim, aciklama, olusturma_zamani, aktif_mi
-                FROM profiller 
-                WHERE profil_id = ? AND aktif_mi = 1
-            """, (profil_id,))
-            
-            satir = cursor.fetchone()
-            if satir:
-                return {
-                    "profil_id": satir[0],
-                    "kullanici_id": satir[1],
-                    "isim": satir[2],
-                    "aciklama": satir[3],
-                    "olusturma_zamani": satir[4],
-                    "aktif_mi": satir[5]
-                }
-            return None
+            onbellek = self.profil_onbellegi
+            if onbellek is not None:
+                return onbellek.yukle(profil_id, self._profil_oku)
+            return self._profil_oku(profil_id)
             
         except Exception as e:
             print(f"Profil bilgisi alma hatası: {e}")
             return None
-        finally:
-            conn.close()
     
     def profil_var_mi(self, profil_id: str) -> bool:
         """
@@ -152,8 +541,16 @@ class HoynVeritabaniYoneticisi:
         Girdiler: profil_id (str)
         Çıktı: bool
         """
-        profil = self.profil_bilgisi_al(profil_id)
-        return profil is not None
+        if self.profil_onbellegi is not None:
+            return self.profil_bilgisi_al(profil_id) is not None
+        conn = self.baglanti_olustur()
+        try:
+            satir = conn.execute(
+                "SELECT 1 FROM profiller WHERE profil_id = ? AND aktif_mi = 1 LIMIT 1", (profil_id,)).fetchone()
+            return satir is not None
+        except Exception as e:
+            print(f"Profil kontrol hatası: {e}")
+            return False
     
     def profil_guncelle(self, profil_id: str, isim: str = None, aciklama: str = None) -> bool:
         """
@@ -189,14 +586,60 @@ class HoynVeritabaniYoneticisi:
                 guncel_say = cursor.rowcount
             
             conn.commit()
+            if guncel_say > 0:
+                self._profil_onbellekten_cikar(profil_id)
             return guncel_say > 0
             
         except Exception as e:
             print(f"Profil güncelleme hatası: {e}")
             conn.rollback()
             return False
-        finally:
-            conn.close()
+    
+    def profil_devre_disi_birak(self, profil_id: str) -> bool:
+        """
+        Profili devre dışı bırakır (aktif_mi = 0); profil artık bulunamaz ve taranamaz.
+        Girdiler: profil_id (str)
+        Çıktı: bool (aktif bir profil devre dışı bırakıldı mı?)
+        """
+        conn = self.baglanti_olustur()
+        try:
+            cursor = conn.execute("""
+                UPDATE profiller 
+                SET aktif_mi = 0, guncelleme_zamani = CURRENT_TIMESTAMP
+                WHERE profil_id = ? AND aktif_mi = 1
+            """, (profil_id,))
+            conn.commit()
+            self._profil_onbellekten_cikar(profil_id)
+            return cursor.rowcount > 0
+            
+        except Exception as e:
+            print(f"Profil devre dışı bırakma hatası: {e}")
+            conn.rollback()
+            return False
+    
+    def _profil_onbellekten_cikar(self, profil_id: str) -> None:
+        """
+        Değişiklik işlendikten (commit) sonra profilin önbellek kaydını geçersiz kılar.
+        """
+        if self.profil_onbellegi is not None:
+            self.profil_onbellegi.gecersiz_kil(profil_id)
+    
+    def profil_onbellegini_etkinlestir(self, maks_boyut: int = 10000, ttl: float = 60.0,
+                                       negatif_ttl: float = 5.0) -> "ProfilOnbellegi":
+        """
+        Profil önbelleğini verilen ayarlarla (yeniden) kurar.
+        Girdiler: maks_boyut (int) - kayıt sınırı, ttl (float) - saniye,
+                  negatif_ttl (float) - bilinmeyen kimlik kayıtlarının ömrü (saniye)
+        Çıktı: ProfilOnbellegi
+        """
+        self.profil_onbellegi = ProfilOnbellegi(maks_boyut, ttl, negatif_ttl)
+        return self.profil_onbellegi
+    
+    def profil_onbellegini_kapat(self) -> None:
+        """
+        Profil önbelleğini kapatır (her arama veritabanına gider).
+        """
+        self.profil_onbellegi = None
     
     def qr_tarama_logla(self, profil_id: str, tarayici_tipi: str, user_agent: str = None, 
                         ip_adresi: str = None, cografl_konum: str = None, basarili_mi: bool = False) -> bool:
@@ -206,16 +649,15 @@ class HoynVeritabaniYoneticisi:
                   cografl_konum (str), basarili_mi (bool)
         Çıktı: bool (log başarılı mı?)
         """
+        kayit = (profil_id, tarayici_tipi, user_agent, ip_adresi, cografl_konum, basarili_mi,
+                 time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()))
+        if self.log_yazici is not None:
+            # Arka plan yazıcısı: kuyruğa al, çıktı yazma (False: taşma politikası kaydı attı)
+            return self.log_yazici.ekle(kayit)
+        
         conn = self.baglanti_olustur()
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO qr_tarama_loglari 
-                (profil_id, tarayici_tipi, user_agent, ip_adresi, coğrafi_konum, basarili_mi)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (profil_id, tarayici_tipi, user_agent, ip_adresi, cografl_konum, basarili_mi))
-            
+            self.tarama_loglarini_ekle(conn, [kayit])
             conn.commit()
             print(f"📝 QR tarama loglandı: {tarayici_tipi} - Başarılı: {basarili_mi}")
             return True
@@ -224,56 +666,269 @@ class HoynVeritabaniYoneticisi:
             print(f"QR tarama loglama hatası: {e}")
             conn.rollback()
             return False
-        finally:
-            conn.close()
     
-    def tarama_loglarini_al(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[Dict]:
+    def tarama_loglarini_ekle(self, conn: sqlite3.Connection, kayitlar: List[tuple]) -> None:
         """
-        Tarama loglarını alır (opsiyonel filtreleme ile).
-        Girdiler: profil_id (str), son_gun_sayisi (int)
-        Çıktı: Log listesi (dict listesi)
+        Log kayıtlarını ekler (commit etmez). Bölümleme etkinse her kayıt tarama_zamani ayının bölümüne yazılır.
+        Girdiler: conn (sqlite3.Connection), kayitlar (list) - TARAMA_LOGU_EKLE parametreleri
+        """
+        if self.log_bolumleri is None:
+            conn.executemany(TARAMA_LOGU_EKLE, kayitlar)
+            return
+        aylara_gore: Dict[str, List[tuple]] = {}
+        for kayit in kayitlar:
+            aylara_gore.setdefault(kayit[6][:7], []).append(kayit)
+        # ATTACH işlem içinde yapılamaz: önce tüm bölümleri bağla, sonra ekle
+        semalar = {ay: self.log_bolumleri.bagla(conn, ay) for ay in aylara_gore}
+        for ay, grup in aylara_gore.items():
+            conn.executemany(TARAMA_LOGU_EKLE.replace("qr_tarama_loglari", f"{semalar[ay]}.qr_tarama_loglari", 1), grup)
+    
+    def log_bolumlemesini_etkinlestir(self, dizin: str = None) -> "TaramaLogBolumleri":
+        """
+        Yeni tarama loglarını aylık bölüm dosyalarına yönlendirir. Ana tablodaki eski loglar yerinde kalır
+        ve bölümlerden sonra (en eski olarak) okunur.
+        Girdiler: dizin (str) - bölüm dosyaları dizini (varsayılan: <veritabanı adı>_loglar)
+        Çıktı: TaramaLogBolumleri
+        """
+        if dizin is None:
+            dizin = os.path.splitext(self.db_dosyasi)[0] + "_loglar"
+        self.log_bolumleri = TaramaLogBolumleri(dizin)
+        return self.log_bolumleri
+    
+    def log_bolumlerini_temizle(self, saklama_ay_sayisi: int, arsivle: bool = False) -> List[str]:
+        """
+        Saklama süresini aşan aylık bölümleri dosya olarak siler (büyük DELETE/VACUUM yok).
+        Girdiler: saklama_ay_sayisi (int) - içinde bulunulan ay dahil tutulacak ay sayısı,
+                  arsivle (bool) - silmeden önce sıkıştırılmış salt okunur arşive ekle
+        Çıktı: Kaldırılan ayların listesi (YYYY-MM)
+        """
+        if self.log_bolumleri is None:
+            return []
+        return self.log_bolumleri.eskileri_kaldir(self.baglanti_olustur(), saklama_ay_sayisi, arsivle)
+    
+    def _tarama_logu_kaynaklari(self, conn: sqlite3.Connection, son_gun_sayisi: int,
+                                imlec: Tuple[str, int] = None, eskiden_yeniye: bool = False) -> Iterator[str]:
+        """
+        Pencereyle örtüşen log tablolarını en yeniden eskiye verir (bölümler, ardından ana tablo).
+        Bölümler zamanca ayrık olduğundan sırayla okumak genel (tarama_zamani DESC, log_id) sırasını korur.
+        Bölümler gerektikçe bağlanır (aynı anda en fazla MAKS_EKLI_BOLUM); eskiden_yeniye ters sırayı verir.
+        """
+        aylar = []
+        if self.log_bolumleri is not None:
+            ilk_ay = time.strftime("%Y-%m", time.gmtime(time.time() - int(son_gun_sayisi) * 86400))
+            son_ay = imlec[0][:7] if imlec is not None else "9999-12"
+            aylar = [ay for ay in self.log_bolumleri.aylar() if ilk_ay <= ay <= son_ay]
+        if eskiden_yeniye:
+            yield "qr_tarama_loglari"
+        for ay in (aylar if eskiden_yeniye else reversed(aylar)):
+            sema = self.log_bolumleri.bagla(conn, ay, olustur=False)
+            if sema is not None:
+                yield f"{sema}.qr_tarama_loglari"
+        if not eskiden_yeniye:
+            yield "qr_tarama_loglari"
+    
+    def log_yaziciyi_etkinlestir(self, parti_boyutu: int = 500, parti_suresi: float = 1.0,
+                                 kuyruk_boyutu: int = 10000, tasma_politikasi: str = "engelle",
+                                 engelleme_suresi: float = 1.0) -> "TaramaLogYazici":
+        """
+        qr_tarama_logla'yı arka plan parti yazıcısına yönlendirir.
+        Girdiler: parti_boyutu (int), parti_suresi (float) - saniye, kuyruk_boyutu (int),
+                  tasma_politikasi (str) - TASMA_POLITIKALARI, engelleme_suresi (float) - "engelle" için saniye
+        Çıktı: TaramaLogYazici nesnesi
+        """
+        self.log_yaziciyi_kapat()
+        self.log_yazici = TaramaLogYazici(self, parti_boyutu, parti_suresi, kuyruk_boyutu, tasma_politikasi,
+                                          engelleme_suresi)
+        return self.log_yazici
+    
+    def log_yaziciyi_kapat(self) -> None:
+        """
+        Kuyruktaki tüm kayıtları yazar, yazıcıyı durdurur ve senkron loglamaya döner.
+        """
+        yazici, self.log_yazici = self.log_yazici, None
+        if yazici is not None:
+            yazici.kapat()
+    
+    @staticmethod
+    def tarama_loglari_sorgusu(profil_id: str = None, son_gun_sayisi: int = 30, imlec: Tuple[str, int] = None,
+                               limit: int = None, tablo: str = "qr_tarama_loglari") -> Tuple[str, list]:
+        """
+        Tarama logu sorgusunu oluşturur (sorgu planı kontrolleri için ayrı).
+        Sıralama (tarama_zamani DESC, log_id); imlec verilirse o kaydın sonrasından devam eder (keyset).
+        Tüm değerler parametre olarak bağlanır; aynı biçimdeki sorgular hazır ifade önbelleğini paylaşır.
+        Girdiler: profil_id (str), son_gun_sayisi (int),
+                  imlec (tuple) - son okunan kaydın (tarama_zamani, log_id) çifti, limit (int),
+                  tablo (str) - ana tablo veya log bölümü (ör. bolum_2024_01.qr_tarama_loglari)
+        Çıktı: (sorgu, parametreler)
+        """
+        sorgu = f"""
+            SELECT log_id, profil_id, tarayici_tipi, user_agent, ip_adresi, 
+                   coğrafi_konum, tarama_zamani, basarili_mi
+            FROM {tablo} 
+            WHERE tarama_zamani >= datetime('now', ?)
+        """
+        parametreler = [f"-{int(son_gun_sayisi)} days"]
+        
+        if profil_id:
+            sorgu += " AND profil_id = ?"
+            parametreler.append(profil_id)
+        
+        if imlec is not None:
+            # (tarama_zamani, log_id) sırasında imleçten sonrası; ilk koşul indeks aralığını daraltır
+            sorgu += " AND tarama_zamani <= ? AND (tarama_zamani < ? OR log_id > ?)"
+            parametreler.extend([imlec[0], imlec[0], imlec[1]])
+        
+        sorgu += " ORDER BY tarama_zamani DESC, log_id"  # Aynı saniyedeki kayıtlar ekleme sırasıyla
+        if limit is not None:
+            sorgu += " LIMIT ?"
+            parametreler.append(int(limit))
+        return sorgu, parametreler
+    
+    def tarama_loglarini_gez(self, profil_id: str = None, son_gun_sayisi: int = 30, limit: int = None,
+                             imlec: Tuple[str, int] = None, parti_boyutu: int = 500) -> Iterator[TaramaLogu]:
+        """
+        Tarama loglarını en yeniden eskiye akış halinde döndürür (fetchmany ile parti parti okur).
+        Sonraki sayfa için son kaydın imlec değeri verilir: tarama_loglarini_gez(..., imlec=son.imlec).
+        Bölümleme etkinse yalnızca pencereyle (ve imleçle) örtüşen aylık bölümler okunur.
+        Girdiler: profil_id (str), son_gun_sayisi (int), limit (int) - en fazla kayıt,
+                  imlec (tuple) - (tarama_zamani, log_id), parti_boyutu (int)
+        Çıktı: TaramaLogu üreteci
         """
         conn = self.baglanti_olustur()
+        cursor = conn.cursor()
+        cursor.row_factory = TaramaLogu.satirdan
+        kalan = limit
         try:
-            cursor = conn.cursor()
-            
-            sorgu = """
-                SELECT log_id, profil_id, tarayici_tipi, user_agent, ip_adresi, 
-                       coğrafi_konum, tarama_zamani, basarili_mi
-                FROM qr_tarama_loglari 
-                WHERE tarama_zamani >= datetime('now', '-{} days')
-            """.format(son_gun_sayisi)
+            for tablo in self._tarama_logu_kaynaklari(conn, son_gun_sayisi, imlec):
+                sorgu, parametreler = self.tarama_loglari_sorgusu(profil_id, son_gun_sayisi, imlec, kalan, tablo)
+                cursor.execute(sorgu, parametreler)
+                while True:
+                    parti = cursor.fetchmany(parti_boyutu)
+                    if not parti:
+                        break
+                    yield from parti
+                    if kalan is not None:
+                        kalan -= len(parti)
+                if kalan is not None and kalan <= 0:
+                    return
             
-            parametreler = []
+        except sqlite3.Error as e:
+            print(f"Tarama logları alma hatası: {e}")
+        finally:
+            cursor.close()
+    
+    def tarama_logu_kolonlarini_gez(self, son_gun_sayisi: int = 365,
+                                    parti_boyutu: int = 65536) -> Iterator[List[Tuple[int, str, str, int]]]:
+        """
+        Analitik dışa aktarım için logları eskiden yeniye, ham satır partileri halinde verir.
+        Zaman damgası dönüşümü SQLite'ta yapılır; satır başına nesne (TaramaLogu/dict) oluşturulmaz.
+        Girdiler: son_gun_sayisi (int), parti_boyutu (int) - fetchmany boyutu
+        Çıktı: [(epoch saniye UTC, tarayici_tipi, profil_id, basarili_mi 0/1), ...] partileri üreteci
+        """
+        conn = self.baglanti_olustur()
+        cursor = conn.cursor()
+        try:
+            for tablo in self._tarama_logu_kaynaklari(conn, son_gun_sayisi, eskiden_yeniye=True):
+                cursor.execute(f"""
+                    SELECT CAST(strftime('%s', tarama_zamani) AS INTEGER), tarayici_tipi, profil_id,
+                           COALESCE(basarili_mi, 0) != 0
+                    FROM {tablo}
+                    WHERE tarama_zamani >= datetime('now', ?)
+                    ORDER BY tarama_zamani
+                """, (f"-{int(son_gun_sayisi)} days",))
+                while True:
+                    parti = cursor.fetchmany(parti_boyutu)
+                    if not parti:
+                        break
+                    yield parti
+        finally:
+            cursor.close()
+    
+    def gunluk_tarama_ozeti(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[GunlukTaramaOzeti]:
+        """
+        Günlük tarama özetini ham loglara inmeden özet tablolarından alır (gün başına sabit sayıda kova).
+        Girdiler: profil_id (str) - verilmezse tüm sistem, son_gun_sayisi (int)
+        Çıktı: GunlukTaramaOzeti listesi (en yeni gün önce)
+        """
+        conn = self.baglanti_olustur()
+        try:
             if profil_id:
-                sorgu += " AND profil_id = ?"
-                parametreler.append(profil_id)
+                sorgu = """
+                    SELECT gun, tarayici_tipi, basarili_mi, tarama_sayisi FROM gunluk_profil_taramalari
+                    WHERE profil_id = ? AND gun >= date('now', ?)
+                    ORDER BY gun DESC
+                """
+                parametreler = (profil_id, f"-{int(son_gun_sayisi)} days")
+            else:
+                sorgu = """
+                    SELECT gun, tarayici_tipi, basarili_mi, tarama_sayisi FROM gunluk_taramalar
+                    WHERE gun >= date('now', ?)
+                    ORDER BY gun DESC
+                """
+                parametreler = (f"-{int(son_gun_sayisi)} days",)
+            return [GunlukTaramaOzeti(gun, tip, bool(basarili), sayi)
+                    for gun, tip, basarili, sayi in conn.execute(sorgu, parametreler)]
             
-            sorgu += " ORDER BY tarama_zamani DESC"
-            cursor.execute(sorgu, parametreler)
-            
-            satirlar = cursor.fetchall()
-            loglar = []
-            
-            for satir in satirlar:
-                loglar.append({
-                    "log_id": satir[0],
-                    "profil_id": satir[1],
-                    "tarayici_tipi": satir[2],
-                    "user_agent": satir[3],
-                    "ip_adresi": satir[4],
-                    "cografl_konum": satir[5],
-                    "tarama_zamani": satir[6],
-                    "basarili_mi": bool(satir[7])
-                })
+        except sqlite3.Error as e:
+            print(f"Tarama özeti alma hatası: {e}")
+            return []
+    
+    def tarama_ozetlerini_yeniden_olustur(self, baslangic_gunu: str = None, bitis_gunu: str = None) -> int:
+        """
+        Özet tablolarını ham loglardan yeniden hesaplar (tek işlemde; bu sırada log yazımı bekler).
+        Varsayılan aralık en eski ham log gününden itibarendir; ham logu silinmiş eski günlerin özetleri korunur.
+        Girdiler: baslangic_gunu (str), bitis_gunu (str) - YYYY-MM-DD, dahil
+        Çıktı: Aralıkta yeniden sayılan ham log sayısı (int)
+        """
+        conn = self.baglanti_olustur()
+        conn.commit()
+        # Ham log kaynakları: ana tablo + aralıktaki bölümler (ATTACH işlemden önce)
+        kaynaklar = ["qr_tarama_loglari"]
+        if self.log_bolumleri is not None:
+            ilk_ay, son_ay = (baslangic_gunu or "0000-01")[:7], (bitis_gunu or "9999-12")[:7]
+            for ay in self.log_bolumleri.aylar():
+                sema = self.log_bolumleri.bagla(conn, ay, olustur=False) if ilk_ay <= ay <= son_ay else None
+                if sema is not None:
+                    kaynaklar.append(f"{sema}.qr_tarama_loglari")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if baslangic_gunu is None:
+                baslangic_gunu = min((gun for kaynak in kaynaklar for (gun,) in
+                                      conn.execute(f"SELECT date(MIN(tarama_zamani)) FROM {kaynak}") if gun),
+                                     default=None)
+            if baslangic_gunu is None:  # Ham log yok: silinecek/hesaplanacak aralık yok
+                conn.rollback()
+                return 0
+            bitis_gunu = bitis_gunu or "9999-12-31"
             
-            return loglar
+            for tablo in OZET_TABLOLARI:
+                conn.execute(f"DELETE FROM {tablo} WHERE gun BETWEEN ? AND ?", (baslangic_gunu, bitis_gunu))
+            for kaynak in kaynaklar:
+                _ozetleri_doldur(conn, baslangic_gunu, bitis_gunu, kaynak)
+            sayi = conn.execute("SELECT COALESCE(SUM(tarama_sayisi), 0) FROM gunluk_taramalar WHERE gun BETWEEN ? AND ?",
+                                (baslangic_gunu, bitis_gunu)).fetchone()[0]
+            conn.commit()
+            print(f"✅ Tarama özetleri yeniden oluşturuldu: {baslangic_gunu} - {bitis_gunu}, {sayi} log")
+            return sayi
             
-        except Exception as e:
-            print(f"Tarama logları alma hatası: {e}")
-            return []
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    @staticmethod
+    def profil_sayisi_sorgusu(kullanici_id: str = None) -> Tuple[str, list]:
+        """
+        profil_sayisi_al sorgusunu oluşturur (sorgu planı kontrolleri için ayrı).
+        Girdiler: kullanici_id (str) - Opsiyonel filtre
+        Çıktı: (sorgu, parametreler)
+        """
+        sorgu = "SELECT COUNT(*) FROM profiller WHERE aktif_mi = 1"
+        parametreler = []
+        
+        if kullanici_id:
+            sorgu += " AND kullanici_id = ?"
+            parametreler.append(kullanici_id)
+        return sorgu, parametreler
     
     def profil_sayisi_al(self, kullanici_id: str = None) -> int:
         """
@@ -285,13 +940,7 @@ class HoynVeritabaniYoneticisi:
         try:
             cursor = conn.cursor()
             
-            sorgu = "SELECT COUNT(*) FROM profiller WHERE aktif_mi = 1"
-            parametreler = []
-            
-            if kullanici_id:
-                sorgu += " AND kullanici_id = ?"
-                parametreler.append(kullanici_id)
-            
+            sorgu, parametreler = self.profil_sayisi_sorgusu(kullanici_id)
             cursor.execute(sorgu, parametreler)
             sonuc = cursor.fetchone()
             return sonuc[0] if sonuc else 0
@@ -299,45 +948,769 @@ class HoynVeritabaniYoneticisi:
         except Exception as e:
             print(f"Profil sayısı alma hatası: {e}")
             return 0
+
+class TaramaLogYazici:
+    """
+    Tarama loglarını sınırlı bir bellek kuyruğunda toplayıp arka plan iş parçacığında parti halinde yazar.
+    Parti, parti_boyutu kayda ulaşınca veya en eski kayıt parti_suresi kadar bekleyince tek işlemde yazılır.
+    Kapanışta (kapat veya yorumlayıcı çıkışı) kuyrukta kalan her kayıt yazılır.
+    """
+    
+    def __init__(self, yonetici: HoynVeritabaniYoneticisi, parti_boyutu: int = 500, parti_suresi: float = 1.0,
+                 kuyruk_boyutu: int = 10000, tasma_politikasi: str = "engelle", engelleme_suresi: float = 1.0):
+        """
+        Girdiler: yonetici (HoynVeritabaniYoneticisi), parti_boyutu (int), parti_suresi (float) - saniye,
+                  kuyruk_boyutu (int), tasma_politikasi (str), engelleme_suresi (float) - saniye
+        """
+        if tasma_politikasi not in TASMA_POLITIKALARI:
+            raise ValueError(f"Geçersiz taşma politikası: {tasma_politikasi} ({', '.join(TASMA_POLITIKALARI)})")
+        self.yonetici = yonetici
+        self.parti_boyutu = parti_boyutu
+        self.parti_suresi = parti_suresi
+        self.kuyruk_boyutu = kuyruk_boyutu
+        self.tasma_politikasi = tasma_politikasi
+        self.engelleme_suresi = engelleme_suresi
+        
+        self._kuyruk = deque()
+        self._kosul = threading.Condition()
+        self._ilk_zaman = None  # kuyruktaki en eski partinin bekleme başlangıcı (monotonic)
+        self._bosalt_istegi = False
+        self._durdur = False
+        
+        # Metrikler
+        self.kuyruga_alinan = 0
+        self.yazilan = 0
+        self.atilan = 0
+        self.hatali = 0
+        self.en_yuksek_derinlik = 0
+        self.bosaltma_sayisi = 0
+        self.toplam_bosaltma_suresi = 0.0
+        self.son_bosaltma_suresi = 0.0
+        self.en_uzun_bosaltma_suresi = 0.0
+        self.son_hata = None
+        self._islenen = 0  # yazılan + hatalı + kuyruktan düşürülen (bosalt için)
+        
+        self._is_parcacigi = threading.Thread(target=self._calis, name="hoyn-log-yazici", daemon=True)
+        self._is_parcacigi.start()
+        atexit.register(self.kapat)
+    
+    def ekle(self, kayit: tuple) -> bool:
+        """
+        Kaydı kuyruğa alır; kuyruk doluysa taşma politikasını uygular.
+        Girdiler: kayit (tuple) - TARAMA_LOGU_EKLE parametreleri
+        Çıktı: bool (kayıt kuyruğa alındı mı?)
+        """
+        with self._kosul:
+            if self._durdur:
+                return False
+            if len(self._kuyruk) >= self.kuyruk_boyutu:
+                if self.tasma_politikasi == "eskiyi_at":
+                    self._kuyruk.popleft()
+                    self.atilan += 1
+                    self._islenen += 1
+                else:
+                    yer_acildi = self.tasma_politikasi == "engelle" and self._kosul.wait_for(
+                        lambda: len(self._kuyruk) < self.kuyruk_boyutu or self._durdur, self.engelleme_suresi)
+                    if not yer_acildi or self._durdur:
+                        self.atilan += 1
+                        return False
+            if not self._kuyruk:
+                self._ilk_zaman = time.monotonic()
+            self._kuyruk.append(kayit)
+            self.kuyruga_alinan += 1
+            self.en_yuksek_derinlik = max(self.en_yuksek_derinlik, len(self._kuyruk))
+            if len(self._kuyruk) == 1 or len(self._kuyruk) >= self.parti_boyutu:
+                self._kosul.notify_all()  # ilk kayıt süre eşiğini başlatır, dolu parti hemen yazılır
+            return True
+    
+    def bosalt(self, zaman_asimi: Optional[float] = None) -> bool:
+        """
+        Şu ana kadar kuyruğa alınan kayıtların yazılmasını ister ve bekler.
+        Girdiler: zaman_asimi (float) - saniye, None ise süresiz
+        Çıktı: bool (süre dolmadan yazıldı mı?)
+        """
+        with self._kosul:
+            hedef = self.kuyruga_alinan
+            self._bosalt_istegi = True
+            self._kosul.notify_all()
+            return self._kosul.wait_for(lambda: self._islenen >= hedef, zaman_asimi)
+    
+    def kapat(self) -> None:
+        """
+        Yeni kayıt kabulünü durdurur, kuyruğu tamamen yazar ve iş parçacığını bekler.
+        """
+        with self._kosul:
+            self._durdur = True
+            self._kosul.notify_all()
+        self._is_parcacigi.join()
+        atexit.unregister(self.kapat)
+    
+    def _parti_hazir_mi(self) -> bool:
+        if not self._kuyruk:
+            return False
+        return (len(self._kuyruk) >= self.parti_boyutu or self._bosalt_istegi or self._durdur
+                or time.monotonic() - self._ilk_zaman >= self.parti_suresi)
+    
+    def _calis(self) -> None:
+        while True:
+            with self._kosul:
+                while not self._parti_hazir_mi():
+                    if self._durdur:
+                        return
+                    bekleme = None if not self._kuyruk else \
+                        self.parti_suresi - (time.monotonic() - self._ilk_zaman)
+                    self._kosul.wait(bekleme)
+                parti = [self._kuyruk.popleft() for _ in range(min(len(self._kuyruk), self.parti_boyutu))]
+                if self._kuyruk:
+                    self._ilk_zaman = time.monotonic()
+                else:
+                    self._bosalt_istegi = False
+                self._kosul.notify_all()  # engellenen üreticileri uyandır
+            self._parti_yaz(parti)
+    
+    def _parti_yaz(self, parti: List[tuple]) -> None:
+        """
+        Partiyi tek işlemde yazar; parti yazılamazsa (bütünlük hatası, kilitli veritabanı, disk G/Ç hatası)
+        kayıt kayıt yazar. Yazılamayan kayıt hatalı sayılıp loglanır, iş parçacığı çalışmayı sürdürür.
+        """
+        baslangic = time.perf_counter()
+        yazilan = 0
+        conn = None
+        try:
+            conn = self.yonetici.baglanti_olustur()
+            try:
+                self.yonetici.tarama_loglarini_ekle(conn, parti)
+                conn.commit()
+                yazilan = len(parti)
+            except sqlite3.Error as e:
+                conn.rollback()
+                self.son_hata = str(e)
+                # Her kayıt kendi işleminde: bir kaydın hatası öncekileri geri almaz
+                for kayit in parti:
+                    try:
+                        self.yonetici.tarama_loglarini_ekle(conn, [kayit])
+                        conn.commit()
+                        yazilan += 1
+                    except sqlite3.Error as e:
+                        conn.rollback()
+                        self.son_hata = str(e)
+                        print(f"Tarama logu yazılamadı ({kayit[0]}): {e}")
+        except Exception as e:
+            # Bağlantı açılamadı, geri alma başarısız oldu veya beklenmeyen hata: partinin kalanı hatalı sayılır
+            if conn is not None and conn.in_transaction:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+            self.son_hata = str(e)
+            print(f"Tarama logu partisi yazılamadı ({len(parti) - yazilan} kayıt): {e}")
+        sure = time.perf_counter() - baslangic
+        
+        with self._kosul:
+            self.yazilan += yazilan
+            self.hatali += len(parti) - yazilan
+            self._islenen += len(parti)
+            self.bosaltma_sayisi += 1
+            self.toplam_bosaltma_suresi += sure
+            self.son_bosaltma_suresi = sure
+            self.en_uzun_bosaltma_suresi = max(self.en_uzun_bosaltma_suresi, sure)
+            self._kosul.notify_all()
+    
+    def istatistikler(self) -> Dict[str, object]:
+        """
+        Çıktı: Kuyruk derinliği, sayaçlar ve boşaltma gecikmesi (ms) sözlüğü
+        """
+        with self._kosul:
+            return {
+                "kuyruk_derinligi": len(self._kuyruk),
+                "en_yuksek_derinlik": self.en_yuksek_derinlik,
+                "kuyruk_boyutu": self.kuyruk_boyutu,
+                "kuyruga_alinan": self.kuyruga_alinan,
+                "yazilan": self.yazilan,
+                "atilan": self.atilan,
+                "hatali": self.hatali,
+                "bosaltma_sayisi": self.bosaltma_sayisi,
+                "son_bosaltma_ms": self.son_bosaltma_suresi * 1000,
+                "ortalama_bosaltma_ms": self.toplam_bosaltma_suresi / self.bosaltma_sayisi * 1000
+                if self.bosaltma_sayisi else 0.0,
+                "en_uzun_bosaltma_ms": self.en_uzun_bosaltma_suresi * 1000,
+                "son_hata": self.son_hata
+            }
+
+# Bölüm dosyası: qr_tarama_loglari_YYYY_MM.db; şema adı: bolum_YYYY_MM
+BOLUM_DOSYASI_DESENI = re.compile(r"^qr_tarama_loglari_(\d{4})_(\d{2})\.db$")
+MAKS_EKLI_BOLUM = 8  # Bağlantı başına aynı anda ATTACH edilen bölüm (SQLite sınırı 10)
+ARSIV_DOSYASI = "qr_tarama_arsivi.zip"
+
+class TaramaLogBolumleri:
+    """
+    Tarama loglarının aylık SQLite dosyalarına bölümlenmesi.
+    Her bölüm ana tablonun sütunlarını ve indekslerini taşır; log_id'ler ay önekiyle (YYYYMM * 10^10)
+    başlar, bu yüzden bölümler arasında benzersizdir. Bölümler bağlantı başına gerektiğinde ATTACH edilir
+    (en fazla MAKS_EKLI_BOLUM, en az kullanılan ayrılır). Yabancı anahtar ve günlük özet güncellemesi,
+    bölüm bağlanırken oluşturulan TEMP tetikleyicilerle ana veritabanına karşı yapılır.
+    """
+    
+    def __init__(self, dizin: str):
+        """
+        Girdiler: dizin (str) - bölüm dosyalarının ve arşivin dizini (yoksa oluşturulur)
+        """
+        self.dizin = dizin
+        os.makedirs(dizin, exist_ok=True)
+        self._yerel = threading.local()  # conn, ekli (OrderedDict: ay -> şema), nesil
+        self._kilit = threading.Lock()
+        self._nesil = 0  # Bölüm kaldırıldıkça artar; bağlantılar kaldırılan bölümleri ayırır
+        self._kaldirilanlar = set()  # Kaldırılan aylar (silinmiş dosyaya bağlı kalan ATTACH'ler için)
+    
+    @staticmethod
+    def sema_adi(ay: str) -> str:
+        return "bolum_" + ay.replace("-", "_")
+    
+    def dosya_yolu(self, ay: str) -> str:
+        return os.path.join(self.dizin, f"qr_tarama_loglari_{ay.replace('-', '_')}.db")
+    
+    def aylar(self) -> List[str]:
+        """
+        Çıktı: Diskteki bölümlerin ayları (YYYY-MM), eskiden yeniye
+        """
+        aylar = []
+        for ad in os.listdir(self.dizin):
+            eslesme = BOLUM_DOSYASI_DESENI.match(ad)
+            if eslesme:
+                aylar.append(f"{eslesme.group(1)}-{eslesme.group(2)}")
+        return sorted(aylar)
+    
+    def _ekli_bolumler(self, conn: sqlite3.Connection) -> "OrderedDict[str, str]":
+        yerel = self._yerel
+        if getattr(yerel, "conn", None) is not conn:
+            yerel.conn, yerel.ekli, yerel.nesil = conn, OrderedDict(), self._nesil
+        elif yerel.nesil != self._nesil:
+            # Başka iş parçacığında kaldırılan bölümleri bu bağlantıdan da ayır
+            for ay in [ay for ay in yerel.ekli if ay in self._kaldirilanlar]:
+                self._ayir(conn, yerel.ekli, ay)
+            yerel.nesil = self._nesil
+        return yerel.ekli
+    
+    def _ayir(self, conn: sqlite3.Connection, ekli: "OrderedDict[str, str]", ay: str) -> bool:
+        """
+        Bölümü bağlantıdan ayırır; bölümde süren bir okuma varsa ayırmaz (False).
+        """
+        sema = ekli[ay]
+        try:
+            conn.execute(f"DETACH DATABASE {sema}")
+        except sqlite3.OperationalError:
+            return False
+        for tetikleyici in (f"{sema}_profil_kontrolu", f"{sema}_ozet"):
+            conn.execute(f"DROP TRIGGER IF EXISTS temp.{tetikleyici}")
+        del ekli[ay]
+        return True
+    
+    def bagla(self, conn: sqlite3.Connection, ay: str, olustur: bool = True) -> Optional[str]:
+        """
+        Ayın bölümünü bağlantıya ATTACH eder (gerekirse oluşturur); işlem dışında çağrılmalıdır.
+        Girdiler: conn (sqlite3.Connection), ay (str) - YYYY-MM, olustur (bool) - yoksa oluştur
+        Çıktı: Şema adı (str) veya None (olustur=False ve bölüm yok)
+        """
+        ekli = self._ekli_bolumler(conn)
+        if ay in ekli:
+            ekli.move_to_end(ay)
+            return ekli[ay]
+        dosya = self.dosya_yolu(ay)
+        if not olustur and not os.path.exists(dosya):
+            return None
+        for eski_ay in list(ekli):
+            if len(ekli) < MAKS_EKLI_BOLUM:
+                break
+            self._ayir(conn, ekli, eski_ay)
+        
+        sema = self.sema_adi(ay)
+        conn.execute(f"ATTACH DATABASE ? AS {sema}", (dosya,))
+        conn.execute(f"PRAGMA {sema}.journal_mode = WAL")
+        conn.execute(f"PRAGMA {sema}.synchronous = NORMAL")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {sema}.qr_tarama_loglari (
+                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profil_id TEXT NOT NULL,
+                tarayici_tipi TEXT NOT NULL,
+                user_agent TEXT,
+                ip_adresi TEXT,
+                coğrafi_konum TEXT,
+                tarama_zamani TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                basarili_mi BOOLEAN DEFAULT 0
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {sema}.idx_tarama_loglari_zaman "
+                     f"ON qr_tarama_loglari (tarama_zamani DESC)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {sema}.idx_tarama_loglari_profil_zaman "
+                     f"ON qr_tarama_loglari (profil_id, tarama_zamani DESC)")
+        conn.execute(f"""
+            INSERT INTO {sema}.sqlite_sequence (name, seq)
+            SELECT 'qr_tarama_loglari', ? WHERE NOT EXISTS (
+                SELECT 1 FROM {sema}.sqlite_sequence WHERE name = 'qr_tarama_loglari')
+        """, (int(ay.replace("-", "")) * 10 ** 10,))
+        conn.commit()
+        
+        # Ana veritabanına karşı yabancı anahtar kontrolü ve günlük özet güncellemesi (bağlantıya özel)
+        conn.execute(f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS {sema}_profil_kontrolu BEFORE INSERT ON {sema}.qr_tarama_loglari
+            WHEN NOT EXISTS (SELECT 1 FROM profiller WHERE profil_id = NEW.profil_id)
+            BEGIN
+                SELECT RAISE(ABORT, 'FOREIGN KEY constraint failed');
+            END
+        """)
+        conn.execute(f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS {sema}_ozet AFTER INSERT ON {sema}.qr_tarama_loglari
+            BEGIN
+                INSERT INTO gunluk_profil_taramalari (gun, profil_id, tarayici_tipi, basarili_mi, tarama_sayisi)
+                VALUES (date(NEW.tarama_zamani), NEW.profil_id, NEW.tarayici_tipi, COALESCE(NEW.basarili_mi, 0) != 0, 1)
+                ON CONFLICT (profil_id, gun, tarayici_tipi, basarili_mi) DO UPDATE SET tarama_sayisi = tarama_sayisi + 1;
+                INSERT INTO gunluk_taramalar (gun, tarayici_tipi, basarili_mi, tarama_sayisi)
+                VALUES (date(NEW.tarama_zamani), NEW.tarayici_tipi, COALESCE(NEW.basarili_mi, 0) != 0, 1)
+                ON CONFLICT (gun, tarayici_tipi, basarili_mi) DO UPDATE SET tarama_sayisi = tarama_sayisi + 1;
+            END
+        """)
+        ekli[ay] = sema
+        return sema
+    
+    def eskileri_kaldir(self, conn: sqlite3.Connection, saklama_ay_sayisi: int, arsivle: bool = False) -> List[str]:
+        """
+        İçinde bulunulan ay dahil son saklama_ay_sayisi ay dışındaki bölümleri siler.
+        Girdiler: conn (sqlite3.Connection) - çağıran iş parçacığının bağlantısı,
+                  saklama_ay_sayisi (int), arsivle (bool) - silmeden önce ARSIV_DOSYASI'na ekle
+        Çıktı: Kaldırılan aylar (YYYY-MM)
+        """
+        yil, ay = map(int, time.strftime("%Y-%m", time.gmtime()).split("-"))
+        sinir = yil * 12 + (ay - 1) - (max(1, saklama_ay_sayisi) - 1)
+        sinir_ayi = f"{sinir // 12:04d}-{sinir % 12 + 1:02d}"
+        
+        kaldirilan = []
+        with self._kilit:
+            for eski_ay in [a for a in self.aylar() if a < sinir_ayi]:
+                ekli = self._ekli_bolumler(conn)
+                if eski_ay in ekli and not self._ayir(conn, ekli, eski_ay):
+                    continue  # Bu iş parçacığında okunuyor; sonraki temizlikte
+                dosya = self.dosya_yolu(eski_ay)
+                if arsivle:
+                    self._arsive_ekle(eski_ay, dosya)
+                for yol in (dosya, dosya + "-wal", dosya + "-shm"):
+                    if os.path.exists(yol):
+                        os.remove(yol)
+                kaldirilan.append(eski_ay)
+            if kaldirilan:
+                self._kaldirilanlar.update(kaldirilan)
+                self._nesil += 1
+        return kaldirilan
+    
+    def _arsive_ekle(self, ay: str, dosya: str) -> None:
+        """
+        Bölümün tutarlı bir kopyasını (VACUUM INTO) sıkıştırılmış arşive ekler.
+        """
+        kopya = dosya + ".arsiv"
+        if os.path.exists(kopya):
+            os.remove(kopya)
+        kaynak = sqlite3.connect(dosya, timeout=MESGUL_ZAMAN_ASIMI)
+        try:
+            kaynak.execute("VACUUM INTO ?", (kopya,))
         finally:
-            conn.close()
+            kaynak.close()
+        import zipfile  # Yalnızca arşivleme yolunda yüklenir (içe aktarma maliyeti)
+        try:
+            with zipfile.ZipFile(os.path.join(self.dizin, ARSIV_DOSYASI), "a", zipfile.ZIP_DEFLATED) as arsiv:
+                arsiv.write(kopya, os.path.basename(dosya))
+        finally:
+            os.remove(kopya)
+    
+    def arsivlenmis_aylar(self) -> List[str]:
+        """
+        Çıktı: Arşivdeki bölümlerin ayları (YYYY-MM), eskiden yeniye
+        """
+        yol = os.path.join(self.dizin, ARSIV_DOSYASI)
+        if not os.path.exists(yol):
+            return []
+        import zipfile
+        with zipfile.ZipFile(yol) as arsiv:
+            return sorted(f"{e.group(1)}-{e.group(2)}" for e in map(BOLUM_DOSYASI_DESENI.match, arsiv.namelist()) if e)
+    
+    def arsivlenmis_bolumu_ac(self, ay: str) -> Optional[sqlite3.Connection]:
+        """
+        Arşivlenmiş bölümü bellekte, salt okunur bir bağlantı olarak açar.
+        Girdiler: ay (str) - YYYY-MM
+        Çıktı: sqlite3.Connection (qr_tarama_loglari tablosu) veya None
+        """
+        if ay not in self.arsivlenmis_aylar():
+            return None
+        import zipfile
+        with zipfile.ZipFile(os.path.join(self.dizin, ARSIV_DOSYASI)) as arsiv:
+            veri = arsiv.read(os.path.basename(self.dosya_yolu(ay)))
+        conn = sqlite3.connect(":memory:")
+        conn.deserialize(veri)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+class ProfilOnbellegi:
+    """
+    Profil aramaları için okuma üzerinden LRU + TTL önbelleği.
+    Bilinmeyen/aktif olmayan kimlikler kısa süreli negatif kayıt olarak tutulur (yabancı kimlik taramaları
+    veritabanına inmez). Bu süreçteki değişiklikler gecersiz_kil ile anında yansır; başka süreçlerin
+    değişiklikleri en geç ttl (negatif kayıtlarda negatif_ttl) sonra görünür.
+    """
+    
+    def __init__(self, maks_boyut: int = 10000, ttl: float = 60.0, negatif_ttl: float = 5.0):
+        """
+        Önbelleği başlatır.
+        Girdiler: maks_boyut (int) - kayıt sınırı, ttl (float) - saniye, negatif_ttl (float) - saniye
+        """
+        self.maks_boyut = maks_boyut
+        self.ttl = ttl
+        self.negatif_ttl = negatif_ttl
+        self._kayitlar = OrderedDict()  # profil_id -> (bitis_zamani, profil dict veya None)
+        self._kilit = threading.Lock()
+        self._nesil = 0  # Her geçersiz kılmada artar; okuma sırasında değişirse sonuç önbelleğe yazılmaz
+        self.isabet = 0
+        self.negatif_isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.suresi_dolan = 0
+        self.gecersiz_kilinan = 0
+    
+    def yukle(self, profil_id: str, yukleyici: Callable[[str], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Profili önbellekten döndürür; yoksa yukleyici ile okuyup önbelleğe ekler.
+        Yükleyici istisna fırlatırsa hiçbir şey önbelleğe alınmaz.
+        Girdiler: profil_id (str), yukleyici (Callable) - profil_id -> profil dict veya None
+        Çıktı: Profil dict kopyası veya None
+        """
+        simdi = time.monotonic()
+        with self._kilit:
+            kayit = self._kayitlar.get(profil_id)
+            if kayit is not None:
+                bitis_zamani, profil = kayit
+                if simdi <= bitis_zamani:
+                    self._kayitlar.move_to_end(profil_id)
+                    if profil is None:
+                        self.negatif_isabet += 1
+                        return None
+                    self.isabet += 1
+                    return dict(profil)
+                del self._kayitlar[profil_id]
+                self.suresi_dolan += 1
+            self.iska += 1
+            nesil = self._nesil
+        
+        profil = yukleyici(profil_id)  # Kilit dışında: yavaş okuma diğer isabetleri bekletmez
+        
+        with self._kilit:
+            if nesil == self._nesil:
+                omur = self.ttl if profil is not None else self.negatif_ttl
+                self._kayitlar[profil_id] = (time.monotonic() + omur, None if profil is None else dict(profil))
+                self._kayitlar.move_to_end(profil_id)
+                while len(self._kayitlar) > self.maks_boyut:
+                    self._kayitlar.popitem(last=False)
+                    self.tahliye += 1
+        return profil
+    
+    def gecersiz_kil(self, profil_id: str) -> None:
+        """
+        Profilin kaydını siler; o sırada süren okumaların eski sonucu da önbelleğe yazılmaz.
+        Girdiler: profil_id (str)
+        """
+        with self._kilit:
+            self._nesil += 1
+            if self._kayitlar.pop(profil_id, None) is not None:
+                self.gecersiz_kilinan += 1
+    
+    def temizle(self) -> None:
+        """
+        Tüm kayıtları siler (sayaçlar korunur).
+        """
+        with self._kilit:
+            self._nesil += 1
+            self._kayitlar.clear()
+    
+    def istatistikler(self) -> Dict[str, object]:
+        """
+        Önbellek sayaçlarını döndürür.
+        Çıktı: dict (boyut, isabet, negatif_isabet, iska, isabet_orani, tahliye, suresi_dolan, gecersiz_kilinan)
+        """
+        with self._kilit:
+            toplam = self.isabet + self.negatif_isabet + self.iska
+            return {
+                "boyut": len(self._kayitlar),
+                "isabet": self.isabet,
+                "negatif_isabet": self.negatif_isabet,
+                "iska": self.iska,
+                "isabet_orani": (self.isabet + self.negatif_isabet) / toplam if toplam else 0.0,
+                "tahliye": self.tahliye,
+                "suresi_dolan": self.suresi_dolan,
+                "gecersiz_kilinan": self.gecersiz_kilinan
+            }
 
-# Global veritabanı yöneticisi örneği
-veritabani_yoneticisi = HoynVeritabaniYoneticisi()
+class BellekDepolamaArkaUcu(DepolamaArkaUcu):
+    """
+    Süreç içi, kalıcı olmayan depolama (testler ve ölçümler için). SQLite arka ucunun anlamını izler:
+    bilinmeyen profile log yazılamaz, loglar (tarama_zamani DESC, log_id) sırasıyla ve keyset imleçle gezilir.
+    """
+    
+    ad = "bellek"
+    
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._profiller: Dict[str, Dict] = {}
+        self._loglar: List[TaramaLogu] = []  # log_id sırasıyla
+        self._profil_loglari: Dict[str, List[TaramaLogu]] = {}
+    
+    def profil_olustur(self, kullanici_id: str, isim: str, aciklama: str = "", profil_id: str = None) -> str:
+        profil_id = profil_id or str(uuid.uuid4())
+        with self._kilit:
+            if profil_id in self._profiller:
+                raise ValueError(f"Profil zaten var: {profil_id}")
+            self._profiller[profil_id] = {
+                "profil_id": profil_id,
+                "kullanici_id": kullanici_id,
+                "isim": isim,
+                "aciklama": aciklama,
+                "olusturma_zamani": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                "aktif_mi": 1
+            }
+            self._profil_loglari[profil_id] = []
+        return profil_id
+    
+    def profil_bilgisi_al(self, profil_id: str) -> Optional[Dict]:
+        profil = self._profiller.get(profil_id)
+        return dict(profil) if profil is not None and profil["aktif_mi"] else None
+    
+    def profil_devre_disi_birak(self, profil_id: str) -> bool:
+        with self._kilit:
+            profil = self._profiller.get(profil_id)
+            if profil is None or not profil["aktif_mi"]:
+                return False
+            profil["aktif_mi"] = 0
+            return True
+    
+    def qr_tarama_logla(self, profil_id: str, tarayici_tipi: str, user_agent: str = None,
+                        ip_adresi: str = None, cografl_konum: str = None, basarili_mi: bool = False) -> bool:
+        with self._kilit:
+            profil_loglari = self._profil_loglari.get(profil_id)
+            if profil_loglari is None:
+                return False  # Yabancı anahtar: profil yok
+            log = TaramaLogu(len(self._loglar) + 1, profil_id, tarayici_tipi, user_agent, ip_adresi, cografl_konum,
+                             time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()), bool(basarili_mi))
+            self._loglar.append(log)
+            profil_loglari.append(log)
+        return True
+    
+    def tarama_loglarini_gez(self, profil_id: str = None, son_gun_sayisi: int = 30, limit: int = None,
+                             imlec: Tuple[str, int] = None) -> Iterator[TaramaLogu]:
+        esik = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(time.time() - int(son_gun_sayisi) * 86400))
+        with self._kilit:
+            kaynak = self._profil_loglari.get(profil_id, []) if profil_id else self._loglar
+            loglar = [log for log in kaynak if log.tarama_zamani >= esik and (
+                imlec is None or log.tarama_zamani < imlec[0] or
+                (log.tarama_zamani == imlec[0] and log.log_id > imlec[1]))]
+        loglar.sort(key=lambda log: log.tarama_zamani, reverse=True)  # Kararlı: eşitlerde log_id sırası korunur
+        return iter(loglar if limit is None else loglar[:limit])
+    
+    def gunluk_tarama_ozeti(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[GunlukTaramaOzeti]:
+        esik = time.strftime("%Y-%m-%d", time.gmtime(time.time() - int(son_gun_sayisi) * 86400))
+        with self._kilit:
+            kaynak = self._profil_loglari.get(profil_id, []) if profil_id else self._loglar
+            sayilar = Counter((log.tarama_zamani[:10], log.tarayici_tipi, log.basarili_mi)
+                              for log in kaynak if log.tarama_zamani[:10] >= esik)
+        return [GunlukTaramaOzeti(*anahtar, sayi)
+                for anahtar, sayi in sorted(sayilar.items(), key=lambda oge: oge[0][0], reverse=True)]
+
+class ParcaliSqliteDepolamaArkaUcu(DepolamaArkaUcu):
+    """
+    profil_id özetine göre N SQLite dosyasına bölünmüş depolama. Bir profil ve tüm logları aynı parçadadır:
+    yabancı anahtar, günlük özetler ve profil önbelleği parça içinde çalışır; farklı parçalara giden
+    yazmalar aynı veritabanı kilidini beklemez. Profiller arası okumalar tüm parçalara dağıtılıp birleştirilir.
+    Döndürülen log_id = parça içi log_id * N + parça numarası; imleçler parçalar arasında da geçerlidir.
+    Parça sayısı dosyalar oluşturulduktan sonra değiştirilmemelidir (profiller başka parçaya düşer).
+    """
+    
+    ad = "parcali-sqlite"
+    
+    def __init__(self, db_dosyasi: str = VERITABANI_DOSYASI, parca_sayisi: int = 4):
+        """
+        Girdiler: db_dosyasi (str) - parça dosyaları <kök>_parca<i><uzantı> adıyla yanında açılır,
+                  parca_sayisi (int)
+        """
+        if parca_sayisi < 1:
+            raise ValueError("parca_sayisi en az 1 olmalı")
+        kok, uzanti = os.path.splitext(db_dosyasi)
+        self.parcalar = [HoynVeritabaniYoneticisi(f"{kok}_parca{i}{uzanti}") for i in range(parca_sayisi)]
+    
+    def parca_no(self, profil_id: str) -> int:
+        """
+        Süreçten bağımsız, kararlı yönlendirme (Python hash() süreç başına rastgeledir); CRC32 ucuz ve
+        UUID'lerde düzgün dağılır.
+        """
+        return zlib.crc32(profil_id.encode("utf-8")) % len(self.parcalar)
+    
+    def parca(self, profil_id: str) -> HoynVeritabaniYoneticisi:
+        return self.parcalar[self.parca_no(profil_id)]
+    
+    def profil_olustur(self, kullanici_id: str, isim: str, aciklama: str = "", profil_id: str = None) -> str:
+        profil_id = profil_id or str(uuid.uuid4())
+        return self.parca(profil_id).profil_olustur(kullanici_id, isim, aciklama, profil_id)
+    
+    def profil_bilgisi_al(self, profil_id: str) -> Optional[Dict]:
+        return self.parca(profil_id).profil_bilgisi_al(profil_id)
+    
+    def profil_var_mi(self, profil_id: str) -> bool:
+        return self.parca(profil_id).profil_var_mi(profil_id)
+    
+    def profil_devre_disi_birak(self, profil_id: str) -> bool:
+        return self.parca(profil_id).profil_devre_disi_birak(profil_id)
+    
+    def qr_tarama_logla(self, profil_id: str, tarayici_tipi: str, user_agent: str = None,
+                        ip_adresi: str = None, cografl_konum: str = None, basarili_mi: bool = False) -> bool:
+        return self.parca(profil_id).qr_tarama_logla(profil_id, tarayici_tipi, user_agent, ip_adresi,
+                                                    cografl_konum, basarili_mi)
+    
+    def _parca_loglari(self, no: int, profil_id: Optional[str], son_gun_sayisi: int, limit: Optional[int],
+                       imlec: Optional[Tuple[str, int]]) -> Iterator[TaramaLogu]:
+        """
+        Parçanın loglarını genel log_id ile verir; genel imleci parça içi imlece çevirir.
+        Genel kimlik > g  <=>  yerel * N + no > g  <=>  yerel > (g - no) // N
+        """
+        n = len(self.parcalar)
+        yerel_imlec = None if imlec is None else (imlec[0], (imlec[1] - no) // n)
+        for log in self.parcalar[no].tarama_loglarini_gez(profil_id, son_gun_sayisi, limit, yerel_imlec):
+            yield log._replace(log_id=log.log_id * n + no)
+    
+    def tarama_loglarini_gez(self, profil_id: str = None, son_gun_sayisi: int = 30, limit: int = None,
+                             imlec: Tuple[str, int] = None) -> Iterator[TaramaLogu]:
+        if profil_id:
+            return self._parca_loglari(self.parca_no(profil_id), profil_id, son_gun_sayisi, limit, imlec)
+        # Her parça zaten (tarama_zamani DESC, log_id) sıralı: k-yollu birleştirme, her parçadan en fazla limit
+        akislar = [self._parca_loglari(no, None, son_gun_sayisi, limit, imlec) for no in range(len(self.parcalar))]
+        birlesik = heapq.merge(*akislar, key=lambda log: (log.tarama_zamani, -log.log_id), reverse=True)
+        return birlesik if limit is None else itertools.islice(birlesik, limit)
+    
+    def gunluk_tarama_ozeti(self, profil_id: str = None, son_gun_sayisi: int = 30) -> List[GunlukTaramaOzeti]:
+        if profil_id:
+            return self.parca(profil_id).gunluk_tarama_ozeti(profil_id, son_gun_sayisi)
+        sayilar = Counter()
+        for parca in self.parcalar:
+            for ozet in parca.gunluk_tarama_ozeti(None, son_gun_sayisi):
+                sayilar[ozet[:3]] += ozet.tarama_sayisi
+        return [GunlukTaramaOzeti(*anahtar, sayi)
+                for anahtar, sayi in sorted(sayilar.items(), key=lambda oge: oge[0][0], reverse=True)]
+
+# Depolama arka ucu adı -> sınıf (depolama_arka_ucu_olustur)
+DEPOLAMA_ARKA_UCLARI = {
+    HoynVeritabaniYoneticisi.ad: HoynVeritabaniYoneticisi,
+    BellekDepolamaArkaUcu.ad: BellekDepolamaArkaUcu,
+    ParcaliSqliteDepolamaArkaUcu.ad: ParcaliSqliteDepolamaArkaUcu,
+}
+
+# Global veritabanı yöneticisi örneği (ilk kullanımda, o anki VERITABANI_DOSYASI ile kurulur)
+veritabani_yoneticisi = TembelTekil(lambda: HoynVeritabaniYoneticisi(VERITABANI_DOSYASI))
+
+# Yardımcı fonksiyonların kullandığı depolama arka ucu (None: veritabani_yoneticisi, tek SQLite dosyası)
+_depolama_arka_ucu: Optional[DepolamaArkaUcu] = None
+
+def depolama_arka_ucu() -> DepolamaArkaUcu:
+    """
+    Çıktı: Yardımcı fonksiyonların kullandığı depolama arka ucu
+    """
+    return veritabani_yoneticisi if _depolama_arka_ucu is None else _depolama_arka_ucu
+
+def depolama_arka_ucunu_ayarla(arka_uc: Optional[DepolamaArkaUcu]) -> Optional[DepolamaArkaUcu]:
+    """
+    Yardımcı fonksiyonları (ve tarayıcı / asenkron API'yi) başka bir depolama arka ucuna yönlendirir.
+    Girdiler: arka_uc (DepolamaArkaUcu) - None: varsayılan veritabani_yoneticisi'ne dön
+    Çıktı: Önceki arka uç (geri yüklemek için)
+    """
+    global _depolama_arka_ucu
+    onceki, _depolama_arka_ucu = _depolama_arka_ucu, arka_uc
+    return onceki
+
+def depolama_arka_ucu_olustur(ad: str, **secenekler) -> DepolamaArkaUcu:
+    """
+    Girdiler: ad (str) - DEPOLAMA_ARKA_UCLARI anahtarı ("sqlite", "bellek", "parcali-sqlite"),
+              **secenekler - sınıfın kurucu argümanları (ör. db_dosyasi, parca_sayisi)
+    Çıktı: DepolamaArkaUcu
+    """
+    if ad not in DEPOLAMA_ARKA_UCLARI:
+        raise ValueError(f"Bilinmeyen depolama arka ucu: {ad} ({', '.join(DEPOLAMA_ARKA_UCLARI)})")
+    return DEPOLAMA_ARKA_UCLARI[ad](**secenekler)
 
 # Yardımcı fonksiyonlar (modüler kullanım için)
 def profil_olustur(kullanici_id: str, isim: str, aciklama: str = "") -> str:
     """
-    Profil oluşturur (veritabanı yöneticisini kullanır).
+    Profil oluşturur (depolama arka ucunu kullanır).
     """
-    return veritabani_yoneticisi.profil_olustur(kullanici_id, isim, aciklama)
+    return depolama_arka_ucu().profil_olustur(kullanici_id, isim, aciklama)
 
 def profil_var_mi(profil_id: str) -> bool:
     """
     Profil var mı kontrolü yapar.
     """
-    return veritabani_yoneticisi.profil_var_mi(profil_id)
+    return depolama_arka_ucu().profil_var_mi(profil_id)
 
 def profil_bilgisi_al(profil_id: str):
     """
     Profil bilgilerini alır.
     """
-    return veritabani_yoneticisi.profil_bilgisi_al(profil_id)
+    return depolama_arka_ucu().profil_bilgisi_al(profil_id)
 
 def qr_tarama_logla(profil_id: str, tarayici_tipi: str, basarili_mi: bool = False) -> bool:
     """
     QR tarama loglar (basit versiyon).
     """
-    return veritabani_yoneticisi.qr_tarama_logla(profil_id, tarayici_tipi, basarili_mi=basarili_mi)
+    return depolama_arka_ucu().qr_tarama_logla(profil_id, tarayici_tipi, basarili_mi=basarili_mi)
+
+def profil_devre_disi_birak(profil_id: str) -> bool:
+    """
+    Profili devre dışı bırakır.
+    """
+    return depolama_arka_ucu().profil_devre_disi_birak(profil_id)
 
 def tarama_loglarini_al(profil_id: str = None, son_gun_sayisi: int = 30):
     """
     Tarama loglarını alır.
     """
-    return veritabani_yoneticisi.tarama_loglarini_al(profil_id, son_gun_sayisi)
+    return depolama_arka_ucu().tarama_loglarini_al(profil_id, son_gun_sayisi)
+
+def tarama_loglarini_gez(profil_id: str = None, son_gun_sayisi: int = 30, limit: int = None,
+                         imlec: Tuple[str, int] = None):
+    """
+    Tarama loglarını akış halinde (keyset sayfalama ile) döndürür.
+    """
+    return depolama_arka_ucu().tarama_loglarini_gez(profil_id, son_gun_sayisi, limit, imlec)
+
+def gunluk_tarama_sayilari(profil_id: str = None, son_gun_sayisi: int = 30):
+    """
+    Gün başına tarama toplamlarını özet tablolarından alır.
+    """
+    return depolama_arka_ucu().gunluk_tarama_sayilari(profil_id, son_gun_sayisi)
+
+def komut_satiri_calistir(argumanlar: List[str]) -> int:
+    """
+    Veritabanı bakım komutları: ozetleri-yeniden-olustur [--baslangic G] [--bitis G] [--db YOL].
+    Girdiler: argumanlar (list) - sys.argv[1:]
+    Çıktı: Çıkış kodu (int)
+    """
+    import argparse
+    ayristirici = argparse.ArgumentParser(prog="veritabani.py", description="Hoyn QR veritabanı bakım komutları")
+    ayristirici.add_argument("komut", choices=["ozetleri-yeniden-olustur"])
+    ayristirici.add_argument("--baslangic", help="YYYY-MM-DD (varsayılan: en eski ham log günü)")
+    ayristirici.add_argument("--bitis", help="YYYY-MM-DD (varsayılan: sınırsız)")
+    ayristirici.add_argument("--db", default=VERITABANI_DOSYASI, help="Veritabanı dosyası")
+    secenekler = ayristirici.parse_args(argumanlar)
+    
+    yonetici = HoynVeritabaniYoneticisi(secenekler.db)
+    yonetici.tarama_ozetlerini_yeniden_olustur(secenekler.baslangic, secenekler.bitis)
+    return 0
 
 # Test fonksiyonları
 if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        sys.exit(komut_satiri_calistir(sys.argv[1:]))
+    
     # Test veritabanı işlemleri
     print("🧪 Veritabanı testleri başlıyor...")
     